@@ -0,0 +1,275 @@
+"""
+Casos de benchmark: funções de processamento e agregações das seções sobre dados sintéticos
+"""
+import tempfile
+from collections import Counter
+from functools import cached_property
+
+import numpy as np
+
+from prisma_core.bundle import BundleStore
+from prisma_core.expand import EXPANDED_COLUMNS, expand_dataframe
+from prisma_core.flows import build_flows
+from prisma_core.geo import DENSITY_RESOLUTIONS, CountryMatrix, DensityGrids, PointClusters
+from prisma_core.model import ArticleModel, analyze_combinations, data_version
+from prisma_core.normalize import normalize_labels
+from prisma_core.query import QueryView
+from prisma_core.sources import diff_rows
+from prisma_core.synthetic import generate_articles
+from prisma_core.taxonomy import MATCHERS, NAO_ESPECIFICADO, split_multiple_values
+
+class Fixture:
+    """
+    Dados de um tamanho: a aba sintética e o modelo já aquecido (criados sob demanda, fora da medição)
+    """
+
+    def __init__(self, n_rows, seed=0):
+        self.n_rows = n_rows
+        self.seed = seed
+
+    @cached_property
+    def df(self):
+        return generate_articles(self.n_rows, self.seed)
+
+    @cached_property
+    def model(self):
+        return ArticleModel(self.df).warm()
+
+class Case:
+    """
+    Um benchmark: prepare(fixture) devolve a função medida (sem argumentos).
+
+    max_rows: tamanho máximo em que o caso roda (laços por célula e a expansão
+    materializada ficam inviáveis nos tamanhos maiores).
+    threshold: razão tempo atual / linha de base acima da qual há regressão
+    (None usa o limite padrão).
+    """
+
+    def __init__(self, name, prepare, max_rows=None, threshold=None):
+        self.name = name
+        self.prepare = prepare
+        self.max_rows = max_rows
+        self.threshold = threshold
+
+    def runs_at(self, n_rows):
+        return self.max_rows is None or n_rows <= self.max_rows
+
+CASES = []
+
+def case(name, max_rows=None, threshold=None):
+    def register(prepare):
+        CASES.append(Case(name, prepare, max_rows, threshold))
+        return prepare
+    return register
+
+def _cold(matcher, function):
+    """
+    Mede a função com o cache de tokens do matcher vazio (primeira carga dos dados)
+    """
+    def run():
+        matcher._resolve_cached.cache_clear()
+        return function()
+    return run
+
+# Funções originais, aplicadas célula a célula
+
+@case('split_multiple_values', max_rows=100_000)
+def _split(fixture):
+    values = fixture.df['TECNOLOGIA'].tolist()
+    return lambda: [split_multiple_values(value) for value in values]
+
+def _register_cell_normalizer(column, name):
+    @case(name, max_rows=100_000)
+    def prepare(fixture):
+        values = fixture.df[column].tolist()
+        matcher = MATCHERS[column]
+        return _cold(matcher, lambda: [matcher.normalize(value) for value in values])
+
+for _column, _name in (
+    ('TECNOLOGIA', 'process_technologies'),
+    ('TIPO_RESIDUO', 'process_waste_types'),
+    ('METODOLOGIA', 'process_methodologies')
+):
+    _register_cell_normalizer(_column, _name)
+
+# Normalização vetorizada (a usada pelo modelo)
+
+def _register_normalize_labels(column):
+    @case(f'normalize_labels.{column}')
+    def prepare(fixture):
+        series = fixture.df[column]
+        return _cold(MATCHERS[column], lambda: normalize_labels(series))
+
+for _column in EXPANDED_COLUMNS:
+    _register_normalize_labels(_column)
+
+@case('expand_dataframe', max_rows=100_000)
+def _expand(fixture):
+    df, batches = fixture.df, fixture.model.batches
+    return lambda: expand_dataframe(df, batches)
+
+@case('analyze_combinations')
+def _combinations(fixture):
+    incidence = fixture.model.incidence
+    return lambda: analyze_combinations(incidence['TECNOLOGIA'], incidence['TIPO_RESIDUO'])
+
+# Modelo: normalização e visões compartilhadas (o que roda a cada nova versão dos dados)
+
+@case('model.build')
+def _model_build(fixture):
+    df, version = fixture.df, fixture.model.version
+    return lambda: ArticleModel(df, version)
+
+@case('model.warm')
+def _model_warm(fixture):
+    df, version = fixture.df, fixture.model.version
+    return lambda: ArticleModel(df, version).warm()
+
+@case('model.patched')
+def _model_patched(fixture):
+    # Atualização típica da planilha: 1% das linhas com o título alterado
+    df = fixture.df.copy()
+    changed = df.index[::100]
+    df.loc[changed, 'TITULO'] = df.loc[changed, 'TITULO'].astype('string') + ' (revisado)'
+    diff = diff_rows(fixture.df, df, 'ID')
+    version = data_version(df)
+    return lambda: fixture.model.patched(df, diff, version).warm()
+
+# Pacote de artefatos: gravação (python -m prisma_core build) e carga na partida do dashboard
+
+@case('bundle.save')
+def _bundle_save(fixture):
+    store = BundleStore(tempfile.mkdtemp(prefix='prisma-bundle-'))
+    return lambda: store.save(fixture.model, fixture.df, 'sintetico', figures=False)
+
+@case('bundle.load')
+def _bundle_load(fixture):
+    store = BundleStore(tempfile.mkdtemp(prefix='prisma-bundle-'))
+    store.save(fixture.model, fixture.df, 'sintetico', figures=False)
+    return store.load
+
+# Agregações de cada seção sobre o modelo pronto (o que roda a cada interação)
+
+@case('secao.visao_geral')
+def _overview(fixture):
+    model = fixture.model
+    def run():
+        model.cube.year_counts()
+        for column in EXPANDED_COLUMNS:
+            model.cube.counts(column)
+            model.coverage(column)
+    return run
+
+@case('secao.tecnologias')
+def _technologies(fixture):
+    model = fixture.model
+    def run():
+        model.cube.counts('TECNOLOGIA').head(15)
+        model.cube.pair('TECNOLOGIA')
+    return run
+
+@case('secao.residuos')
+def _wastes(fixture):
+    model = fixture.model
+    def run():
+        model.cube.counts('TIPO_RESIDUO')
+        model.cube.series('TIPO_RESIDUO')
+    return run
+
+@case('secao.combinacoes')
+def _pairs(fixture):
+    model = fixture.model
+    def run():
+        model.cube.pair('TECNOLOGIA', 'TIPO_RESIDUO')
+        Counter(model.combinations).most_common(20)
+    return run
+
+@case('secao.combinacoes.fluxos')
+def _flows(fixture):
+    model = fixture.model
+    def run():
+        build_flows(model.cube)
+        # Maior top-k oferecido na seção Combinações
+        build_flows(model.cube, top_k=40)
+    return run
+
+@case('model.point_clusters')
+def _point_clusters(fixture):
+    articles = fixture.model.articles
+    return lambda: PointClusters(articles)
+
+@case('model.density_grids')
+def _density_grids(fixture):
+    articles = fixture.model.articles
+    return lambda: DensityGrids(articles)
+
+@case('model.country_matrix')
+def _country_matrix(fixture):
+    articles = fixture.model.articles
+    return lambda: CountryMatrix(articles)
+
+@case('secao.geoespacial.mundial')
+def _world_map(fixture):
+    matrix = fixture.model.country_matrix
+    def run():
+        # Troca de tecnologia no Mapa Mundial e a comparação entre tecnologias: só leituras da matriz
+        for flag in matrix.flags:
+            matrix.country_counts(flag)
+        matrix.long()
+    return run
+
+@case('secao.geoespacial.calor')
+def _heat_map(fixture):
+    grids = fixture.model.density_grids
+    def run():
+        # Troca de tecnologia e de resolução no Mapa de Calor: só consultas às grades prontas
+        for flag in grids.flags:
+            for resolution in DENSITY_RESOLUTIONS:
+                grids.cells(flag, resolution)
+        grids.cells(grids.flags[0], next(iter(DENSITY_RESOLUTIONS)), smooth=True)
+    return run
+
+@case('secao.metodologias')
+def _methods(fixture):
+    model = fixture.model
+    def run():
+        model.cube.counts('METODOLOGIA').head(15)
+        model.cube.counts('METODOLOGIA').head(10)
+    return run
+
+@case('secao.dados')
+def _data(fixture):
+    model = fixture.model
+    facets = model.facets
+    years = model.articles['Ano'].to_numpy(dtype=float, na_value=np.nan)
+    def run():
+        base = facets.pack((years >= 2010) & (years <= 2025))
+        selections = {'TECNOLOGIA': [label for label in model.cube.counts('TECNOLOGIA').index[:2]]}
+        for name in facets.labels:
+            facets.counts(name, selections, base=base)
+            facets.options(name)
+        article_mask = facets.unpack(facets.mask(selections, base=base))
+        article_mask &= model.search_index.mask('gis')
+        view = QueryView(model.processed_frame).filter_articles(article_mask)
+        view.page(0, 50)
+    return run
+
+@case('secao.dados.aproximada')
+def _data_fuzzy(fixture):
+    model = fixture.model
+    def run():
+        ranked, scores = model.search_index.rank('gaseificacao biogas')
+        relevance = np.zeros(model.n_articles)
+        relevance[ranked] = scores
+        QueryView(model.processed_frame).filter_articles(relevance > 0).sort_by(relevance).page(0, 50)
+    return run
+
+@case('secao.dados.expandidos')
+def _data_expanded(fixture):
+    model = fixture.model
+    expansion = model.expansion
+    row_articles = expansion.article_positions()
+    def run():
+        mask = ~model.batches['TECNOLOGIA'].rows_with(NAO_ESPECIFICADO)
+        QueryView(expansion, row_articles=row_articles).filter_articles(mask).page(0, 50)
+    return run
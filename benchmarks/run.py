@@ -0,0 +1,159 @@
+"""
+Executa os benchmarks e compara com a linha de base em JSON
+
+    python -m benchmarks.run                       # 1k, 10k e 100k; compara com benchmarks/baseline.json
+    python -m benchmarks.run --sizes 1M            # inclui o tamanho de 1 milhão de artigos
+    python -m benchmarks.run --cases 'secao.*'     # só os casos cujo nome casa com o padrão
+    python -m benchmarks.run --save                # grava os tempos como nova linha de base
+
+Sai com código 1 se algum caso ficar mais lento que o limite da linha de base.
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.cases import CASES, Fixture
+from prisma_core.synthetic import SIZES
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+DEFAULT_SIZES = ('1k', '10k', '100k')
+
+# Regressão: tempo atual acima de DEFAULT_THRESHOLD × linha de base e pelo menos
+# MIN_DELTA segundos mais lento (evita alarmes por ruído em casos de poucos ms)
+DEFAULT_THRESHOLD = 1.3
+MIN_DELTA = 0.005
+
+# Repetições de cada caso: no mínimo MIN_REPEATS e até somar MIN_TIME segundos
+MIN_REPEATS = 3
+MAX_REPEATS = 20
+MIN_TIME = 0.5
+
+def measure(function, min_repeats=MIN_REPEATS):
+    """
+    Tempo de uma chamada (melhor e mediana), após uma chamada de aquecimento
+    """
+    function()
+    times = []
+    while len(times) < MAX_REPEATS and (len(times) < min_repeats or sum(times) < MIN_TIME):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {'best': round(min(times), 6), 'median': round(statistics.median(times), 6), 'repeats': len(times)}
+
+def environment(seed):
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor() or platform.machine(),
+        'seed': seed
+    }
+
+def load_baseline(path):
+    if not path.exists():
+        return {'environment': {}, 'results': {}}
+    return json.loads(path.read_text(encoding='utf-8'))
+
+def compare(result, reference):
+    """
+    Situação de um caso frente à linha de base: 'ok', 'regressão', 'melhora' ou 'novo'
+    """
+    if reference is None:
+        return 'novo', None
+    ratio = result['best'] / reference['best'] if reference['best'] else float('inf')
+    threshold = reference.get('threshold', DEFAULT_THRESHOLD)
+    if ratio > threshold and result['best'] - reference['best'] > MIN_DELTA:
+        return 'regressão', ratio
+    if ratio < 1 / threshold and reference['best'] - result['best'] > MIN_DELTA:
+        return 'melhora', ratio
+    return 'ok', ratio
+
+def run(sizes, patterns, seed, min_repeats, baseline):
+    """
+    Roda os casos selecionados em cada tamanho; imprime uma linha por caso.
+    Retorna (resultados por tamanho, lista de regressões).
+    """
+    results, regressions = {}, []
+    for size in sizes:
+        n_rows = SIZES[size]
+        fixture = Fixture(n_rows, seed)
+        results[size] = {}
+        for case in CASES:
+            if patterns and not any(fnmatch.fnmatch(case.name, pattern) for pattern in patterns):
+                continue
+            if not case.runs_at(n_rows):
+                print(f"{size:>5}  {case.name:<34} {'pulado':>10}  (até {case.max_rows:,} linhas)")
+                continue
+
+            result = measure(case.prepare(fixture), min_repeats)
+            result['threshold'] = case.threshold or DEFAULT_THRESHOLD
+            results[size][case.name] = result
+
+            reference = baseline['results'].get(size, {}).get(case.name)
+            status, ratio = compare(result, reference)
+            if status == 'regressão':
+                regressions.append((size, case.name, ratio))
+            base = f"{reference['best'] * 1000:10.2f}" if reference else f"{'-':>10}"
+            change = f"{ratio:6.2f}x" if ratio is not None else f"{'':>7}"
+            print(f"{size:>5}  {case.name:<34} {result['best'] * 1000:10.2f} {base} ms {change}  {status}")
+            sys.stdout.flush()
+
+        # Libera os dados do tamanho antes de gerar o próximo
+        del fixture
+        gc.collect()
+    return results, regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do Dashboard PRISMA sobre dados sintéticos")
+    parser.add_argument('--sizes', nargs='+', default=list(DEFAULT_SIZES), choices=list(SIZES))
+    parser.add_argument('--cases', nargs='+', default=[], help="padrões (fnmatch) dos nomes dos casos")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeats', type=int, default=MIN_REPEATS, help="repetições mínimas por caso")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help="grava os tempos medidos na linha de base")
+    parser.add_argument('--output', type=Path, help="grava os tempos desta execução em outro JSON")
+    parser.add_argument('--list', action='store_true', help="lista os casos e sai")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in CASES:
+            print(case.name)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    print(f"{'':>5}  {'caso':<34} {'atual':>10} {'base':>10}")
+    results, regressions = run(args.sizes, args.cases, args.seed, args.repeats, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(
+            {'environment': environment(args.seed), 'results': results}, indent=2, ensure_ascii=False
+        ) + '\n', encoding='utf-8')
+
+    if args.save:
+        # Mescla: tamanhos e casos não executados agora mantêm os valores anteriores
+        baseline['environment'] = environment(args.seed)
+        for size, cases in results.items():
+            baseline['results'].setdefault(size, {}).update(cases)
+        args.baseline.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"Linha de base gravada em {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões):")
+        for size, name, ratio in regressions:
+            print(f"  {size} {name}: {ratio:.2f}x a linha de base")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+Núcleo de processamento do Dashboard PRISMA (sem dependência do Streamlit)
+"""
@@ -0,0 +1,342 @@
+"""
+Pacote de artefatos pré-calculados (modelo normalizado, índices, cubo e figuras)
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.io as pio
+
+from prisma_core.cube import LABEL_DIMENSIONS, Cuboid, CountCube
+from prisma_core.facets import FacetIndex
+from prisma_core.incidence import Incidence
+from prisma_core.model import LIST_COLUMNS, ArticleModel, _derive_columns, _freeze
+from prisma_core.normalize import LabelBatch
+from prisma_core.search import SearchIndex, TokenIndex
+from prisma_core.timing import span, timed
+
+# Versão do formato do pacote; pacotes de outro formato são ignorados
+BUNDLE_FORMAT = 2
+
+# Diretório padrão dos pacotes (pode ser trocado com PRISMA_BUNDLE_DIR)
+DEFAULT_BUNDLE_DIR = Path(__file__).resolve().parent.parent / '.artifacts'
+
+# Pacotes mantidos no diretório além do mais recente
+BUNDLES_KEPT = 2
+
+# Código das figuras pré-calculadas (charts.py só é importado ao gerar as figuras,
+# para não trazer o plotly.express para a partida do dashboard)
+CHARTS_SOURCE = Path(__file__).with_name('charts.py')
+
+# Código que produz os vetores do pacote (padronização, rótulos, modelo e visões);
+# pacotes gerados por outra versão desses módulos são ignorados
+MODEL_SOURCES = tuple(Path(__file__).with_name(name) for name in (
+    'taxonomy.py', 'normalize.py', 'model.py', 'incidence.py', 'facets.py', 'cube.py', 'search.py'
+))
+
+def bundle_dir():
+    return Path(os.environ.get('PRISMA_BUNDLE_DIR', DEFAULT_BUNDLE_DIR))
+
+def charts_digest():
+    """
+    Identifica o código das figuras (charts.py + versão do plotly): figuras de um
+    pacote gerado por outro código são descartadas na carga
+    """
+    digest = hashlib.sha1(CHARTS_SOURCE.read_bytes())
+    digest.update(plotly.__version__.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def model_digest():
+    """
+    Identifica o código da normalização e do modelo (MODEL_SOURCES): um pacote
+    gerado por outro código traria rótulos e índices diferentes dos que este
+    código produziria, e é descartado na carga
+    """
+    digest = hashlib.sha1()
+    for path in MODEL_SOURCES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+def _text(values):
+    return np.array([str(value) for value in values], dtype=str)
+
+def _index(values):
+    return pd.Index(values.tolist())
+
+def _csr(arrays):
+    """
+    Lista de vetores como (offsets, valores concatenados)
+    """
+    lengths = np.array([len(array) for array in arrays], dtype=np.int64)
+    values = np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+    return np.concatenate([[0], np.cumsum(lengths)]), values
+
+def _cube_key(key):
+    return '|'.join(key)
+
+def pack_model(model):
+    """
+    Vetores numpy (sem objetos Python) das visões do modelo: normalização,
+    incidências, facetas, cubo de contagens e índice de busca
+    """
+    arrays = {}
+    for column, batch in model.batches.items():
+        arrays[f'batch.{column}.offsets'] = batch.offsets
+        arrays[f'batch.{column}.codes'] = batch.codes
+        arrays[f'batch.{column}.vocabulary'] = _text(batch.vocabulary)
+    for column, incidence in model.incidence.items():
+        arrays[f'incidence.{column}.indptr'] = incidence.indptr
+        arrays[f'incidence.{column}.indices'] = incidence.indices
+
+    facets = model.facets
+    for name in facets.labels:
+        arrays[f'facets.{name}.labels'] = _text(facets.labels[name])
+        arrays[f'facets.{name}.bitmaps'] = facets.bitmaps[name]
+
+    cube = model.cube
+    arrays['cube.years'] = cube.years.to_numpy(dtype=float)
+    arrays['cube.countries'] = _text(cube.countries)
+    for key, cuboid in cube.cuboids.items():
+        arrays[f'cube.{_cube_key(key)}.axes'] = _text(cuboid.axes)
+        arrays[f'cube.{_cube_key(key)}.sizes'] = np.array(cuboid.sizes, dtype=np.int64)
+        arrays[f'cube.{_cube_key(key)}.codes'] = cuboid.codes
+        arrays[f'cube.{_cube_key(key)}.count'] = cuboid.count
+
+    for column, index in model.search_index.indexes.items():
+        arrays[f'search.{column}.vocabulary'] = _text(index.vocabulary)
+        arrays[f'search.{column}.offsets'], arrays[f'search.{column}.positions'] = _csr(index.postings)
+    return arrays
+
+def _unpack_search(arrays, columns, n_rows, frame):
+    search = SearchIndex.__new__(SearchIndex)
+    search._frame = frame
+    search.n_rows = n_rows
+    search.indexes = {}
+    for column in columns:
+        index = TokenIndex.__new__(TokenIndex)
+        index.vocabulary = np.array(arrays[f'search.{column}.vocabulary'].tolist(), dtype=object)
+        offsets, positions = arrays[f'search.{column}.offsets'], arrays[f'search.{column}.positions']
+        index.postings = np.split(positions, offsets[1:-1]) if len(index.vocabulary) else []
+        search.indexes[column] = index
+    return search
+
+def _unpack_cube(arrays, cuboid_keys):
+    cube = CountCube.__new__(CountCube)
+    years = arrays['cube.years']
+    cube.years = pd.Index(years, dtype=float)
+    cube.countries = _index(arrays['cube.countries'])
+    cube._year_size = len(cube.years) + 1
+    cube._country_size = len(cube.countries) + 1
+    cube.cuboids = {}
+    for key in cuboid_keys:
+        name = f'cube.{_cube_key(key)}'
+        cube.cuboids[tuple(key)] = Cuboid(
+            arrays[f'{name}.axes'].tolist(), arrays[f'{name}.sizes'].tolist(),
+            arrays[f'{name}.codes'], arrays[f'{name}.count']
+        )
+    return cube
+
+def unpack_model(raw, arrays, manifest):
+    """
+    ArticleModel pronto (com as visões de warm() já preenchidas) a partir da
+    tabela original e dos vetores de pack_model. Os agrupamentos do mapa de
+    pontos não são gravados: são montados inteiros na primeira consulta.
+    """
+    model = ArticleModel.__new__(ArticleModel)
+    model.version = manifest['version']
+    model.articles = _derive_columns(raw)
+    n_rows = len(model.articles)
+
+    model.batches, incidence = {}, {}
+    for column in LIST_COLUMNS:
+        vocabulary = _index(arrays[f'batch.{column}.vocabulary'])
+        model.batches[column] = _freeze(LabelBatch(
+            arrays[f'batch.{column}.offsets'], arrays[f'batch.{column}.codes'], vocabulary, model.articles.index
+        ))
+        incidence[column] = Incidence(
+            arrays[f'incidence.{column}.indptr'], arrays[f'incidence.{column}.indices'], vocabulary
+        )
+
+    facets = FacetIndex(n_rows)
+    for name in manifest['facets']:
+        labels = arrays[f'facets.{name}.labels']
+        facets.labels[name] = incidence[name].vocabulary if name in incidence else _index(labels)
+        facets.bitmaps[name] = arrays[f'facets.{name}.bitmaps']
+        facets.bitmaps[name].flags.writeable = False
+
+    cube = _unpack_cube(arrays, manifest['cuboids'])
+    cube.vocabularies = {dimension: incidence[dimension].vocabulary for dimension in LABEL_DIMENSIONS}
+
+    # Visões já calculadas entram direto no cache das cached_property
+    model.__dict__.update(
+        incidence=incidence,
+        facets=facets,
+        cube=cube,
+        search_index=_unpack_search(arrays, manifest['search_columns'], n_rows, lambda: model.processed_frame)
+    )
+    return model
+
+def build_figures(model):
+    """
+    Figuras de prisma_core.charts serializadas em JSON, por 'seção/gráfico' (None: nada a exibir)
+    """
+    from prisma_core.charts import CHARTS
+
+    figures = {}
+    for (section, chart), build in CHARTS.items():
+        with span(f'figura.{chart}'):
+            figure = build(model)
+        figures[f'{section}/{chart}'] = None if figure is None else json.loads(pio.to_json(figure, validate=False))
+    return figures
+
+class Bundle:
+    """
+    Um pacote carregado: modelo pronto, tabela original e figuras pré-calculadas
+    (JSON por (seção, gráfico)), mais o manifesto que o descreve
+    """
+
+    def __init__(self, manifest, raw, model, figures):
+        self.manifest = manifest
+        self.raw = raw
+        self.model = model
+        self.figures = figures
+
+    @property
+    def version(self):
+        return self.manifest['version']
+
+    @property
+    def created_at(self):
+        return self.manifest['created_at']
+
+class BundleStore:
+    """
+    Pacotes versionados de artefatos, um subdiretório por versão dos dados:
+
+        <dir>/<versão>/manifest.json   formato, versão, origem, tamanhos, bibliotecas
+        <dir>/<versão>/dados.parquet   aba principal como lida da planilha ou do CSV
+        <dir>/<versão>/arrays.npz      normalização, incidências, facetas, cubo e índice de busca
+        <dir>/<versão>/figures.json    figuras sem parâmetros de widget, já serializadas
+        <dir>/LATEST                   versão do pacote mais recente
+
+    O pacote é montado num diretório temporário e publicado com os.replace,
+    então um leitor nunca vê um pacote pela metade. Os vetores são lidos sem
+    pickle. Figuras geradas por outra versão de charts.py ou do plotly são
+    descartadas (o dashboard as reconstrói sob demanda).
+    """
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory is not None else bundle_dir()
+
+    def latest(self):
+        """
+        Versão do pacote mais recente, ou None se não houver
+        """
+        try:
+            return (self.directory / 'LATEST').read_text(encoding='utf-8').strip() or None
+        except OSError:
+            return None
+
+    @timed('bundle.save')
+    def save(self, model, raw, source, figures=True):
+        """
+        Grava o pacote do modelo (warm() é chamado aqui) e o marca como mais recente.
+        Retorna o caminho do pacote.
+        """
+        model.warm()
+        manifest = {
+            'format': BUNDLE_FORMAT,
+            'version': model.version,
+            'created_at': time.time(),
+            'source': source,
+            'n_articles': model.n_articles,
+            'facets': list(model.facets.labels),
+            'cuboids': [list(key) for key in model.cube.cuboids],
+            'search_columns': model.search_index.columns,
+            'model_digest': model_digest(),
+            'charts_digest': charts_digest() if figures else None,
+            'libraries': {'numpy': np.__version__, 'pandas': pd.__version__, 'plotly': plotly.__version__}
+        }
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / model.version
+        tmp = self.directory / f'.{model.version}.{os.getpid()}.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        try:
+            raw.to_parquet(tmp / 'dados.parquet', index=False)
+            np.savez(tmp / 'arrays.npz', **pack_model(model))
+            if figures:
+                (tmp / 'figures.json').write_text(json.dumps(build_figures(model)), encoding='utf-8')
+            (tmp / 'manifest.json').write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding='utf-8')
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(tmp, target)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        latest_tmp = self.directory / f'.LATEST.{os.getpid()}.tmp'
+        latest_tmp.write_text(model.version, encoding='utf-8')
+        os.replace(latest_tmp, self.directory / 'LATEST')
+        self._prune(keep=model.version)
+        return target
+
+    def _prune(self, keep):
+        versions = sorted(
+            (path for path in self.directory.iterdir()
+             if path.is_dir() and not path.name.startswith('.') and path.name != keep),
+            key=lambda path: path.stat().st_mtime, reverse=True
+        )
+        for path in versions[BUNDLES_KEPT:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def manifest(self, version=None):
+        """
+        Manifesto do pacote (o mais recente por padrão), ou None se não houver pacote
+        válido (de outro formato ou gerado por outro código de normalização e modelo)
+        """
+        version = version or self.latest()
+        if version is None:
+            return None
+        try:
+            manifest = json.loads((self.directory / version / 'manifest.json').read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if manifest.get('format') != BUNDLE_FORMAT or manifest.get('model_digest') != model_digest():
+            return None
+        return manifest
+
+    @timed('bundle.load')
+    def load(self, version=None):
+        """
+        Carrega o pacote (o mais recente por padrão).
+        Retorna um Bundle, ou None se não houver pacote válido.
+        """
+        manifest = self.manifest(version)
+        if manifest is None:
+            return None
+        path = self.directory / manifest['version']
+        try:
+            raw = pd.read_parquet(path / 'dados.parquet')
+            with np.load(path / 'arrays.npz', allow_pickle=False) as stored:
+                arrays = {name: stored[name] for name in stored.files}
+            model = unpack_model(raw, arrays, manifest)
+        except (OSError, ImportError, ValueError, KeyError):
+            return None
+
+        figures = {}
+        if manifest.get('charts_digest') == charts_digest():
+            try:
+                stored = json.loads((path / 'figures.json').read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                stored = {}
+            figures = {
+                tuple(key.split('/', 1)): None if spec is None else json.dumps(spec)
+                for key, spec in stored.items()
+            }
+        return Bundle(manifest, raw, model, figures)
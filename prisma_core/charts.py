@@ -0,0 +1,417 @@
+"""
+Figuras das seções do dashboard construídas a partir do modelo (sem Streamlit)
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from prisma_core.flows import FLOW_LEVELS, FLOW_TOP_K, build_flows
+from prisma_core.theme import COLOR_PALETTE
+
+def top_cooccurrences(model, n=10):
+    """
+    Pares de tecnologias que mais aparecem juntos (triângulo superior de T.T @ T, sem a diagonal)
+    """
+    cooccurrence_matrix = model.cube.pair('TECNOLOGIA')
+    upper = np.triu(np.ones(cooccurrence_matrix.shape, dtype=bool), k=1)
+    tech_cooccurrence = cooccurrence_matrix.where(upper).stack()
+    tech_cooccurrence = tech_cooccurrence[tech_cooccurrence > 0].astype(int)
+    return tech_cooccurrence.sort_values(ascending=False, kind='stable').head(n)
+
+def build_violin(model):
+    df_multi = pd.DataFrame({
+        'Tecnologias': model.techs.row_lengths(),
+        'Resíduos': model.wastes.row_lengths(),
+        'Metodologias': model.methods.row_lengths()
+    }).melt(var_name='Tipo', value_name='Quantidade')
+
+    fig_violin = px.violin(
+        df_multi,
+        x='Tipo',
+        y='Quantidade',
+        color='Tipo',
+        title="",
+        box=True,
+        color_discrete_map={
+            'Tecnologias': COLOR_PALETTE['primary'],
+            'Resíduos': COLOR_PALETTE['success'],
+            'Metodologias': COLOR_PALETTE['info']
+        }
+    )
+
+    fig_violin.update_layout(
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Arial, sans-serif", size=12),
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+    return fig_violin
+
+def build_timeline(model):
+    year_counts = model.cube.year_counts()
+    year_counts = year_counts[year_counts > 0].reset_index()
+    if year_counts.empty:
+        return None
+
+    fig_timeline = px.area(
+        year_counts,
+        x='Ano',
+        y='Quantidade',
+        title="",
+        line_shape='spline',
+        color_discrete_sequence=[COLOR_PALETTE['primary']]
+    )
+
+    fig_timeline.update_traces(
+        fill='tozeroy',
+        fillcolor='rgba(45, 80, 22, 0.2)',
+        line=dict(color=COLOR_PALETTE['primary'], width=3)
+    )
+
+    fig_timeline.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(gridcolor='rgba(0,0,0,0.1)', title='Ano'),
+        yaxis=dict(gridcolor='rgba(0,0,0,0.1)', title='Número de Publicações'),
+        hovermode='x unified'
+    )
+    return fig_timeline
+
+def build_top15(model):
+    tech_df = model.cube.counts('TECNOLOGIA').head(15).rename_axis('Tecnologia').reset_index(name='Quantidade')
+
+    fig_tech_bar = px.bar(
+        tech_df,
+        x='Quantidade',
+        y='Tecnologia',
+        orientation='h',
+        title="",
+        color='Quantidade',
+        color_continuous_scale=[[0, '#e8f5e9'], [0.5, '#4caf50'], [1, '#2d5016']],
+        text='Quantidade'
+    )
+
+    fig_tech_bar.update_traces(
+        texttemplate='%{text}',
+        textposition='outside',
+        marker=dict(cornerradius=5)
+    )
+
+    fig_tech_bar.update_layout(
+        height=600,
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(gridcolor='rgba(0,0,0,0.1)', title='Número de Artigos'),
+        yaxis=dict(gridcolor='rgba(0,0,0,0)', title=''),
+        coloraxis_showscale=False
+    )
+    return fig_tech_bar
+
+def build_coocorrencia(model):
+    top_combinations = top_cooccurrences(model)
+    if top_combinations.empty:
+        return None
+
+    df_comb = pd.DataFrame([
+        {'Combinação': f"{tech1} + {tech2}", 'Artigos': count}
+        for (tech1, tech2), count in top_combinations.items()
+    ])
+
+    fig_comb = px.bar(
+        df_comb,
+        x='Artigos',
+        y='Combinação',
+        orientation='h',
+        title="",
+        color='Artigos',
+        color_continuous_scale=[[0, '#fff3e0'], [0.5, '#ff9800'], [1, '#e65100']],
+        text='Artigos'
+    )
+
+    fig_comb.update_traces(
+        texttemplate='%{text}',
+        textposition='outside',
+        marker=dict(cornerradius=5)
+    )
+
+    fig_comb.update_layout(
+        height=400,
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(gridcolor='rgba(0,0,0,0.1)', title='Artigos com as duas tecnologias'),
+        yaxis=dict(gridcolor='rgba(0,0,0,0)', title=''),
+        coloraxis_showscale=False
+    )
+    return fig_comb
+
+def build_pizza(model):
+    waste_df = model.cube.counts('TIPO_RESIDUO').rename_axis('Resíduo').reset_index(name='Quantidade')
+
+    fig_waste_pie = px.pie(
+        waste_df,
+        values='Quantidade',
+        names='Resíduo',
+        title="Distribuição de Tipos de Resíduos",
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+
+    fig_waste_pie.update_traces(
+        textposition='auto',
+        textinfo='percent+label',
+        hovertemplate='<b>%{label}</b><br>Artigos: %{value}<br>Percentual: %{percent}<extra></extra>'
+    )
+
+    fig_waste_pie.update_layout(
+        showlegend=True,
+        legend=dict(orientation="v", yanchor="middle", y=0.5, xanchor="left", x=1.05),
+        margin=dict(l=0, r=150, t=50, b=0)
+    )
+    return fig_waste_pie
+
+def build_evolucao(model):
+    # Artigos por ano e resíduo lidos do cubo de contagens
+    waste_evolution = model.cube.series('TIPO_RESIDUO').rename(columns={'TIPO_RESIDUO': 'Resíduo'})
+    if waste_evolution.empty:
+        return None
+
+    # Criar gráfico de área empilhada
+    fig_waste_time = px.area(
+        waste_evolution,
+        x='Ano',
+        y='Quantidade',
+        color='Resíduo',
+        title="",
+        line_shape='spline',
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+
+    fig_waste_time.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(gridcolor='rgba(0,0,0,0.1)', title='Ano'),
+        yaxis=dict(gridcolor='rgba(0,0,0,0.1)', title='Quantidade de Estudos'),
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
+    )
+    return fig_waste_time
+
+def build_top20(model):
+    top_20 = model.combinations.most_common(20)
+    if not top_20:
+        return None
+    comb_df = pd.DataFrame(
+        [(f"{tech} + {waste}", count) for (tech, waste), count in top_20],
+        columns=['Combinação', 'Artigos']
+    )
+
+    fig_comb_bar = px.bar(
+        comb_df,
+        x='Artigos',
+        y='Combinação',
+        orientation='h',
+        title="",
+        color='Artigos',
+        color_continuous_scale=[[0, '#fce4ec'], [0.5, '#e91e63'], [1, '#880e4f']],
+        text='Artigos'
+    )
+
+    fig_comb_bar.update_traces(
+        texttemplate='%{text}',
+        textposition='outside',
+        marker=dict(cornerradius=5)
+    )
+
+    fig_comb_bar.update_layout(
+        height=700,
+        showlegend=False,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(gridcolor='rgba(0,0,0,0.1)', title='Número de Artigos'),
+        yaxis=dict(gridcolor='rgba(0,0,0,0)', title=''),
+        coloraxis_showscale=False
+    )
+    return fig_comb_bar
+
+def build_heatmap(model):
+    # Matriz tecnologia × resíduo (artigos por par, do cubo de contagens)
+    matrix_df = model.cube.pair('TECNOLOGIA', 'TIPO_RESIDUO')
+    matrix_df = matrix_df.loc[matrix_df.sum(axis=1) > 0, matrix_df.sum(axis=0) > 0]
+    if matrix_df.empty:
+        return None
+
+    # Selecionar top tecnologias e resíduos para melhor visualização
+    top_techs = matrix_df.sum(axis=1).nlargest(10).index
+    top_wastes = matrix_df.sum(axis=0).nlargest(8).index
+    matrix_subset = matrix_df.loc[top_techs, top_wastes]
+
+    fig_heatmap = px.imshow(
+        matrix_subset.values,
+        labels=dict(x="Tipo de Resíduo", y="Tecnologia", color="Artigos"),
+        x=matrix_subset.columns,
+        y=matrix_subset.index,
+        color_continuous_scale='YlOrRd',
+        aspect='auto',
+        title=""
+    )
+
+    fig_heatmap.update_layout(
+        height=500,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=11)
+    )
+    return fig_heatmap
+
+def _rgba(color, alpha):
+    red, green, blue = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return f'rgba({red}, {green}, {blue}, {alpha})'
+
+# Cor dos nós de cada nível do Sankey e do nó 'Outros'
+SANKEY_LEVEL_COLORS = (COLOR_PALETTE['primary'], COLOR_PALETTE['success'], COLOR_PALETTE['info'])
+SANKEY_OTHER_COLOR = '#9CA3AF'
+
+def build_sankey(model, levels=FLOW_LEVELS, top_k=FLOW_TOP_K, others=True):
+    # Nós e ligações calculados das tabelas de pares do cubo (custo linear nas ligações)
+    flows = build_flows(model.cube, levels, top_k, others)
+    if not len(flows):
+        return None
+
+    nodes, links = flows.nodes, flows.links
+    level_position = nodes['level'].map({level: i for i, level in enumerate(levels)}).to_numpy()
+    level_colors = np.array(SANKEY_LEVEL_COLORS, dtype=object)[level_position % len(SANKEY_LEVEL_COLORS)]
+    node_colors = np.where(nodes['other'].to_numpy(), SANKEY_OTHER_COLOR, level_colors)
+    # Cada ligação tem a cor (transparente) do nível de origem
+    link_palette = np.array([_rgba(color, 0.3) for color in SANKEY_LEVEL_COLORS], dtype=object)
+    link_colors = link_palette[level_position[links['source'].to_numpy()] % len(link_palette)]
+
+    fig_sankey = go.Figure(data=[go.Sankey(
+        node=dict(
+            pad=15,
+            thickness=20,
+            line=dict(color="white", width=0.5),
+            label=nodes['label'].tolist(),
+            color=node_colors.tolist()
+        ),
+        link=dict(
+            source=links['source'].tolist(),
+            target=links['target'].tolist(),
+            value=links['value'].tolist(),
+            color=link_colors.tolist()
+        )
+    )])
+
+    fig_sankey.update_layout(
+        title="",
+        font_size=10,
+        # Altura cresce com o nível que tem mais nós
+        height=max(600, 24 * int(nodes['level'].value_counts().max())),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig_sankey
+
+def build_treemap(model):
+    method_df = model.cube.counts('METODOLOGIA').head(15).rename_axis('Metodologia').reset_index(name='Quantidade')
+
+    fig_method = px.treemap(
+        method_df,
+        path=['Metodologia'],
+        values='Quantidade',
+        title="Distribuição de Metodologias Utilizadas",
+        color='Quantidade',
+        color_continuous_scale=[[0, '#e3f2fd'], [0.5, '#2196f3'], [1, '#0d47a1']],
+        hover_data={'Quantidade': ':,'}
+    )
+
+    fig_method.update_traces(
+        textinfo="label+value+percent parent",
+        marker=dict(cornerradius=5)
+    )
+
+    fig_method.update_layout(
+        height=600,
+        margin=dict(t=50, l=0, r=0, b=0)
+    )
+    return fig_method
+
+def build_histograma(model):
+    method_count_df = pd.DataFrame({'Número de Metodologias': model.methods.row_lengths()})
+
+    fig_hist = px.histogram(
+        method_count_df,
+        x='Número de Metodologias',
+        title="",
+        nbins=10,
+        color_discrete_sequence=[COLOR_PALETTE['info']]
+    )
+
+    fig_hist.update_traces(marker=dict(cornerradius=5))
+
+    fig_hist.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(gridcolor='rgba(0,0,0,0.1)', title='Número de Metodologias'),
+        yaxis=dict(gridcolor='rgba(0,0,0,0.1)', title='Quantidade de Artigos'),
+        bargap=0.1
+    )
+    return fig_hist
+
+def build_status(model):
+    # Status_Final não existe mais, assumindo todos incluídos; top 10 metodologias do cubo
+    method_status_filtered = (
+        model.cube.counts('METODOLOGIA').head(10).rename_axis('Metodologia').reset_index(name='Quantidade')
+        .assign(Status='Incluído').sort_values('Metodologia')[['Status', 'Metodologia', 'Quantidade']]
+    )
+    if method_status_filtered.empty:
+        return None
+
+    fig_method_status = px.bar(
+        method_status_filtered,
+        x='Metodologia',
+        y='Quantidade',
+        color='Status',
+        title="",
+        color_discrete_map={
+            'Incluido': COLOR_PALETTE['success'],
+            'Excluido': COLOR_PALETTE['danger'],
+            'Pendente': COLOR_PALETTE['warning']
+        },
+        barmode='group'
+    )
+
+    fig_method_status.update_traces(marker=dict(cornerradius=5))
+
+    fig_method_status.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(gridcolor='rgba(0,0,0,0)', title='', tickangle=-45),
+        yaxis=dict(gridcolor='rgba(0,0,0,0.1)', title='Quantidade'),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        bargap=0.15,
+        bargroupgap=0.1
+    )
+    return fig_method_status
+
+# Construtores por (seção, gráfico), chamados como builder(model, *params). A figura fica
+# guardada por (versão dos dados, seção, gráfico, params), em que params são os valores dos
+# widgets (o Sankey recebe níveis, top-k por nível e 'Outros'); a de params () é a padrão,
+# a única pré-calculada no pacote de artefatos
+CHARTS = {
+    ('visao_geral', 'violin'): build_violin,
+    ('visao_geral', 'timeline'): build_timeline,
+    ('tecnologias', 'top15'): build_top15,
+    ('tecnologias', 'coocorrencia'): build_coocorrencia,
+    ('residuos', 'pizza'): build_pizza,
+    ('residuos', 'evolucao'): build_evolucao,
+    ('combinacoes', 'top20'): build_top20,
+    ('combinacoes', 'heatmap'): build_heatmap,
+    ('combinacoes', 'sankey'): build_sankey,
+    ('metodologias', 'treemap'): build_treemap,
+    ('metodologias', 'histograma'): build_histograma,
+    ('metodologias', 'status'): build_status
+}
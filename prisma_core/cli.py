@@ -0,0 +1,87 @@
+"""
+Linha de comando do núcleo: pré-calcula o pacote de artefatos lido pelo dashboard
+
+    python -m prisma_core build                      # lê a aba principal da planilha
+    python -m prisma_core build --csv artigos.csv    # lê um CSV local
+    python -m prisma_core build --output /tmp/pacote --no-figures
+    python -m prisma_core info                       # descreve o pacote mais recente
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from prisma_core.bundle import BundleStore
+from prisma_core.memory import memory_report
+from prisma_core.model import ArticleModel
+from prisma_core.sources import SHEET_URLS, SheetSource, build_session
+from prisma_core.timing import TRACER
+
+def read_csv(path):
+    """
+    CSV local em UTF-8, com latin-1 como alternativa (como o upload do dashboard)
+    """
+    try:
+        return pd.read_csv(path, encoding='utf-8')
+    except UnicodeDecodeError:
+        return pd.read_csv(path, encoding='latin-1')
+
+def fetch_sheet():
+    source = SheetSource('dados', SHEET_URLS['dados'])
+    return source.accept(source.fetch(build_session(1)))
+
+def build(args):
+    started = time.perf_counter()
+    if args.csv is not None:
+        raw, source = read_csv(args.csv), f'csv:{args.csv.name}'
+    else:
+        raw, source = fetch_sheet(), 'planilha'
+    print(f"{len(raw):,} artigos lidos ({source}) em {time.perf_counter() - started:.1f}s")
+
+    store = BundleStore(args.output)
+    model = ArticleModel(raw)
+    path = store.save(model, raw, source, figures=not args.figures_off)
+    print(f"Pacote gravado em {path} ({time.perf_counter() - started:.1f}s no total)")
+
+    if args.verbose:
+        print(TRACER.stats().to_string(index=False))
+        report = memory_report(model)
+        print(f"\nMemória do modelo: {report['Bytes'].sum() / 2**20:.1f} MiB")
+        print(report.to_string(index=False))
+    return 0
+
+def info(args):
+    manifest = BundleStore(args.output).manifest()
+    if manifest is None:
+        print("Nenhum pacote encontrado")
+        return 1
+    created = datetime.fromtimestamp(manifest['created_at']).strftime('%d/%m/%Y %H:%M')
+    print(f"Versão {manifest['version']} ({manifest['n_articles']:,} artigos, {manifest['source']}), gerado em {created}")
+    print(json.dumps(manifest['libraries'], ensure_ascii=False))
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m prisma_core', description="Núcleo de processamento do Dashboard PRISMA")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--output', type=Path, help="diretório dos pacotes (padrão: PRISMA_BUNDLE_DIR ou .artifacts)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build', parents=[common], help="normaliza os dados e grava um novo pacote")
+    build_parser.add_argument('--csv', type=Path, help="CSV local no lugar da planilha publicada")
+    build_parser.add_argument('--no-figures', dest='figures_off', action='store_true',
+                              help="não pré-calcula as figuras")
+    build_parser.add_argument('--verbose', action='store_true', help="mostra o tempo de cada etapa e a memória do modelo")
+    build_parser.set_defaults(handler=build)
+
+    info_parser = commands.add_parser('info', parents=[common], help="descreve o pacote mais recente")
+    info_parser.set_defaults(handler=info)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Cubo de contagens tecnologia × resíduo × metodologia × ano × país
+"""
+import numpy as np
+import pandas as pd
+
+from prisma_core.taxonomy import NAO_ESPECIFICADO
+
+# Dimensões de rótulos do cubo e pares de dimensões pré-agregados
+LABEL_DIMENSIONS = ('TECNOLOGIA', 'TIPO_RESIDUO', 'METODOLOGIA')
+PAIR_DIMENSIONS = (
+    ('TECNOLOGIA', 'TECNOLOGIA'),
+    ('TECNOLOGIA', 'TIPO_RESIDUO'),
+    ('TECNOLOGIA', 'METODOLOGIA'),
+    ('TIPO_RESIDUO', 'METODOLOGIA')
+)
+
+def _codes(values):
+    """
+    Códigos ordenados de uma coluna (valores ausentes recebem o último código)
+    """
+    codes, uniques = pd.factorize(values, sort=True)
+    codes = np.where(codes < 0, len(uniques), codes)
+    if isinstance(uniques, pd.CategoricalIndex):
+        uniques = uniques.astype(uniques.categories.dtype)
+    return codes.astype(np.int64), pd.Index(uniques)
+
+class Cuboid:
+    """
+    Contagens esparsas de artigos por combinação de rótulos, ano e país:
+    cada célula não vazia é uma linha de 'codes' (um código por eixo) com seu 'count'.
+    """
+
+    def __init__(self, axes, sizes, codes, count):
+        self.axes = tuple(axes)
+        self.sizes = tuple(sizes)
+        self.codes = codes
+        self.count = count
+
+    @classmethod
+    def from_cells(cls, axes, sizes, columns):
+        """
+        Agrega células repetidas (uma por artigo e combinação) em contagens
+        """
+        keys = np.zeros(len(columns[0]), dtype=np.int64)
+        for size, column in zip(sizes, columns):
+            keys = keys * size + column
+        unique, count = np.unique(keys, return_counts=True)
+        return cls(axes, sizes, cls._decode(unique, sizes), count.astype(np.int64))
+
+    @staticmethod
+    def _decode(keys, sizes):
+        codes = np.empty((len(keys), len(sizes)), dtype=np.int64)
+        for axis in reversed(range(len(sizes))):
+            codes[:, axis] = keys % sizes[axis]
+            keys = keys // sizes[axis]
+        return codes
+
+    @classmethod
+    def merge(cls, parts):
+        """
+        Soma cuboides dos mesmos eixos (por exemplo, calculados em blocos)
+        """
+        first = parts[0]
+        keys = np.concatenate([cls._linear(part.codes, part.sizes) for part in parts])
+        counts = np.concatenate([part.count for part in parts])
+        unique, inverse = np.unique(keys, return_inverse=True)
+        count = np.bincount(inverse, weights=counts).astype(np.int64)
+        return cls(first.axes, first.sizes, cls._decode(unique, first.sizes), count)
+
+    @staticmethod
+    def _linear(codes, sizes):
+        keys = np.zeros(len(codes), dtype=np.int64)
+        for axis, size in enumerate(sizes):
+            keys = keys * size + codes[:, axis]
+        return keys
+
+    def rollup(self, axes, where=None):
+        """
+        Soma as células sobre os eixos não pedidos; retorna array denso com os eixos pedidos.
+        where: {eixo: máscara booleana por código} restringe as células antes da soma.
+        """
+        keep = np.ones(len(self.count), dtype=bool)
+        for axis, mask in (where or {}).items():
+            keep &= mask[self.codes[:, self.axes.index(axis)]]
+        positions = [self.axes.index(axis) for axis in axes]
+        sizes = [self.sizes[position] for position in positions]
+        keys = self._linear(self.codes[keep][:, positions], sizes)
+        total = int(np.prod(sizes)) if sizes else 1
+        return np.bincount(keys, weights=self.count[keep], minlength=total).astype(np.int64).reshape(sizes)
+
+class CountCube:
+    """
+    Contagens de artigos por rótulo (e por par de rótulos) × ano × país,
+    calculadas uma vez por versão dos dados a partir das incidências.
+
+    Um artigo conta uma vez em cada célula a que pertence, então qualquer
+    rollup é exato (número de artigos). Consultas percorrem apenas as células
+    não vazias, nunca os artigos: top-N, séries por ano e tabelas de pares.
+    """
+
+    def __init__(self, incidence, years, countries):
+        year_codes, years = _codes(years)
+        # Anos como float, o mesmo tipo lido de um pacote de artefatos
+        self.years = years.astype(float)
+        country_codes, self.countries = _codes(countries)
+        self._year_size = len(self.years) + 1
+        self._country_size = len(self.countries) + 1
+        self.vocabularies = {dimension: incidence[dimension].vocabulary for dimension in LABEL_DIMENSIONS}
+
+        self.cuboids = {(): Cuboid.from_cells(
+            ('ANO', 'PAIS'), (self._year_size, self._country_size), [year_codes, country_codes]
+        )}
+        for dimension in LABEL_DIMENSIONS:
+            matrix = incidence[dimension]
+            article = np.repeat(np.arange(matrix.shape[0]), matrix.row_lengths())
+            self.cuboids[(dimension,)] = Cuboid.from_cells(
+                (dimension, 'ANO', 'PAIS'),
+                (len(matrix.vocabulary), self._year_size, self._country_size),
+                [matrix.indices.astype(np.int64), year_codes[article], country_codes[article]]
+            )
+        for left, right in PAIR_DIMENSIONS:
+            axes = (left, right if right != left else f"{right}_2", 'ANO', 'PAIS')
+            sizes = (len(self.vocabularies[left]), len(self.vocabularies[right]), self._year_size, self._country_size)
+            parts = [
+                Cuboid.from_cells(axes, sizes, [
+                    left_codes.astype(np.int64), right_codes.astype(np.int64),
+                    year_codes[article], country_codes[article]
+                ])
+                for article, left_codes, right_codes in incidence[left].pairs(incidence[right])
+            ]
+            self.cuboids[(left, right)] = Cuboid.merge(parts) if parts else Cuboid(
+                axes, sizes, np.empty((0, len(axes)), dtype=np.int64), np.empty(0, dtype=np.int64)
+            )
+
+    def _where(self, year_range=None, countries=None):
+        where = {}
+        if year_range is not None:
+            years = np.append(self.years.to_numpy(dtype=float), np.nan)
+            where['ANO'] = (years >= year_range[0]) & (years <= year_range[1])
+        if countries:
+            where['PAIS'] = np.append(self.countries.isin(countries), False)
+        return where
+
+    def counts(self, dimension, year_range=None, countries=None, specified=True):
+        """
+        Artigos por rótulo (equivale às somas das colunas da incidência), em ordem decrescente
+        """
+        values = self.cuboids[(dimension,)].rollup((dimension,), self._where(year_range, countries))
+        counts = pd.Series(values, index=self.vocabularies[dimension])
+        if specified:
+            counts = counts.drop(NAO_ESPECIFICADO, errors='ignore')
+        return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+    def top(self, dimension, n, **filters):
+        return self.counts(dimension, **filters).head(n)
+
+    def year_counts(self, countries=None):
+        """
+        Artigos por ano de publicação (só anos válidos)
+        """
+        values = self.cuboids[()].rollup(('ANO',), self._where(countries=countries))
+        return pd.Series(values[:-1], index=self.years.rename('Ano'), name='Quantidade')
+
+    def series(self, dimension, countries=None, specified=True):
+        """
+        Artigos por ano e rótulo, em formato longo (Ano, rótulo, Quantidade), só células não vazias
+        """
+        values = self.cuboids[(dimension,)].rollup((dimension, 'ANO'), self._where(countries=countries))[:, :-1]
+        frame = pd.DataFrame(values, index=self.vocabularies[dimension], columns=self.years)
+        if specified:
+            frame = frame.drop(index=NAO_ESPECIFICADO, errors='ignore')
+        long = frame.T.stack()
+        long = long[long > 0]
+        long.index.names = ['Ano', dimension]
+        return long.rename('Quantidade').reset_index()
+
+    def pair(self, left, right=None, year_range=None, countries=None, specified=True):
+        """
+        Tabela de artigos por par de rótulos (left × right; sem right, co-ocorrência de left)
+        """
+        right = left if right is None else right
+        if (left, right) in self.cuboids:
+            cuboid, transpose = self.cuboids[(left, right)], False
+        else:
+            cuboid, transpose = self.cuboids[(right, left)], True
+        values = cuboid.rollup(cuboid.axes[:2], self._where(year_range, countries))
+        if transpose:
+            values = values.T
+        table = pd.DataFrame(values, index=self.vocabularies[left], columns=self.vocabularies[right])
+        if specified:
+            table = table.drop(index=NAO_ESPECIFICADO, columns=NAO_ESPECIFICADO, errors='ignore')
+        return table
+
+    @property
+    def n_cells(self):
+        return sum(len(cuboid.count) for cuboid in self.cuboids.values())
@@ -0,0 +1,123 @@
+"""
+Expansão colunar artigo × tecnologia × resíduo × metodologia
+"""
+import numpy as np
+import pandas as pd
+
+from prisma_core.normalize import normalize_labels
+from prisma_core.timing import span, timed
+
+# Coluna de origem -> coluna com o rótulo padronizado na expansão
+EXPANDED_COLUMNS = {
+    'TECNOLOGIA': 'Tecnologia_Processada',
+    'TIPO_RESIDUO': 'Tipo_Residuo_Processado',
+    'METODOLOGIA': 'Metodologia_Processada'
+}
+
+class ExpansionView:
+    """
+    Expansão virtual: uma linha por combinação tecnologia/resíduo/metodologia de cada artigo.
+
+    Nada é materializado na construção; apenas o número de combinações por
+    artigo é calculado. A linha expandida p pertence ao artigo a com
+    starts[a] <= p < starts[a + 1], e o deslocamento dentro do artigo é
+    decomposto em base mista (tecnologia, resíduo, metodologia), na mesma
+    ordem dos laços aninhados da versão original.
+    """
+
+    def __init__(self, articles, batches):
+        self.articles = articles
+        self.batches = dict(batches)
+        self._columns = list(EXPANDED_COLUMNS)
+        self._lengths = [self.batches[column].row_lengths().astype(np.int64) for column in self._columns]
+        self._offsets = [self.batches[column].offsets for column in self._columns]
+
+        self.row_counts = np.prod(self._lengths, axis=0) if len(articles) else np.zeros(0, dtype=np.int64)
+        self.starts = np.concatenate([[0], np.cumsum(self.row_counts)]).astype(np.int64)
+
+    def __len__(self):
+        return int(self.starts[-1])
+
+    def article_positions(self):
+        """
+        Posição do artigo de origem de cada linha expandida
+        """
+        return np.repeat(np.arange(len(self.row_counts)), self.row_counts)
+
+    def positions(self, start=0, stop=None):
+        """
+        Índice do artigo e códigos dos rótulos das linhas expandidas [start, stop)
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        return self.decode(np.arange(max(start, 0), max(stop, start), dtype=np.int64))
+
+    def decode(self, expanded):
+        """
+        Índice do artigo e códigos dos rótulos de linhas expandidas quaisquer
+        """
+        expanded = np.asarray(expanded, dtype=np.int64)
+        article = np.searchsorted(self.starts, expanded, side='right') - 1
+        remainder = expanded - self.starts[article]
+
+        codes = {}
+        for level in reversed(range(len(self._columns))):
+            length = self._lengths[level][article]
+            column = self._columns[level]
+            codes[column] = self.batches[column].codes[self._offsets[level][article] + remainder % length]
+            remainder = remainder // length
+        return article, codes
+
+    def level_counts(self, column):
+        """
+        Linhas da expansão por rótulo de uma coluna, sem materializar a expansão
+        """
+        batch = self.batches[column]
+        level = self._columns.index(column)
+        others = self.row_counts // np.maximum(self._lengths[level], 1)
+        counts = np.bincount(batch.codes, weights=np.repeat(others, self._lengths[level]), minlength=len(batch.vocabulary))
+        return pd.Series(counts.astype(np.int64), index=batch.vocabulary)
+
+    @property
+    def columns(self):
+        return list(self.articles.columns) + list(EXPANDED_COLUMNS.values()) + ['_original_index']
+
+    def page(self, start, stop, columns=None):
+        """
+        Materializa somente as linhas expandidas [start, stop) e as colunas pedidas
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        return self.take(np.arange(max(start, 0), max(stop, start), dtype=np.int64), columns)
+
+    def take(self, rows, columns=None):
+        """
+        Materializa somente as linhas expandidas 'rows' (em qualquer ordem) e as colunas pedidas
+        """
+        article, codes = self.decode(rows)
+        source = self.articles if columns is None else self.articles[[c for c in columns if c in self.articles.columns]]
+        frame = source.take(article)
+        for column, name in EXPANDED_COLUMNS.items():
+            if columns is None or name in columns:
+                frame[name] = pd.Categorical.from_codes(codes[column], categories=self.batches[column].vocabulary)
+        if columns is None or '_original_index' in columns:
+            frame['_original_index'] = self.articles.index.to_numpy()[article]
+        return frame
+
+    def materialize(self, columns=None):
+        """
+        Expansão completa como DataFrame
+        """
+        with span('expand.materialize'):
+            return self.page(0, len(self), columns)
+
+@timed('expand_dataframe')
+def expand_dataframe(df, batches=None):
+    """
+    Expande o dataframe para ter uma linha por combinação de tecnologia/resíduo/metodologia
+    """
+    if batches is None:
+        batches = {
+            column: normalize_labels(df[column] if column in df.columns
+                                     else pd.Series(np.nan, index=df.index, name=column))
+            for column in EXPANDED_COLUMNS
+        }
+    return ExpansionView(df, batches).materialize()
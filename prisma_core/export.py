@@ -0,0 +1,114 @@
+"""
+Arquivos de download (CSV, Excel, JSON) gerados sob demanda e guardados em cache.
+
+A tabela é serializada em blocos de linhas (uma QueryView só materializa cada
+bloco), mas o arquivo pronto fica inteiro em memória, e o pico é o tamanho do
+arquivo. Não há como enviá-lo em partes: mesmo com uma função em 'data', o
+st.download_button converte o resultado em bytes e os guarda inteiros no
+armazenamento de mídia do Streamlit, que responde ao navegador de uma vez.
+Os blocos vão para um único BytesIO, cujo getvalue() não copia o conteúdo; o
+mesmo objeto bytes fica no cache e no armazenamento de mídia.
+"""
+import io
+import threading
+from collections import OrderedDict
+
+# Linhas serializadas por bloco e limite de memória do cache de arquivos prontos
+CHUNK_ROWS = 5000
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'json': ('application/json', 'json')
+}
+
+def _chunks(table, size=CHUNK_ROWS):
+    """
+    Blocos de linhas de um DataFrame ou de uma QueryView (que só materializa cada bloco)
+    """
+    page = table.page if hasattr(table, 'page') else lambda start, stop: table.iloc[start:stop]
+    for start in range(0, max(len(table), 1), size):
+        yield page(start, start + size)
+
+def iter_csv(table):
+    """
+    CSV em blocos (com BOM, para o Excel reconhecer UTF-8)
+    """
+    yield '\ufeff'.encode('utf-8')
+    for position, chunk in enumerate(_chunks(table)):
+        yield chunk.to_csv(index=False, header=position == 0).encode('utf-8')
+
+def iter_json(table):
+    """
+    Lista de registros JSON em blocos (mesmo formato de to_json(orient='records', indent=2))
+    """
+    yield b'['
+    first = True
+    for chunk in _chunks(table):
+        if chunk.empty:
+            continue
+        body = chunk.to_json(orient='records', force_ascii=False, indent=2)[1:-1].strip('\n')
+        yield (('\n' if first else ',\n') + body).encode('utf-8')
+        first = False
+    yield b'\n]' if not first else b']'
+
+def iter_xlsx(table):
+    """
+    Planilha Excel escrita linha a linha (openpyxl em modo write_only: as linhas vão para
+    um arquivo temporário, sem objetos de célula); o arquivo pronto sai num único bloco
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Dados')
+    sheet.append([str(column) for column in table.columns])
+    for chunk in _chunks(table):
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    yield buffer.getvalue()
+
+WRITERS = {'csv': iter_csv, 'xlsx': iter_xlsx, 'json': iter_json}
+
+class ExportCache:
+    """
+    Cache LRU (limitado em bytes) dos arquivos de download, compartilhado entre sessões.
+    Os arquivos só são gerados quando alguém pede o download. A chave identifica o
+    recorte, por exemplo (versão dos dados, visão, QueryView.fingerprint()): filtros
+    diferentes que resultam no mesmo recorte reaproveitam o mesmo arquivo. Cada
+    arquivo é guardado inteiro, como bytes.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, fmt, table):
+        """
+        Bytes do arquivo no formato 'fmt' para o recorte 'table' (DataFrame ou QueryView)
+        identificado por 'key'
+        """
+        entry = (key, fmt)
+        with self._lock:
+            if entry in self._files:
+                self._files.move_to_end(entry)
+                return self._files[entry]
+
+        buffer = io.BytesIO()
+        for block in WRITERS[fmt](table):
+            buffer.write(block)
+        data = buffer.getvalue()
+
+        with self._lock:
+            if entry not in self._files:
+                self._files[entry] = data
+                self.size += len(data)
+                while self.size > self.max_bytes and len(self._files) > 1:
+                    _, evicted = self._files.popitem(last=False)
+                    self.size -= len(evicted)
+        return data
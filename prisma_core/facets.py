@@ -0,0 +1,119 @@
+"""
+Índice de facetas com bitmaps compactados (np.packbits) por rótulo
+"""
+import numpy as np
+import pandas as pd
+
+# Tabela de popcount por byte (np.bitwise_count só existe a partir do numpy 2.0)
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+def pack(mask):
+    """
+    Converte uma máscara booleana por artigo em bitmap compactado
+    """
+    return np.packbits(np.asarray(mask, dtype=bool))
+
+def unpack(bits, n_rows):
+    """
+    Converte um bitmap compactado de volta para máscara booleana
+    """
+    return np.unpackbits(bits, count=n_rows).astype(bool)
+
+def popcount(bits, axis=None):
+    """
+    Número de bits ligados (em todo o bitmap ou ao longo de um eixo)
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=axis, dtype=np.int64)
+    return _POPCOUNT[bits].sum(axis=axis, dtype=np.int64)
+
+class FacetIndex:
+    """
+    Bitmaps por rótulo de cada faceta, construídos uma vez por versão dos dados.
+
+    Cada faceta guarda uma matriz (rótulos × bytes) em que a linha j é o bitmap
+    dos artigos com o rótulo j. Dentro de uma faceta os rótulos selecionados
+    são combinados com OU; entre facetas, com E. As contagens de cada opção
+    usam os filtros das demais facetas (a própria seleção não zera as opções
+    irmãs), via AND + popcount, sem tocar na tabela de artigos.
+    """
+
+    def __init__(self, n_rows):
+        self.n_rows = n_rows
+        self.labels = {}
+        self.bitmaps = {}
+
+    def _add(self, name, vocabulary, rows, codes):
+        bitmaps = np.zeros((len(vocabulary), (self.n_rows + 7) // 8), dtype=np.uint8)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(vocabulary)))])
+        for code in range(len(vocabulary)):
+            mask = np.zeros(self.n_rows, dtype=bool)
+            mask[rows[order[bounds[code]:bounds[code + 1]]]] = True
+            bitmaps[code] = pack(mask)
+        bitmaps.flags.writeable = False
+        self.labels[name] = pd.Index(vocabulary)
+        self.bitmaps[name] = bitmaps
+
+    def add_incidence(self, name, incidence):
+        """
+        Faceta multivalorada a partir de uma matriz de incidência
+        """
+        rows = np.repeat(np.arange(incidence.shape[0]), incidence.row_lengths())
+        self._add(name, incidence.vocabulary, rows, incidence.indices)
+
+    def add_categorical(self, name, values):
+        """
+        Faceta de valor único a partir de uma coluna (valores ausentes ficam fora)
+        """
+        codes, uniques = pd.factorize(pd.Series(values))
+        if isinstance(uniques, pd.CategoricalIndex):
+            uniques = uniques.astype(uniques.categories.dtype)
+        rows = np.flatnonzero(codes >= 0)
+        self._add(name, uniques, rows, codes[rows])
+
+    def all_rows(self):
+        """
+        Bitmap com todos os artigos
+        """
+        return pack(np.ones(self.n_rows, dtype=bool))
+
+    def pack(self, mask):
+        return pack(mask)
+
+    def unpack(self, bits):
+        return unpack(bits, self.n_rows)
+
+    def label_bits(self, name, labels):
+        """
+        Bitmap dos artigos com qualquer um dos rótulos (OU)
+        """
+        positions = self.labels[name].get_indexer(list(labels))
+        positions = positions[positions >= 0]
+        if not len(positions):
+            return np.zeros(self.bitmaps[name].shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bitmaps[name][positions], axis=0)
+
+    def mask(self, selections, base=None, exclude=None):
+        """
+        Bitmap dos artigos que atendem a todas as facetas selecionadas (exceto 'exclude')
+        """
+        bits = self.all_rows() if base is None else base.copy()
+        for name, labels in selections.items():
+            if name != exclude and labels:
+                bits &= self.label_bits(name, labels)
+        return bits
+
+    def counts(self, name, selections, base=None):
+        """
+        Contagem ao vivo de cada rótulo da faceta, dados os filtros das outras facetas
+        """
+        bits = self.mask(selections, base=base, exclude=name)
+        return pd.Series(popcount(self.bitmaps[name] & bits, axis=1), index=self.labels[name])
+
+    def options(self, name):
+        """
+        Rótulos com pelo menos um artigo, do mais para o menos frequente
+        """
+        totals = pd.Series(popcount(self.bitmaps[name], axis=1), index=self.labels[name])
+        return totals[totals > 0].sort_values(ascending=False, kind='stable').index.tolist()
@@ -0,0 +1,72 @@
+"""
+Cache LRU de figuras Plotly serializadas
+"""
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Número máximo de figuras guardadas
+FIGURE_CACHE_SIZE = 128
+
+class FigureCache:
+    """
+    Figuras serializadas (JSON) por chave, com descarte da menos usada.
+
+    A chave deve identificar tudo que determina a figura, por exemplo
+    (versão dos dados, seção, gráfico, parâmetros dos widgets). Em um acerto a
+    figura é reconstruída a partir do JSON sem nova validação, o que custa uma
+    fração da construção com plotly.express e não compartilha objetos
+    mutáveis entre sessões.
+    """
+
+    def __init__(self, max_entries=FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()
+        self._preloaded = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._figures)
+
+    def get(self, key, build):
+        """
+        Figura da chave; build() só é chamado quando ela não está no cache.
+        build pode retornar None (nada a exibir), o que também fica guardado.
+        """
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                spec = self._figures[key]
+                return None if spec is None else go.Figure(json.loads(spec), _validate=False)
+
+        figure = build()
+        spec = None if figure is None else pio.to_json(figure, validate=False)
+
+        with self._lock:
+            self.misses += 1
+            self._figures[key] = spec
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure
+
+    def preload(self, version, figures):
+        """
+        Guarda figuras já serializadas ({(seção, gráfico): JSON ou None}) da versão
+        dos dados, sem parâmetros de widget; chaves já presentes não são trocadas.
+        Cada versão é carregada uma vez: as chamadas seguintes não fazem nada.
+        """
+        with self._lock:
+            if version in self._preloaded:
+                return
+            self._preloaded.add(version)
+            for (section, chart), spec in figures.items():
+                self._figures.setdefault((version, section, chart, ()), spec)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
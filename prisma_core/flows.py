@@ -0,0 +1,92 @@
+"""
+Fluxos entre níveis de rótulos (tecnologia → resíduo → metodologia) para o diagrama Sankey
+"""
+import numpy as np
+import pandas as pd
+
+# Níveis do fluxo, na ordem do diagrama
+FLOW_LEVELS = ('TECNOLOGIA', 'TIPO_RESIDUO', 'METODOLOGIA')
+
+# Rótulos com nó próprio em cada nível (os demais vão para 'Outros')
+FLOW_TOP_K = 8
+
+# Nó que junta, em cada nível, os rótulos fora do top-k
+OUTROS = 'Outros'
+
+class Flows:
+    """
+    Nós e ligações de um diagrama de fluxo em níveis.
+
+    nodes: uma linha por nó (level, label, other), na ordem dos níveis;
+    links: uma linha por ligação (source, target: posições em nodes; value: artigos).
+    """
+
+    def __init__(self, nodes, links):
+        self.nodes = nodes
+        self.links = links
+
+    def __len__(self):
+        return len(self.links)
+
+def _node_positions(kept, labels, others):
+    """
+    Nó de cada rótulo de 'labels' dentro do nível: a posição em 'kept' ou, para
+    os demais, o nó 'Outros' (len(kept)); sem 'Outros', -1 (fora do diagrama)
+    """
+    positions = kept.get_indexer(labels)
+    if others:
+        positions = np.where(positions < 0, len(kept), positions)
+    return positions
+
+def build_flows(cube, levels=FLOW_LEVELS, top_k=FLOW_TOP_K, others=True):
+    """
+    Fluxos entre níveis consecutivos a partir das tabelas de pares do cubo de contagens.
+
+    top_k: rótulos mantidos por nível (um número para todos ou um por nível);
+    com others, os demais são somados no nó 'Outros' do nível, senão descartados.
+    O valor de uma ligação é o número de artigos com os dois rótulos ('Outros'
+    soma os pares dos rótulos agrupados). O custo é linear nas células não
+    vazias das tabelas de pares; nenhum laço percorre rótulos ou ligações.
+    """
+    if isinstance(top_k, int):
+        top_k = (top_k,) * len(levels)
+
+    # Nós de cada nível: os k rótulos com mais artigos e, se houver mais, 'Outros'
+    kept, offsets, node_frames = [], [], []
+    offset = 0
+    for level, k in zip(levels, top_k):
+        counts = cube.counts(level)
+        top = counts.index[:k]
+        grouped = others and len(counts) > k
+        kept.append(top)
+        offsets.append(offset)
+        node_frames.append(pd.DataFrame({
+            'level': level,
+            'label': list(top) + [OUTROS] * grouped,
+            'other': [False] * len(top) + [True] * grouped
+        }))
+        offset += len(top) + grouped
+    sizes = [len(frame) for frame in node_frames]
+
+    link_frames = []
+    for i in range(len(levels) - 1):
+        table = cube.pair(levels[i], levels[i + 1])
+        values = table.to_numpy()
+        rows, columns = np.nonzero(values)
+        source = _node_positions(kept[i], table.index, others)[rows]
+        target = _node_positions(kept[i + 1], table.columns, others)[columns]
+        valid = (source >= 0) & (target >= 0)
+
+        # Soma das células por par de nós (chave densa origem × destino)
+        keys = source[valid] * sizes[i + 1] + target[valid]
+        sums = np.bincount(keys, weights=values[rows[valid], columns[valid]], minlength=sizes[i] * sizes[i + 1])
+        pairs = np.flatnonzero(sums)
+        link_frames.append(pd.DataFrame({
+            'source': offsets[i] + pairs // sizes[i + 1],
+            'target': offsets[i + 1] + pairs % sizes[i + 1],
+            'value': sums[pairs].astype(np.int64)
+        }))
+
+    nodes = pd.concat(node_frames, ignore_index=True)
+    links = pd.concat(link_frames, ignore_index=True) if link_frames else pd.DataFrame(columns=['source', 'target', 'value'])
+    return Flows(nodes, links)
@@ -0,0 +1,348 @@
+"""
+Agrupamento em grade das coordenadas dos estudos (mapa de pontos exatos), grades de
+densidade (mapa de calor) e contagens por país e tecnologia (mapa mundial)
+"""
+import numpy as np
+import pandas as pd
+
+from prisma_core.taxonomy import TECH_FLAG_COLUMNS
+
+# Tamanho da célula da grade (graus) de cada nível de agrupamento, do mais amplo ao mais detalhado
+CLUSTER_RESOLUTIONS = {
+    'Continental': 20.0,
+    'Regional': 5.0,
+    'Local': 1.0,
+    'Detalhado': 0.25
+}
+
+# Grupos com até este número de estudos são exibidos como pontos individuais
+POINT_CLUSTER_MAX = 3
+
+# Máximo de pontos individuais por mapa; acima disso os grupos pequenos também viram marcadores
+POINT_LIMIT = 2000
+
+# Tamanho da célula (graus) das grades de densidade do mapa de calor
+DENSITY_RESOLUTIONS = {
+    'Ampla (5°)': 5.0,
+    'Média (2°)': 2.0,
+    'Fina (1°)': 1.0
+}
+
+# Nomes de países da planilha → nomes reconhecidos pelo Plotly (locationmode='country names')
+PLOTLY_COUNTRY_NAMES = {
+    'EUA': 'United States',
+    'USA': 'United States',
+    'Estados Unidos': 'United States',
+    'Reino Unido': 'United Kingdom',
+    'UK': 'United Kingdom',
+    'Coreia do Sul': 'South Korea',
+    'Holanda': 'Netherlands',
+    'Alemanha': 'Germany',
+    'França': 'France',
+    'Espanha': 'Spain',
+    'Itália': 'Italy',
+    'China': 'China',
+    'Brasil': 'Brazil',
+    'Canadá': 'Canada',
+    'Canada': 'Canada',
+    'Austrália': 'Australia',
+    'Australia': 'Australia',
+    'Japão': 'Japan',
+    'India': 'India',
+    'Índia': 'India',
+    'Turquia': 'Turkey',
+    'México': 'Mexico',
+    'Iran': 'Iran',
+    'Irã': 'Iran',
+    'Suécia': 'Sweden',
+    'Noruega': 'Norway',
+    'Dinamarca': 'Denmark',
+    'Finlândia': 'Finland',
+    'Bélgica': 'Belgium',
+    'Suíça': 'Switzerland',
+    'Áustria': 'Austria',
+    'Polônia': 'Poland',
+    'República Tcheca': 'Czech Republic',
+    'Grécia': 'Greece',
+    'Portugal': 'Portugal',
+    'Tailândia': 'Thailand',
+    'Malásia': 'Malaysia',
+    'Singapura': 'Singapore',
+    'Filipinas': 'Philippines',
+    'Indonésia': 'Indonesia',
+    'África do Sul': 'South Africa',
+    'Egito': 'Egypt',
+    'Marrocos': 'Morocco',
+    'Israel': 'Israel',
+    'Arábia Saudita': 'Saudi Arabia',
+    'Emirados Árabes Unidos': 'United Arab Emirates',
+    'Argentina': 'Argentina',
+    'Chile': 'Chile',
+    'Colômbia': 'Colombia',
+    'Peru': 'Peru',
+    'Equador': 'Ecuador',
+    'Venezuela': 'Venezuela',
+    'Uruguai': 'Uruguay',
+    'Paraguai': 'Paraguay',
+    'Bolívia': 'Bolivia',
+    'Rússia': 'Russia',
+    'Ucrânia': 'Ukraine',
+    'Cazaquistão': 'Kazakhstan',
+    'Nova Zelândia': 'New Zealand'
+}
+
+# Grafias (sem diferenciar maiúsculas) → nome do Plotly; os próprios nomes do Plotly também valem
+_PLOTLY_LOOKUP = {
+    **{name.casefold(): name for name in PLOTLY_COUNTRY_NAMES.values()},
+    **{spelling.casefold(): name for spelling, name in PLOTLY_COUNTRY_NAMES.items()}
+}
+
+def plotly_country_name(pais):
+    """
+    Nome do país reconhecido pelo Plotly (ignora maiúsculas e espaços nas pontas); sem correspondência, o próprio texto
+    """
+    text = str(pais).strip()
+    return _PLOTLY_LOOKUP.get(text.casefold(), text)
+
+def valid_coordinates(articles):
+    """
+    Máscara dos artigos com latitude e longitude preenchidas e diferentes de zero
+    """
+    if not {'LATITUDE_DECIMAL', 'LONGITUDE_DECIMAL'} <= set(articles.columns):
+        return np.zeros(len(articles), dtype=bool)
+    latitude = articles['LATITUDE_DECIMAL'].to_numpy(dtype=float, na_value=np.nan)
+    longitude = articles['LONGITUDE_DECIMAL'].to_numpy(dtype=float, na_value=np.nan)
+    return ~np.isnan(latitude) & ~np.isnan(longitude) & (latitude != 0) & (longitude != 0)
+
+class GridClusters:
+    """
+    Estudos de uma indicação de tecnologia agrupados em uma grade de 'size' graus.
+
+    clusters: uma linha por célula não vazia (latitude e longitude médias,
+    count, país mais frequente); members: posições dos artigos, agrupadas por
+    célula na ordem de clusters. Os países chegam como códigos (-1: sem país)
+    de country_names; sem país em nenhum estudo da célula, country fica None.
+    """
+
+    def __init__(self, positions, latitude, longitude, country_codes, country_names, size):
+        rows = np.floor((latitude + 90) / size).astype(np.int64)
+        columns = np.floor((longitude + 180) / size).astype(np.int64)
+        cells, inverse, count = np.unique(rows * int(np.ceil(360 / size) + 1) + columns, return_inverse=True, return_counts=True)
+
+        order = np.argsort(inverse, kind='stable')
+        self.members = positions[order]
+
+        # País mais frequente de cada célula; no empate, o que aparece primeiro entre os estudos da célula
+        named = country_codes >= 0
+        pairs, first, pair_count = np.unique(
+            inverse[named] * (len(country_names) + 1) + country_codes[named], return_index=True, return_counts=True
+        )
+        pair_cluster, pair_country = pairs // (len(country_names) + 1), pairs % (len(country_names) + 1)
+        best = np.lexsort((first, -pair_count, pair_cluster))
+        best = best[np.r_[True, pair_cluster[best][1:] != pair_cluster[best][:-1]]] if len(best) else best
+        main_country = np.full(len(cells), None, dtype=object)
+        main_country[pair_cluster[best]] = np.asarray(country_names, dtype=object)[pair_country[best]]
+
+        # Colunas guardadas como vetores; o DataFrame só é montado na leitura (são 72 grades por modelo)
+        self.columns = {
+            'latitude': np.bincount(inverse, weights=latitude, minlength=len(cells)) / count,
+            'longitude': np.bincount(inverse, weights=longitude, minlength=len(cells)) / count,
+            'count': count.astype(np.int64),
+            'country': main_country
+        }
+
+    @property
+    def clusters(self):
+        return pd.DataFrame(self.columns)
+
+    def split(self, max_points=POINT_CLUSTER_MAX, limit=POINT_LIMIT):
+        """
+        (grupos exibidos como marcadores, posições dos artigos exibidos como pontos):
+        grupos com até max_points estudos viram pontos, desde que o total caiba em limit
+        """
+        count = self.columns['count']
+        small = count <= max_points
+        if count[small].sum() > limit:
+            small[:] = False
+        # members está agrupado por célula: a máscara por célula se repete para cada membro
+        shown = pd.DataFrame({name: values[~small] for name, values in self.columns.items()})
+        return shown, self.members[np.repeat(small, count)]
+
+class PointClusters:
+    """
+    Agrupamentos em grade dos estudos com coordenadas válidas, por indicação de
+    tecnologia ('Sim') e resolução. Todas as grades são calculadas na construção:
+    o objeto é compartilhado pelas sessões da mesma versão dos dados e não muda depois.
+    """
+
+    def __init__(self, articles, flags=TECH_FLAG_COLUMNS, resolutions=CLUSTER_RESOLUTIONS):
+        self.articles = articles
+        self.resolutions = dict(resolutions)
+        self.valid = valid_coordinates(articles)
+
+        # Sem as colunas de coordenadas, nenhum estudo é válido e as grades ficam vazias
+        latitude, longitude = (
+            articles[column].to_numpy(dtype=float, na_value=np.nan) if column in articles.columns else np.full(len(articles), np.nan)
+            for column in ('LATITUDE_DECIMAL', 'LONGITUDE_DECIMAL')
+        )
+        if 'PAIS' in articles.columns:
+            country_codes, country_names = pd.factorize(articles['PAIS'])
+        else:
+            country_codes, country_names = np.full(len(articles), -1, dtype=np.int64), []
+        country_names = np.asarray(country_names, dtype=object)
+
+        self.grids = {}
+        for flag in flags:
+            if flag not in articles.columns:
+                continue
+            positions = self.positions(flag)
+            self.grids[flag] = {
+                name: GridClusters(positions, latitude[positions], longitude[positions], country_codes[positions], country_names, size)
+                for name, size in self.resolutions.items()
+            }
+
+    def positions(self, flag):
+        """
+        Posições dos artigos com a indicação e coordenadas válidas
+        """
+        return np.flatnonzero(self.valid & (self.articles[flag] == 'Sim').to_numpy(dtype=bool, na_value=False))
+
+    def grid(self, flag, resolution):
+        """
+        GridClusters da indicação na resolução (nome em CLUSTER_RESOLUTIONS)
+        """
+        return self.grids[flag][resolution]
+
+def _smooth(grid):
+    """
+    Suavização binomial 3×3 (núcleo [1, 2, 1] / 4 nas duas direções); a longitude
+    dá a volta no antimeridiano e a latitude não passa dos polos
+    """
+    padded = np.pad(grid.astype(float), ((1, 1), (0, 0)))
+    vertical = (padded[:-2] + 2 * padded[1:-1] + padded[2:]) / 4
+    wrapped = np.pad(vertical, ((0, 0), (1, 1)), mode='wrap')
+    return (wrapped[:, :-2] + 2 * wrapped[:, 1:-1] + wrapped[:, 2:]) / 4
+
+class DensityGrids:
+    """
+    Histogramas 2D (latitude × longitude) dos estudos com coordenadas válidas,
+    um por indicação de tecnologia e resolução. Todas as indicações são contadas
+    de uma vez (um bincount por resolução); trocar de tecnologia só consulta a grade.
+    """
+
+    def __init__(self, articles, flags=TECH_FLAG_COLUMNS, resolutions=DENSITY_RESOLUTIONS):
+        self.flags = [flag for flag in flags if flag in articles.columns]
+        self.sizes = dict(resolutions)
+        valid = valid_coordinates(articles)
+        latitude = articles['LATITUDE_DECIMAL'].to_numpy(dtype=float)[valid] if valid.any() else np.empty(0)
+        longitude = articles['LONGITUDE_DECIMAL'].to_numpy(dtype=float)[valid] if valid.any() else np.empty(0)
+
+        # Pares (indicação, estudo) com 'Sim'
+        indicators = np.zeros((len(self.flags), int(valid.sum())), dtype=bool)
+        for i, flag in enumerate(self.flags):
+            indicators[i] = (articles[flag] == 'Sim').to_numpy(dtype=bool, na_value=False)[valid]
+        flag_index, point_index = np.nonzero(indicators)
+
+        self.grids = {}
+        for name, size in self.sizes.items():
+            n_rows, n_columns = int(np.ceil(180 / size)), int(np.ceil(360 / size))
+            rows = np.clip(np.floor((latitude + 90) / size).astype(np.int64), 0, n_rows - 1)
+            columns = np.clip(np.floor((longitude + 180) / size).astype(np.int64), 0, n_columns - 1)
+            cells = rows * n_columns + columns
+            counts = np.bincount(
+                flag_index * (n_rows * n_columns) + cells[point_index],
+                minlength=len(self.flags) * n_rows * n_columns
+            )
+            self.grids[name] = counts.reshape(len(self.flags), n_rows, n_columns).astype(np.int32)
+
+    def grid(self, flag, resolution, smooth=False):
+        """
+        Grade de contagens (linhas: latitude de -90 a 90; colunas: longitude de -180 a 180)
+        """
+        grid = self.grids[resolution][self.flags.index(flag)]
+        return _smooth(grid) if smooth else grid
+
+    def cells(self, flag, resolution, smooth=False):
+        """
+        Células com estudos (centro da célula e contagem), uma linha por célula
+        """
+        size = self.sizes[resolution]
+        grid = self.grid(flag, resolution, smooth)
+        rows, columns = np.nonzero(grid)
+        return pd.DataFrame({
+            'latitude': -90 + (rows + 0.5) * size,
+            'longitude': -180 + (columns + 0.5) * size,
+            'count': grid[rows, columns]
+        })
+
+class CountryMatrix:
+    """
+    Estudos por país e indicação de tecnologia ('Sim'), com os países da planilha
+    agrupados pelo nome reconhecido pelo Plotly. Todas as indicações são contadas
+    de uma vez (um bincount sobre a matriz indicação × artigo); o mapa de uma
+    tecnologia é só uma coluna da matriz.
+
+    counts: DataFrame (países × indicações); names: grafia mais frequente de cada país na planilha.
+    """
+
+    def __init__(self, articles, flags=TECH_FLAG_COLUMNS):
+        self.flags = [flag for flag in flags if flag in articles.columns]
+        if 'PAIS' in articles.columns:
+            codes, values = pd.factorize(articles['PAIS'])
+        else:
+            codes, values = np.full(len(articles), -1), []
+        values = list(values)
+
+        # Cada grafia distinta é padronizada uma vez; grafias do mesmo país viram uma linha
+        value_country, countries = pd.factorize(pd.Index([plotly_country_name(value) for value in values], dtype=object))
+        known = codes >= 0
+        article_country = value_country[codes[known]]
+
+        # Pares (indicação, artigo com país) com 'Sim'
+        indicators = np.zeros((len(self.flags), int(known.sum())), dtype=bool)
+        for i, flag in enumerate(self.flags):
+            indicators[i] = (articles[flag] == 'Sim').to_numpy(dtype=bool, na_value=False)[known]
+        flag_index, article_index = np.nonzero(indicators)
+        counts = np.bincount(
+            flag_index * len(countries) + article_country[article_index],
+            minlength=len(self.flags) * len(countries)
+        ).reshape(len(self.flags), len(countries))
+
+        index = pd.Index(countries, name='País_Padronizado')
+        self.counts = pd.DataFrame(counts.T.astype(np.int64), index=index, columns=self.flags)
+
+        spellings = pd.DataFrame({
+            'country': value_country,
+            'value': pd.Series(values, dtype=object),
+            'articles': np.bincount(codes[known], minlength=len(values))
+        })
+        main = spellings.sort_values('articles', ascending=False, kind='stable').drop_duplicates('country').set_index('country')['value']
+        self.names = pd.Series(main.reindex(np.arange(len(countries))).to_numpy(), index=index, name='País')
+
+    def country_counts(self, flag):
+        """
+        Países com estudos da indicação (País, País_Padronizado, Quantidade_Estudos), do maior para o menor
+        """
+        counts = self.counts[flag]
+        counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+        return pd.DataFrame({
+            'País': self.names[counts.index].to_numpy(),
+            'País_Padronizado': counts.index,
+            'Quantidade_Estudos': counts.to_numpy()
+        })
+
+    def long(self):
+        """
+        Células não vazias da matriz em formato longo (uma linha por país e indicação),
+        com a participação do país nos estudos da indicação (%)
+        """
+        values = self.counts.to_numpy()
+        rows, columns = np.nonzero(values)
+        totals = values.sum(axis=0)
+        return pd.DataFrame({
+            'País': self.names.to_numpy()[rows],
+            'País_Padronizado': self.counts.index[rows],
+            'Tecnologia': np.asarray(self.flags, dtype=object)[columns],
+            'Quantidade_Estudos': values[rows, columns],
+            'Participação': 100 * values[rows, columns] / totals[columns]
+        })
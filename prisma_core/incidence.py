@@ -0,0 +1,107 @@
+"""
+Matrizes de incidência esparsas artigo × categoria (CSR em numpy)
+"""
+import numpy as np
+import pandas as pd
+
+# Artigos processados por bloco nos produtos (limita a memória temporária dos pares)
+PRODUCT_CHUNK = 65536
+
+class Incidence:
+    """
+    Matriz booleana artigo × rótulo em formato CSR: os rótulos do artigo i são
+    indices[indptr[i]:indptr[i + 1]], sem repetição e em ordem crescente.
+    """
+
+    def __init__(self, indptr, indices, vocabulary):
+        self.indptr = indptr
+        self.indices = indices
+        self.vocabulary = vocabulary
+        self.indptr.flags.writeable = False
+        self.indices.flags.writeable = False
+
+    @classmethod
+    def from_batch(cls, batch):
+        """
+        Constrói a incidência a partir de um LabelBatch (rótulos repetidos contam uma vez)
+        """
+        n_labels = len(batch.vocabulary)
+        keys = np.unique(batch.rows().astype(np.int64) * n_labels + batch.codes)
+        rows = keys // n_labels
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=batch.n_rows))]).astype(np.int64)
+        return cls(indptr, (keys % n_labels).astype(np.int32), batch.vocabulary)
+
+    @property
+    def shape(self):
+        return len(self.indptr) - 1, len(self.vocabulary)
+
+    def row_lengths(self):
+        return np.diff(self.indptr)
+
+    def column_sums(self):
+        """
+        Número de artigos com cada rótulo
+        """
+        return pd.Series(np.bincount(self.indices, minlength=len(self.vocabulary)), index=self.vocabulary)
+
+    def column_mask(self, label):
+        """
+        Máscara booleana dos artigos que têm o rótulo
+        """
+        mask = np.zeros(self.shape[0], dtype=bool)
+        if label in self.vocabulary:
+            code = self.vocabulary.get_loc(label)
+            rows = np.repeat(np.arange(self.shape[0]), self.row_lengths())
+            mask[rows[self.indices == code]] = True
+        return mask
+
+    def to_dense(self):
+        dense = np.zeros(self.shape, dtype=bool)
+        dense[np.repeat(np.arange(self.shape[0]), self.row_lengths()), self.indices] = True
+        return dense
+
+    def select_rows(self, rows):
+        """
+        Submatriz com as linhas (posições) informadas, na ordem dada
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        lengths = self.row_lengths()[rows]
+        indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        positions = np.repeat(self.indptr[rows] - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return Incidence(indptr, self.indices[positions], self.vocabulary)
+
+    def pairs(self, other=None):
+        """
+        Percorre, em blocos de artigos, todos os pares (rótulo de self, rótulo de other)
+        de cada artigo. Gera trios de vetores (artigo, rótulo da esquerda, rótulo da direita).
+        """
+        other = self if other is None else other
+        left_lengths, right_lengths = self.row_lengths(), other.row_lengths()
+        for start in range(0, self.shape[0], PRODUCT_CHUNK):
+            stop = min(start + PRODUCT_CHUNK, self.shape[0])
+            pairs = left_lengths[start:stop] * right_lengths[start:stop]
+            total = int(pairs.sum())
+            if not total:
+                continue
+
+            article = np.repeat(np.arange(start, stop), pairs)
+            offset = np.arange(total) - np.repeat(np.cumsum(pairs) - pairs, pairs)
+            right_length = right_lengths[article]
+            left = self.indices[self.indptr[article] + offset // right_length]
+            right = other.indices[other.indptr[article] + offset % right_length]
+            yield article, left, right
+
+    def cross(self, other=None):
+        """
+        Produto self.T @ other (contagem de artigos por par de rótulos), como DataFrame.
+        Sem other, calcula a co-ocorrência self.T @ self.
+        """
+        other = self if other is None else other
+        n_left, n_right = len(self.vocabulary), len(other.vocabulary)
+        counts = np.zeros(n_left * n_right, dtype=np.int64)
+
+        # Cada par (rótulo da esquerda, rótulo da direita) de um artigo vira uma posição linear
+        for _, left, right in self.pairs(other):
+            counts += np.bincount(left.astype(np.int64) * n_right + right, minlength=n_left * n_right)
+
+        return pd.DataFrame(counts.reshape(n_left, n_right), index=self.vocabulary, columns=other.vocabulary)
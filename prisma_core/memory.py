@@ -0,0 +1,98 @@
+"""
+Tipos compactos das tabelas do modelo e relatório de memória por coluna
+"""
+import numpy as np
+import pandas as pd
+
+from prisma_core.taxonomy import TECH_FLAG_COLUMNS
+
+# Colunas de texto com poucos valores distintos, guardadas como categóricas
+CATEGORY_COLUMNS = ('PAIS', 'CLIMA', 'LOCALIZACAO', 'País_Processado') + TECH_FLAG_COLUMNS
+
+# Colunas de ano, guardadas como inteiros pequenos anuláveis
+YEAR_COLUMNS = ('ANO', 'Ano')
+
+# Coordenadas em graus decimais, guardadas em float32 (precisão de ~1 m)
+COORDINATE_COLUMNS = ('LATITUDE_DECIMAL', 'LONGITUDE_DECIMAL')
+
+def small_integer(series):
+    """
+    Coluna numérica de valores inteiros como Int16 (ou Int32, se não couber);
+    colunas com texto ou frações ficam como estão
+    """
+    if not pd.api.types.is_numeric_dtype(series.dtype):
+        return series
+    values = series.dropna()
+    if len(values) and not (values == np.round(values)).all():
+        return series
+    for dtype, nullable in ((np.int16, 'Int16'), (np.int32, 'Int32')):
+        bounds = np.iinfo(dtype)
+        if not len(values) or (values.min() >= bounds.min and values.max() <= bounds.max):
+            return series.astype(nullable)
+    return series
+
+def compact_frame(df):
+    """
+    Converte, no próprio DataFrame, as colunas conhecidas para os tipos compactos:
+    categóricas para rótulos repetidos, inteiros pequenos para anos e float32 para coordenadas
+    """
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    for column in YEAR_COLUMNS:
+        if column in df.columns:
+            df[column] = small_integer(df[column])
+    for column in COORDINATE_COLUMNS:
+        if column in df.columns and pd.api.types.is_float_dtype(df[column].dtype):
+            df[column] = df[column].astype(np.float32)
+    return df
+
+def _array_bytes(value, shared=()):
+    """
+    Bytes dos vetores e tabelas de uma estrutura (percorre dicionários, listas e
+    atributos); objetos em 'shared' já são contados à parte e valem zero
+    """
+    if any(value is item for item in shared):
+        return 0
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.Index, pd.Series)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sum(_array_bytes(item, shared) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_array_bytes(item, shared) for item in value)
+    if hasattr(value, '__dict__'):
+        return sum(_array_bytes(item, shared) for item in vars(value).values())
+    return 0
+
+def memory_report(model):
+    """
+    Bytes por coluna das tabelas do modelo (artigos em tipos compactos e, se já
+    calculada, a visão processada com os rótulos em categóricas) e por estrutura
+    das visões já calculadas (códigos dos rótulos, bitmaps, cubo, índices),
+    como (tabela, coluna, tipo, bytes), da maior para a menor
+    """
+    rows = []
+    frames = {'articles': model.articles}
+    if 'processed_frame' in model.__dict__:
+        frames['processed_frame'] = model.__dict__['processed_frame']
+    for table, frame in frames.items():
+        usage = frame.memory_usage(deep=True, index=False)
+        # Visões derivadas compartilham as colunas da tabela de artigos; só as novas contam
+        columns = frame.columns if table == 'articles' else frame.columns.difference(model.articles.columns)
+        rows += [(table, column, str(frame[column].dtype), int(usage[column])) for column in columns]
+
+    for column, batch in model.batches.items():
+        rows.append(('batches', column, 'LabelBatch', _array_bytes([batch.offsets, batch.codes, batch.vocabulary])))
+    for name in ('incidence', 'facets', 'cube', 'search_index', 'point_clusters', 'density_grids', 'country_matrix'):
+        if name in model.__dict__:
+            view = model.__dict__[name]
+            # O índice de busca guarda uma referência à visão processada, já contada acima
+            shared = (model.articles, model.__dict__.get('processed_frame'))
+            rows.append(('visões', name, type(view).__name__, _array_bytes(view, shared=shared)))
+
+    report = pd.DataFrame(rows, columns=['Tabela', 'Coluna', 'Tipo', 'Bytes'])
+    return report.sort_values('Bytes', ascending=False, kind='stable').reset_index(drop=True)
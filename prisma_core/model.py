@@ -0,0 +1,290 @@
+"""
+Modelo normalizado dos artigos, construído uma vez por versão dos dados
+"""
+import hashlib
+from collections import Counter
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from prisma_core.cube import CountCube
+from prisma_core.expand import ExpansionView
+from prisma_core.facets import FacetIndex
+from prisma_core.geo import CountryMatrix, DensityGrids, PointClusters
+from prisma_core.incidence import Incidence
+from prisma_core.memory import compact_frame
+from prisma_core.normalize import merge_batches, normalize_labels
+from prisma_core.search import SearchIndex
+from prisma_core.taxonomy import NAO_ESPECIFICADO, normalize_country
+from prisma_core.timing import span, timed
+
+# Colunas multivaloradas e os nomes das colunas derivadas correspondentes
+LIST_COLUMNS = {
+    'TECNOLOGIA': 'Tecnologias_Lista',
+    'TIPO_RESIDUO': 'Residuos_Lista',
+    'METODOLOGIA': 'Metodologias_Lista'
+}
+
+PROCESSED_COLUMNS = {
+    'TECNOLOGIA': 'Tecnologias_Processadas',
+    'TIPO_RESIDUO': 'Residuos_Processados',
+    'METODOLOGIA': 'Metodologias_Processadas'
+}
+
+def data_version(df):
+    """
+    Identificador estável do conteúdo de um DataFrame (colunas + valores)
+    """
+    digest = hashlib.sha1()
+    digest.update('\x1f'.join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+def specified(matrix):
+    """
+    Remove a linha/coluna 'Não especificado' de uma tabela de pares de rótulos
+    """
+    return matrix.drop(index=NAO_ESPECIFICADO, columns=NAO_ESPECIFICADO, errors='ignore')
+
+@timed('analyze_combinations')
+def analyze_combinations(tech_incidence, waste_incidence):
+    """
+    Analisa as combinações mais comuns de tecnologia + resíduo.
+    Retorna um Counter com chaves (tecnologia, resíduo) = número de artigos.
+    """
+    matrix = specified(tech_incidence.cross(waste_incidence))
+    pairs = matrix.stack()
+    pairs = pairs[pairs > 0]
+    return Counter({(tech, waste): int(count) for (tech, waste), count in pairs.items()})
+
+def _freeze(batch):
+    batch.offsets.flags.writeable = False
+    batch.codes.flags.writeable = False
+    return batch
+
+def _column(df, column):
+    if column in df.columns:
+        return df[column]
+    return pd.Series(np.nan, index=df.index, name=column)
+
+def _derive_columns(df):
+    """
+    Cópia da tabela com as colunas derivadas País_Processado e Ano, nos tipos compactos
+    """
+    articles = df.copy()
+    if 'PAIS' in articles.columns:
+        # Cada país distinto é processado uma vez; o código -1 (vazio) cai no último elemento
+        codes, uniques = pd.factorize(articles['PAIS'])
+        countries = [normalize_country(value) for value in uniques] + [normalize_country(None)]
+        country_codes, categories = pd.factorize(pd.Index(countries), sort=True)
+        articles['País_Processado'] = pd.Categorical.from_codes(country_codes[codes], categories=categories)
+    if 'ANO' in articles.columns:
+        articles['Ano'] = pd.to_numeric(articles['ANO'], errors='coerce')
+    return compact_frame(articles)
+
+class ArticleModel:
+    """
+    Visão normalizada e imutável dos artigos de uma versão dos dados.
+
+    Guarda a tabela de artigos com as colunas derivadas (País_Processado, Ano)
+    em tipos compactos (categóricas, anos Int16, coordenadas float32) e a
+    normalização de cada coluna multivalorada (LabelBatch). Textos
+    processados, contagens e visões derivadas são calculados sob demanda e
+    reaproveitadas por todas as seções. Nada aqui deve ser modificado no lugar:
+    quem precisar alterar uma tabela deve trabalhar sobre uma cópia.
+    """
+
+    def __init__(self, df, version=None):
+        self.version = version or data_version(df)
+        with span('model.build'):
+            self.articles = _derive_columns(df)
+            self.batches = {
+                column: _freeze(normalize_labels(_column(self.articles, column)))
+                for column in LIST_COLUMNS
+            }
+
+    @timed('model.patched')
+    def patched(self, df, diff, version=None):
+        """
+        Modelo da nova versão da tabela (diff: RowDiff em relação a esta versão).
+
+        Só as linhas adicionadas ou alteradas são renormalizadas e, se o índice
+        de busca já existe, tokenizadas; as demais têm rótulos e listas de
+        postagem copiados deste modelo. Incidências, facetas e cubo são
+        recalculados (sob demanda ou em warm()) a partir dos rótulos já
+        mesclados: são contagens vetorizadas sobre os códigos, sem
+        renormalização nem tokenização.
+        """
+        model = ArticleModel.__new__(ArticleModel)
+        model.version = version or data_version(df)
+        model.articles = _derive_columns(df)
+
+        fresh_frame = model.articles.iloc[diff.fresh]
+        fresh = {column: normalize_labels(_column(fresh_frame, column)) for column in LIST_COLUMNS}
+        model.batches = {
+            column: _freeze(merge_batches(
+                [(self.batches[column].take(diff.kept_old), diff.kept_new), (fresh[column], diff.fresh)],
+                model.articles.index
+            ))
+            for column in LIST_COLUMNS
+        }
+
+        if 'search_index' in self.__dict__:
+            # A tokenização é a etapa mais cara do warm(); as linhas mantidas reaproveitam suas listas
+            with span('model.search_index'):
+                model.search_index = self.search_index.patched(model.processed_frame, diff)
+
+        return model
+
+    def warm(self):
+        """
+        Calcula as visões usadas por todas as seções (incidências, facetas,
+        combinações, cubo de contagens, índice de busca e agrupamentos do mapa
+        de pontos), para que o modelo já chegue pronto a quem o ler
+        """
+        with span('model.warm'):
+            self.incidence
+            self.facets
+            self.combinations
+            self.cube
+            self.search_index
+            self.point_clusters
+        return self
+
+    @property
+    def n_articles(self):
+        return len(self.articles)
+
+    @property
+    def techs(self):
+        return self.batches['TECNOLOGIA']
+
+    @property
+    def wastes(self):
+        return self.batches['TIPO_RESIDUO']
+
+    @property
+    def methods(self):
+        return self.batches['METODOLOGIA']
+
+    def counter(self, column):
+        """
+        Contagem de ocorrências de cada rótulo (equivale a Counter das listas concatenadas)
+        """
+        counts = self.batches[column].counts()
+        return Counter(counts[counts > 0].to_dict())
+
+    @cached_property
+    def df_year(self):
+        """
+        Artigos com ano de publicação válido
+        """
+        if 'Ano' not in self.articles.columns:
+            return self.articles.iloc[0:0]
+        return self.articles[self.articles['Ano'].notna()]
+
+    @cached_property
+    def processed_frame(self):
+        """
+        Artigos com os rótulos padronizados em texto (visão 'Dados Processados'), como categóricas
+        """
+        return self.articles.assign(**{
+            name: self.batches[column].to_joined(', ') for column, name in PROCESSED_COLUMNS.items()
+        })
+
+    @cached_property
+    def expansion(self):
+        """
+        Expansão virtual tecnologia × resíduo × metodologia (contagens e páginas sob demanda)
+        """
+        return ExpansionView(self.articles, self.batches)
+
+    @cached_property
+    def incidence(self):
+        """
+        Matrizes de incidência artigo × rótulo de cada coluna multivalorada
+        """
+        with span('model.incidence'):
+            return {column: Incidence.from_batch(batch) for column, batch in self.batches.items()}
+
+    def cross(self, left, right=None):
+        """
+        Contagem de artigos por par de rótulos (left.T @ right), sem 'Não especificado'
+        """
+        right = self.incidence[right] if right is not None else None
+        return specified(self.incidence[left].cross(right))
+
+    @cached_property
+    def facets(self):
+        """
+        Bitmaps por rótulo de tecnologia, resíduo, metodologia e país processado
+        """
+        incidences = self.incidence
+        with span('model.facets'):
+            facets = FacetIndex(self.n_articles)
+            for column, incidence in incidences.items():
+                facets.add_incidence(column, incidence)
+            if 'País_Processado' in self.articles.columns:
+                facets.add_categorical('País_Processado', self.articles['País_Processado'])
+            return facets
+
+    @cached_property
+    def cube(self):
+        """
+        Cubo de contagens rótulo × ano × país lido pelos gráficos das seções
+        """
+        incidence = self.incidence
+        with span('model.cube'):
+            return CountCube(incidence, _column(self.articles, 'Ano'), _column(self.articles, 'País_Processado'))
+
+    @cached_property
+    def search_index(self):
+        """
+        Índice invertido das colunas de texto, incluindo os rótulos padronizados
+        """
+        frame = self.processed_frame
+        with span('model.search_index'):
+            return SearchIndex(frame)
+
+    @cached_property
+    def point_clusters(self):
+        """
+        Agrupamentos em grade dos estudos com coordenadas, por indicação de tecnologia (mapa de pontos)
+        """
+        with span('model.point_clusters'):
+            return PointClusters(self.articles)
+
+    @cached_property
+    def density_grids(self):
+        """
+        Histogramas 2D das coordenadas dos estudos por indicação de tecnologia (mapa de calor)
+        """
+        with span('model.density_grids'):
+            return DensityGrids(self.articles)
+
+    @cached_property
+    def country_matrix(self):
+        """
+        Estudos por país e indicação de tecnologia (mapa mundial e comparação entre tecnologias)
+        """
+        with span('model.country_matrix'):
+            return CountryMatrix(self.articles)
+
+    @cached_property
+    def combinations(self):
+        """
+        Counter das combinações (tecnologia, resíduo) com o número de artigos que
+        têm o par (um artigo conta uma vez por par), lido do cubo de contagens
+        """
+        pairs = self.cube.pair('TECNOLOGIA', 'TIPO_RESIDUO').stack()
+        pairs = pairs[pairs > 0]
+        return Counter({(tech, waste): int(count) for (tech, waste), count in pairs.items()})
+
+    def coverage(self, column):
+        """
+        Fração dos artigos com pelo menos um rótulo especificado
+        """
+        if not self.n_articles:
+            return 0.0
+        return float((~self.batches[column].rows_with(NAO_ESPECIFICADO)).mean())
@@ -0,0 +1,167 @@
+"""
+Normalização vetorizada de colunas multivaloradas (uma coluna por vez)
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from prisma_core.taxonomy import DEFAULT_SEPARATORS, MATCHERS, NAO_ESPECIFICADO, compile_separators
+from prisma_core.timing import span
+
+class LabelBatch:
+    """
+    Resultado da normalização de uma coluna em formato CSR: codes[i] é o código
+    do rótulo em vocabulary, e os rótulos do artigo j ficam em
+    codes[offsets[j]:offsets[j + 1]], na ordem em que aparecem na célula.
+    """
+
+    def __init__(self, offsets, codes, vocabulary, index):
+        self.offsets = offsets
+        self.codes = codes
+        self.vocabulary = vocabulary
+        self.index = index
+
+    @classmethod
+    def from_rows(cls, rows, codes, vocabulary, index):
+        """
+        LabelBatch a partir da posição do artigo de cada ocorrência (rows já agrupadas por artigo)
+        """
+        lengths = np.bincount(rows, minlength=len(index))
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        return cls(offsets, codes.astype(np.int32), vocabulary, index)
+
+    @property
+    def n_rows(self):
+        return len(self.index)
+
+    def row_lengths(self):
+        """
+        Quantidade de rótulos por artigo
+        """
+        return np.diff(self.offsets)
+
+    def rows(self):
+        """
+        Posição do artigo de cada ocorrência (calculada a partir de offsets, não guardada)
+        """
+        return np.repeat(np.arange(self.n_rows, dtype=np.int32), self.row_lengths())
+
+    def take(self, positions):
+        """
+        Novo LabelBatch só com os artigos nas posições informadas (na ordem dada)
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        lengths = self.row_lengths()[positions]
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        entries = np.repeat(self.offsets[positions] - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return LabelBatch(offsets, self.codes[entries], self.vocabulary, self.index[positions])
+
+    def rows_with(self, label):
+        """
+        Máscara booleana dos artigos que contêm o rótulo
+        """
+        mask = np.zeros(self.n_rows, dtype=bool)
+        if label in self.vocabulary:
+            mask[self.rows()[self.codes == self.vocabulary.get_loc(label)]] = True
+        return mask
+
+    def labels(self):
+        """
+        Rótulos de todas as ocorrências como Categorical
+        """
+        return pd.Categorical.from_codes(self.codes, categories=self.vocabulary)
+
+    def counts(self):
+        """
+        Ocorrências de cada rótulo do vocabulário
+        """
+        return pd.Series(
+            np.bincount(self.codes, minlength=len(self.vocabulary)),
+            index=self.vocabulary
+        )
+
+    def _arrow_lists(self):
+        return pa.ListArray.from_arrays(
+            pa.array(self.offsets, type=pa.int32()),
+            pa.DictionaryArray.from_arrays(pa.array(self.codes, type=pa.int32()), pa.array(self.vocabulary, type=pa.string()))
+        )
+
+    def to_joined(self, separator=', '):
+        """
+        Rótulos de cada artigo unidos em texto, como categórica (uma cópia de cada texto distinto)
+        """
+        lists = self._arrow_lists().cast(pa.list_(pa.string()))
+        joined = pc.binary_join(lists, separator).dictionary_encode()
+        return pd.Series(
+            pd.Categorical.from_codes(joined.indices.to_numpy(), categories=joined.dictionary.to_pylist()),
+            index=self.index
+        )
+
+def normalize_labels(series, matcher=None, separators=DEFAULT_SEPARATORS):
+    """
+    Separa e padroniza uma coluna inteira de uma vez.
+
+    Usa str.split/explode do pandas para obter os tokens, resolve cada token
+    distinto uma única vez no matcher e devolve códigos inteiros mais o
+    vocabulário (LabelBatch). Sem matcher, usa o da coluna (series.name).
+    """
+    if matcher is None:
+        matcher = MATCHERS[series.name]
+
+    with span(f"normalize.{series.name}"):
+        n_rows = len(series)
+        text = series.reset_index(drop=True).astype('string').str.strip()
+        tokens = text.str.split(compile_separators(tuple(separators)), regex=True).explode().str.strip()
+        tokens = tokens[tokens.notna() & (tokens != '')]
+
+        token_codes, unique_tokens = pd.factorize(tokens)
+        resolved = [matcher.resolve(token) for token in unique_tokens]
+
+        # Rótulos de cada token distinto, concatenados (layout offsets + valores)
+        token_labels = [label for labels, _ in resolved for label in labels]
+        vocabulary = pd.Index(sorted(set(token_labels) | {NAO_ESPECIFICADO}))
+        label_codes = vocabulary.get_indexer(token_labels)
+        lengths = np.array([len(labels) for labels, _ in resolved], dtype=np.int64)
+        matched = np.array([is_matched for _, is_matched in resolved], dtype=bool)
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+
+        # Expande cada ocorrência de token nos seus rótulos
+        repeat = lengths[token_codes]
+        total = int(repeat.sum())
+        first = np.repeat(np.cumsum(repeat) - repeat, repeat)
+        positions = np.repeat(starts[token_codes], repeat) + np.arange(total) - first
+        rows = np.repeat(tokens.index.to_numpy(dtype=np.int64), repeat)
+        codes = label_codes[positions] if total else np.empty(0, dtype=np.int64)
+        from_taxonomy = np.repeat(matched[token_codes], repeat)
+
+        if matcher.dedupe and total:
+            duplicated = pd.Series(rows * len(vocabulary) + codes).duplicated().to_numpy()
+            keep = ~(duplicated & from_taxonomy)
+            rows, codes = rows[keep], codes[keep]
+
+        # Artigos sem nenhum rótulo recebem 'Não especificado'
+        empty_rows = np.flatnonzero(np.bincount(rows, minlength=n_rows) == 0)
+        if len(empty_rows):
+            rows = np.concatenate([rows, empty_rows])
+            codes = np.concatenate([codes, np.full(len(empty_rows), vocabulary.get_loc(NAO_ESPECIFICADO))])
+            order = np.argsort(rows, kind='stable')
+            rows, codes = rows[order], codes[order]
+
+        return LabelBatch.from_rows(rows, codes, vocabulary, series.index)
+
+def merge_batches(parts, index):
+    """
+    Junta LabelBatches em um só: parts é uma lista de (batch, posições de destino),
+    em que a linha i de cada batch vai para a posição posições[i] do resultado.
+    O vocabulário resultante contém apenas os rótulos ainda em uso.
+    """
+    used = set()
+    for batch, _ in parts:
+        used.update(batch.vocabulary[np.unique(batch.codes)])
+    vocabulary = pd.Index(sorted(used | {NAO_ESPECIFICADO}))
+
+    rows = np.concatenate([np.asarray(targets, dtype=np.int64)[batch.rows()] for batch, targets in parts])
+    codes = np.concatenate([vocabulary.get_indexer(batch.vocabulary)[batch.codes] for batch, _ in parts])
+    order = np.argsort(rows, kind='stable')
+    return LabelBatch.from_rows(rows[order], codes[order], vocabulary, index)
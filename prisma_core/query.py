@@ -0,0 +1,120 @@
+"""
+Consulta preguiçosa sobre uma tabela: filtros viram seleção de linhas, só a página é materializada
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from prisma_core.expand import EXPANDED_COLUMNS, ExpansionView
+
+class QueryView:
+    """
+    Seleção de linhas e colunas de uma tabela (DataFrame ou ExpansionView),
+    sem cópias. Filtros e ordenações só alteram o vetor de posições; contar
+    resultados é len(); page() materializa apenas as linhas e colunas pedidas.
+
+    row_articles: artigo de origem de cada linha da tabela, quando ela não tem
+    uma linha por artigo (expansão), para aplicar máscaras por artigo.
+    extras: colunas calculadas (um valor por linha da tabela), anexadas às páginas.
+    """
+
+    def __init__(self, source, row_articles=None, columns=None, positions=None, extras=None):
+        self.source = source
+        self.row_articles = row_articles
+        self.columns = list(source.columns) if columns is None else list(columns)
+        self.positions = np.arange(len(source)) if positions is None else positions
+        self.extras = dict(extras or {})
+
+    def _derive(self, **changes):
+        state = dict(row_articles=self.row_articles, columns=self.columns, positions=self.positions, extras=self.extras)
+        state.update(changes)
+        return QueryView(self.source, **state)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def dtype(self, column):
+        if isinstance(self.source, ExpansionView) and column in EXPANDED_COLUMNS.values():
+            return pd.CategoricalDtype()
+        if column in self.extras:
+            return self.extras[column].dtype
+        if column == '_original_index':
+            return self.source.articles.index.dtype
+        frame = self.source.articles if isinstance(self.source, ExpansionView) else self.source
+        return frame.dtypes[column]
+
+    def select(self, columns):
+        """
+        Restringe às colunas existentes em 'columns' (na ordem pedida)
+        """
+        available = set(self.columns)
+        return self._derive(columns=[column for column in columns if column in available])
+
+    def articles(self):
+        """
+        Posição do artigo de origem de cada linha selecionada
+        """
+        return self.positions if self.row_articles is None else self.row_articles[self.positions]
+
+    def where(self, mask):
+        """
+        Mantém as linhas selecionadas com mask verdadeiro (um valor por linha selecionada)
+        """
+        return self._derive(positions=self.positions[mask])
+
+    def filter_articles(self, article_mask):
+        """
+        Mantém as linhas cujos artigos de origem estão em article_mask
+        """
+        return self.where(article_mask[self.articles()])
+
+    def sort_by(self, values, descending=True):
+        """
+        Reordena as linhas selecionadas por um valor por linha da tabela (ordenação estável)
+        """
+        keys = values[self.positions]
+        order = np.argsort(-keys if descending else keys, kind='stable')
+        return self._derive(positions=self.positions[order])
+
+    def with_column(self, name, values):
+        """
+        Anexa uma coluna calculada (um valor por linha da tabela)
+        """
+        return self._derive(columns=self.columns + [name], extras={**self.extras, name: np.asarray(values)})
+
+    def _take(self, rows, columns):
+        source_columns = [column for column in columns if column not in self.extras]
+        if isinstance(self.source, ExpansionView):
+            frame = self.source.take(rows, source_columns)
+        else:
+            frame = self.source.iloc[rows, self.source.columns.get_indexer(source_columns)]
+        frame = frame.assign(**{name: self.extras[name][rows] for name in columns if name in self.extras})
+        return frame[columns]
+
+    def page(self, start, stop):
+        """
+        Materializa só as linhas [start, stop) da seleção, nas colunas selecionadas
+        """
+        return self._take(self.positions[start:stop], self.columns)
+
+    def column(self, name):
+        """
+        Uma coluna das linhas selecionadas
+        """
+        return self._take(self.positions, [name])[name]
+
+    def materialize(self):
+        return self.page(0, len(self))
+
+    def fingerprint(self):
+        """
+        Identifica o recorte (colunas, linhas na ordem e colunas calculadas)
+        """
+        digest = hashlib.sha1()
+        digest.update('\x1f'.join(map(str, self.columns)).encode('utf-8'))
+        digest.update(np.ascontiguousarray(self.positions).tobytes())
+        for name in sorted(self.extras):
+            if name in self.columns:
+                digest.update(np.ascontiguousarray(self.extras[name][self.positions]).tobytes())
+        return digest.hexdigest()
@@ -0,0 +1,337 @@
+"""
+Índice invertido (sem acentos, sem diferenciar maiúsculas) para a busca por texto
+"""
+import re
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from prisma_core.taxonomy import fold_text
+
+_TOKEN = re.compile(r'\w+')
+_QUOTED = re.compile(r'"([^"]*)"')
+
+# Colunas da busca aproximada e similaridade mínima entre palavras (Jaccard de trigramas)
+FUZZY_COLUMNS = ('TITULO', 'TECNOLOGIA', 'TIPO_RESIDUO', 'METODOLOGIA')
+FUZZY_THRESHOLD = 0.3
+FUZZY_TOP_K = 200
+
+def tokenize(text):
+    """
+    Palavras do texto sem acentos e em minúsculas ('Biodigestão Anaeróbia' -> ['biodigestao', 'anaerobia'])
+    """
+    return _TOKEN.findall(fold_text(text))
+
+def parse_query(query):
+    """
+    Termos da busca como pares (palavras, frase).
+    Cada palavra fora de aspas é um termo que casa com qualquer palavra que a
+    contenha ('gas' acha 'biogas'); cada trecho entre aspas é uma frase: as
+    palavras inteiras, nessa ordem e em sequência na mesma célula. Nada é tratado como regex.
+    """
+    terms = [(tuple(tokens), True) for tokens in map(tokenize, _QUOTED.findall(query)) if tokens]
+    terms += [((token,), False) for token in tokenize(_QUOTED.sub(' ', query))]
+    return terms
+
+def contains_phrase(text, phrase):
+    """
+    Se as palavras de 'phrase' aparecem em sequência no texto (sem acentos e sem diferenciar maiúsculas)
+    """
+    return f" {' '.join(phrase)} " in f" {' '.join(tokenize(text))} "
+
+def trigrams(token):
+    """
+    Trigramas de caracteres da palavra, com as bordas marcadas ('gas' -> '  g', ' ga', 'gas', 'as ')
+    """
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def is_text_dtype(dtype):
+    """
+    Texto ou categórica de textos
+    """
+    if isinstance(dtype, pd.CategoricalDtype):
+        return dtype.categories is not None and pd.api.types.is_string_dtype(dtype.categories.dtype)
+    return pd.api.types.is_string_dtype(dtype)
+
+def is_text_column(series):
+    return is_text_dtype(series.dtype)
+
+class TrigramIndex:
+    """
+    Trigramas do vocabulário de uma coluna: para cada trigrama, as palavras que o contêm.
+    Aproxima uma palavra digitada com erros das palavras existentes sem percorrer
+    o vocabulário inteiro, só as listas dos trigramas em comum.
+    """
+
+    def __init__(self, vocabulary):
+        grams = [trigrams(token) for token in vocabulary]
+        self.sizes = np.array([len(token_grams) for token_grams in grams], dtype=np.int64)
+        words = {}
+        for position, token_grams in enumerate(grams):
+            for gram in token_grams:
+                words.setdefault(gram, []).append(position)
+        self.words = {gram: np.array(positions, dtype=np.intp) for gram, positions in words.items()}
+
+    def similar(self, term, threshold=FUZZY_THRESHOLD):
+        """
+        Posições no vocabulário e similaridade (Jaccard) das palavras parecidas com 'term'
+        """
+        query = trigrams(term)
+        hits = [self.words[gram] for gram in query if gram in self.words]
+        if not hits:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        positions, shared = np.unique(np.concatenate(hits), return_counts=True)
+        similarity = shared / (len(query) + self.sizes[positions] - shared)
+        keep = similarity >= threshold
+        return positions[keep], similarity[keep]
+
+    def containing(self, term, vocabulary):
+        """
+        Posições no vocabulário das palavras que contêm 'term'. Os trigramas
+        internos do termo aparecem em toda palavra que o contém: só as palavras
+        da menor lista são conferidas. Termos com menos de três letras percorrem o vocabulário.
+        """
+        grams = [term[i:i + 3] for i in range(len(term) - 2)]
+        if not grams:
+            candidates = range(len(vocabulary))
+        elif all(gram in self.words for gram in grams):
+            candidates = min((self.words[gram] for gram in grams), key=len)
+        else:
+            return np.empty(0, dtype=np.intp)
+        return np.array([position for position in candidates if term in vocabulary[position]], dtype=np.intp)
+
+class TokenIndex:
+    """
+    Listas de postagem de uma coluna: para cada palavra, as posições (ordenadas)
+    das linhas que a contêm. O vocabulário fica ordenado (a palavra exata é
+    encontrada com searchsorted) e a busca por parte da palavra usa os trigramas do vocabulário.
+    """
+
+    def __init__(self, postings):
+        self.vocabulary = np.array(sorted(postings), dtype=object)
+        self.postings = [postings[token] for token in self.vocabulary]
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Cada valor distinto é tokenizado uma única vez
+        """
+        codes, uniques = pd.factorize(values)
+        # Posições em int32: metade da memória das listas de postagem
+        order = np.argsort(codes, kind='stable').astype(np.int32)
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        token_values = {}
+        for code, value in enumerate(uniques):
+            for token in set(tokenize(value)):
+                token_values.setdefault(token, []).append(code)
+
+        return cls({
+            token: np.sort(np.concatenate([order[bounds[code]:bounds[code + 1]] for code in value_codes]))
+            for token, value_codes in token_values.items()
+        })
+
+    def _flat(self):
+        """
+        Listas de postagem concatenadas e a palavra de cada posição
+        """
+        lengths = np.array([len(posting) for posting in self.postings], dtype=np.int64)
+        rows = np.concatenate(self.postings).astype(np.int64) if self.postings else np.empty(0, dtype=np.int64)
+        return np.repeat(np.arange(len(self.vocabulary)), lengths), rows
+
+    @classmethod
+    def merge(cls, parts, n_rows):
+        """
+        Junta índices de partes da tabela sem retokenizar: parts é uma lista de
+        (TokenIndex, destinos), em que a linha i do índice vai para a posição
+        destinos[i] do resultado (-1 descarta a linha)
+        """
+        vocabulary = np.unique(np.concatenate([index.vocabulary for index, _ in parts]))
+        keys = []
+        for index, targets in parts:
+            tokens, rows = index._flat()
+            rows = np.asarray(targets, dtype=np.int64)[rows]
+            kept = rows >= 0
+            # Chave palavra × linha: uma ordenação agrupa por palavra com as linhas em ordem
+            keys.append(np.searchsorted(vocabulary, index.vocabulary)[tokens[kept]] * n_rows + rows[kept])
+        keys = np.sort(np.concatenate(keys))
+        tokens, rows = keys // max(n_rows, 1), (keys % max(n_rows, 1)).astype(np.int32)
+        bounds = np.searchsorted(tokens, np.arange(len(vocabulary) + 1))
+        return cls({
+            vocabulary[code]: rows[bounds[code]:bounds[code + 1]]
+            for code in range(len(vocabulary)) if bounds[code + 1] > bounds[code]
+        })
+
+    def lookup(self, term):
+        """
+        Posições das linhas com a palavra 'term'
+        """
+        start = np.searchsorted(self.vocabulary, term, side='left')
+        if start < len(self.vocabulary) and self.vocabulary[start] == term:
+            return self.postings[start]
+        return np.empty(0, dtype=np.intp)
+
+    def containing(self, term):
+        """
+        Listas de postagem das palavras que contêm 'term'
+        """
+        return [self.postings[word] for word in self.trigrams.containing(term, self.vocabulary)]
+
+    def phrase(self, phrase, values):
+        """
+        Posições das linhas em que as palavras de 'phrase' aparecem em sequência.
+        As listas de postagem não guardam a posição das palavras: as linhas com
+        todas elas são conferidas no texto ('values', a coluna indexada), cada valor distinto uma vez.
+        """
+        rows = self.lookup(phrase[0])
+        for term in phrase[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, self.lookup(term), assume_unique=True)
+        if len(phrase) == 1 or not len(rows):
+            return rows
+        codes, uniques = pd.factorize(values.iloc[rows])
+        matches = np.array([contains_phrase(value, phrase) for value in uniques], dtype=bool)
+        return rows[matches[codes]]
+
+    @cached_property
+    def trigrams(self):
+        return TrigramIndex(self.vocabulary)
+
+    def fuzzy(self, term, n_rows, threshold=FUZZY_THRESHOLD):
+        """
+        Linhas com palavras parecidas com 'term' e a pontuação de cada uma
+        (similaridade × idf da palavra encontrada; vale a melhor palavra da linha)
+        """
+        words, similarity = self.trigrams.similar(term, threshold)
+        if not len(words):
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        postings = [self.postings[word] for word in words]
+        sizes = np.array([len(posting) for posting in postings])
+        weights = similarity * np.log1p(n_rows / sizes)
+        return np.concatenate(postings), np.repeat(weights, sizes)
+
+class SearchIndex:
+    """
+    Índice invertido das colunas de texto de uma tabela, construído uma vez por
+    versão dos dados. Uma busca é a interseção das listas de postagem de cada
+    termo (cada termo pode aparecer em qualquer uma das colunas consultadas),
+    sem percorrer as células da tabela; só as frases entre aspas conferem o
+    texto das linhas candidatas (por isso o índice guarda a tabela indexada).
+    """
+
+    def __init__(self, frame, columns=None):
+        if columns is None:
+            columns = [column for column in frame.columns if is_text_column(frame[column])]
+        self._frame = frame
+        self.n_rows = len(frame)
+        self.indexes = {column: TokenIndex.from_values(frame[column]) for column in columns}
+
+    @property
+    def frame(self):
+        """
+        Tabela indexada; um índice carregado do pacote a recebe como função e só a monta na primeira frase buscada
+        """
+        if callable(self._frame):
+            self._frame = self._frame()
+        return self._frame
+
+    @property
+    def columns(self):
+        return list(self.indexes)
+
+    def patched(self, frame, diff):
+        """
+        Índice da nova versão da tabela (diff: RowDiff em relação a esta versão).
+        As listas das linhas mantidas são renumeradas; só as linhas adicionadas
+        ou alteradas são tokenizadas.
+        """
+        index = SearchIndex.__new__(SearchIndex)
+        index._frame = frame
+        index.n_rows = len(frame)
+        kept = np.full(self.n_rows, -1, dtype=np.int64)
+        kept[diff.kept_old] = diff.kept_new
+        index.indexes = {
+            column: TokenIndex.merge([
+                (token_index, kept),
+                (TokenIndex.from_values(frame[column].iloc[diff.fresh]), diff.fresh)
+            ], index.n_rows)
+            for column, token_index in self.indexes.items()
+        }
+        return index
+
+    def search(self, query, columns=None):
+        """
+        Posições das linhas que contêm todos os termos da busca.
+        Retorna None se a busca não tem nenhum termo (nenhuma restrição).
+        """
+        terms = parse_query(query)
+        if not terms:
+            return None
+        columns = self.columns if columns is None else [column for column in columns if column in self.indexes]
+
+        result = np.ones(self.n_rows, dtype=bool)
+        for words, phrase in terms:
+            # Linhas do termo marcadas numa máscara: sem concatenar e ordenar as listas de postagem
+            found = np.zeros(self.n_rows, dtype=bool)
+            for column in columns:
+                if phrase:
+                    found[self.indexes[column].phrase(words, self.frame[column])] = True
+                else:
+                    for posting in self.indexes[column].containing(words[0]):
+                        found[posting] = True
+            result &= found
+            if not result.any():
+                break
+        return np.flatnonzero(result)
+
+    def rank(self, query, columns=FUZZY_COLUMNS, k=FUZZY_TOP_K, mask=None):
+        """
+        Busca aproximada (tolerante a erros de digitação e acentos), ordenada por relevância.
+
+        Cada termo é comparado por trigramas com o vocabulário das colunas; a
+        linha recebe, por termo, a pontuação da melhor palavra parecida, e as
+        pontuações dos termos são somadas. Só as linhas das listas de postagem
+        encontradas são pontuadas. Retorna (posições, pontuações) das k melhores
+        linhas (entre as permitidas por 'mask', se informada).
+        """
+        columns = [column for column in columns if column in self.indexes]
+        positions, scores = [], []
+        for term in [word for words, _ in parse_query(query) for word in words]:
+            hits = [self.indexes[column].fuzzy(term, self.n_rows) for column in columns]
+            term_positions = np.concatenate([hit[0] for hit in hits]) if hits else np.empty(0, dtype=np.intp)
+            if not len(term_positions):
+                continue
+            term_scores = np.concatenate([hit[1] for hit in hits])
+            # Melhor pontuação de cada linha para este termo
+            order = np.lexsort((-term_scores, term_positions))
+            term_positions, term_scores = term_positions[order], term_scores[order]
+            first = np.r_[True, term_positions[1:] != term_positions[:-1]]
+            positions.append(term_positions[first])
+            scores.append(term_scores[first])
+
+        if not positions:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        positions, inverse = np.unique(np.concatenate(positions), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(scores))
+        if mask is not None:
+            allowed = mask[positions]
+            positions, scores = positions[allowed], scores[allowed]
+        if k is not None and len(positions) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            positions, scores = positions[top], scores[top]
+        order = np.lexsort((positions, -scores))
+        return positions[order], scores[order]
+
+    def mask(self, query, columns=None):
+        """
+        Máscara booleana por linha (todas verdadeiras se a busca não tem termos)
+        """
+        mask = np.ones(self.n_rows, dtype=bool)
+        positions = self.search(query, columns)
+        if positions is not None:
+            mask[:] = False
+            mask[positions] = True
+        return mask
@@ -0,0 +1,75 @@
+"""
+Snapshots locais (Parquet) das abas baixadas, para partida rápida e modo offline
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Diretório padrão dos snapshots (pode ser trocado com PRISMA_SNAPSHOT_DIR)
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / '.snapshots'
+
+def snapshot_dir():
+    return Path(os.environ.get('PRISMA_SNAPSHOT_DIR', DEFAULT_SNAPSHOT_DIR))
+
+class SnapshotStore:
+    """
+    Guarda cada aba como Parquet tipado mais um JSON com os validadores HTTP
+    (ETag, Last-Modified, digest) da leitura que o gerou. Gravações são
+    atômicas (arquivo temporário + os.replace), então um snapshot lido nunca
+    está pela metade.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory is not None else snapshot_dir()
+
+    def _paths(self, name):
+        return self.directory / f"{name}.parquet", self.directory / f"{name}.json"
+
+    def save(self, source):
+        """
+        Persiste o estado atual da fonte; retorna False se não foi possível gravar
+        """
+        data_path, meta_path = self._paths(source.name)
+        meta = {
+            'url': source.url,
+            'etag': source.etag,
+            'last_modified': source.last_modified,
+            'digest': source.digest,
+            'saved_at': time.time()
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_data = data_path.with_suffix('.parquet.tmp')
+            tmp_meta = meta_path.with_suffix('.json.tmp')
+            source.frame.to_parquet(tmp_data, index=False)
+            tmp_meta.write_text(json.dumps(meta), encoding='utf-8')
+            os.replace(tmp_data, data_path)
+            os.replace(tmp_meta, meta_path)
+            return True
+        except (OSError, ImportError, ValueError, TypeError):
+            # Sem disco gravável, sem pyarrow ou tipos que o Parquet não aceita:
+            # segue sem snapshot
+            return False
+
+    def load(self, source):
+        """
+        Restaura o snapshot da fonte (frame + validadores).
+        Retorna o instante em que foi salvo, ou None se não houver snapshot válido.
+        """
+        data_path, meta_path = self._paths(source.name)
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            if meta.get('url') != source.url:
+                return None
+            frame = pd.read_parquet(data_path)
+        except (OSError, ImportError, ValueError):
+            return None
+
+        source.frame = frame
+        source.etag = meta.get('etag')
+        source.last_modified = meta.get('last_modified')
+        source.digest = meta.get('digest')
+        return meta.get('saved_at')
@@ -0,0 +1,460 @@
+"""
+Fontes de dados (abas publicadas do Google Sheets) com atualização incremental
+"""
+import hashlib
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import requests
+
+from prisma_core.bundle import BundleStore
+from prisma_core.model import ArticleModel, data_version
+from prisma_core.snapshot import SnapshotStore
+from prisma_core.timing import span, timed
+
+# URLs das diferentes abas (removido URL_DATABASE não utilizada)
+URL_DADOS = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRnTrJ0DW6_N99xSBTTMrRza3YuRkkzRmB1OuIX28JDBRdsmF1XAginDVCHNbWZGMomjf4B28AZlHHq/pub?gid=0&single=true&output=csv"
+URL_RESIDUOS = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRnTrJ0DW6_N99xSBTTMrRza3YuRkkzRmB1OuIX28JDBRdsmF1XAginDVCHNbWZGMomjf4B28AZlHHq/pub?gid=1882708214&single=true&output=csv"
+URL_TECNOLOGIAS = "https://docs.google.com/spreadsheets/d/e/2PACX-1vRnTrJ0DW6_N99xSBTTMrRza3YuRkkzRmB1XAginDVCHNbWZGMomjf4B28AZlHHq/pub?gid=745302211&single=true&output=csv"
+
+SHEET_URLS = {
+    'residuos': URL_RESIDUOS,
+    'tecnologias': URL_TECNOLOGIAS,
+    'dados': URL_DADOS
+}
+
+# Coluna que identifica um artigo entre duas versões da planilha
+ROW_KEY = 'ID'
+
+# Limites de cada requisição: (conexão, leitura) em segundos, novas tentativas
+# para falhas transitórias (rede, 429 e 5xx) e espera base entre elas (dobra a cada tentativa)
+REQUEST_TIMEOUT = (5, 30)
+MAX_RETRIES = 2
+BACKOFF_SECONDS = 0.5
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Intervalo padrão (s) da atualização em segundo plano
+REFRESH_INTERVAL = 600
+
+def build_session(pool_size=len(SHEET_URLS)):
+    """
+    Sessão HTTP única (keep-alive, gzip) com um pool de conexões para as buscas paralelas
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    return session
+
+class SheetVersion:
+    """
+    Resultado de uma busca com resposta 200: validadores HTTP, digest e o DataFrame
+    (None se o conteúdo é o mesmo já lido, só com validadores novos)
+    """
+
+    def __init__(self, frame, etag, last_modified, digest):
+        self.frame = frame
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+
+class SheetSource:
+    """
+    Uma aba publicada em CSV e o estado da última leitura
+    (validadores HTTP, digest do conteúdo e o DataFrame correspondente).
+
+    fetch() pode rodar em outra thread e não altera esse estado: devolve um
+    SheetVersion, que quem pediu a busca adota com accept().
+    """
+
+    def __init__(self, name, url):
+        self.name = name
+        self.url = url
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+        self.frame = None
+        self.last_duration = None
+        self.last_attempts = 0
+
+    def _get(self, session, headers):
+        """
+        GET com timeout e novas tentativas (espera exponencial) para falhas transitórias
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            self.last_attempts = attempt + 1
+            try:
+                response = session.get(self.url, headers=headers, timeout=REQUEST_TIMEOUT)
+                if response.status_code not in RETRY_STATUS or attempt == MAX_RETRIES:
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == MAX_RETRIES:
+                    raise
+            time.sleep(BACKOFF_SECONDS * 2 ** attempt)
+
+    def fetch(self, session):
+        """
+        Baixa a aba com requisição condicional (ETag/Last-Modified).
+        Retorna um SheetVersion, ou None se o servidor respondeu 304 (nada mudou).
+        """
+        headers = {}
+        if self.frame is not None:
+            if self.etag:
+                headers['If-None-Match'] = self.etag
+            if self.last_modified:
+                headers['If-Modified-Since'] = self.last_modified
+
+        started = time.perf_counter()
+        try:
+            with span(f'fetch.{self.name}'):
+                return self._fetch(session, headers)
+        finally:
+            self.last_duration = time.perf_counter() - started
+
+    def _fetch(self, session, headers):
+        response = self._get(session, headers)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+
+        etag = response.headers.get('ETag', self.etag)
+        last_modified = response.headers.get('Last-Modified', self.last_modified)
+
+        # Servidores sem validadores: compara o conteúdo antes de fazer o parse
+        digest = hashlib.sha1(response.content).hexdigest()
+        if self.frame is not None and digest == self.digest:
+            return SheetVersion(None, etag, last_modified, digest)
+
+        with span(f'parse.{self.name}'):
+            frame = pd.read_csv(io.BytesIO(response.content))
+        return SheetVersion(frame, etag, last_modified, digest)
+
+    def accept(self, version):
+        """
+        Adota o resultado de fetch() e retorna o novo DataFrame (None se o conteúdo não mudou)
+        """
+        if version is None:
+            return None
+        self.etag = version.etag
+        self.last_modified = version.last_modified
+        self.digest = version.digest
+        if version.frame is not None:
+            self.frame = version.frame
+        return version.frame
+
+class RowDiff:
+    """
+    Diferença linha a linha entre duas versões de uma tabela, pela coluna-chave.
+
+    kept_old/kept_new: posições (antiga/nova) das linhas inalteradas
+    fresh: posições novas das linhas adicionadas ou alteradas
+    stale: posições antigas das linhas removidas ou alteradas
+    """
+
+    def __init__(self, kept_old, kept_new, fresh, stale, added, changed, removed):
+        self.kept_old = kept_old
+        self.kept_new = kept_new
+        self.fresh = fresh
+        self.stale = stale
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+
+    @property
+    def moved(self):
+        """
+        Alguma linha mantida mudou de posição (por exemplo, a planilha foi reordenada)
+        """
+        return not np.array_equal(self.kept_old, self.kept_new)
+
+    def __bool__(self):
+        # Uma reordenação também exige novo modelo: as posições das linhas mudaram
+        return bool(self.added or self.changed or self.removed or self.moved)
+
+    def summary(self):
+        summary = f"+{self.added} ~{self.changed} -{self.removed}"
+        if self.moved and not (self.added or self.changed or self.removed):
+            summary += ", ordem alterada"
+        return summary
+
+def diff_rows(old, new, key=ROW_KEY):
+    """
+    Compara duas versões da tabela pelo hash de cada linha, agrupando por 'key'.
+    Retorna None quando não é possível comparar linha a linha (colunas diferentes,
+    chave ausente ou repetida); nesse caso o chamador reconstrói tudo.
+    """
+    if key not in old.columns or list(old.columns) != list(new.columns):
+        return None
+    old_keys = pd.Index(old[key])
+    new_keys = pd.Index(new[key])
+    if not old_keys.is_unique or not new_keys.is_unique:
+        return None
+
+    old_hashes = pd.util.hash_pandas_object(old, index=False).to_numpy()
+    new_hashes = pd.util.hash_pandas_object(new, index=False).to_numpy()
+
+    location = old_keys.get_indexer(new_keys)
+    existing = location >= 0
+    same = np.zeros(len(new), dtype=bool)
+    same[existing] = old_hashes[location[existing]] == new_hashes[existing]
+
+    changed = existing & ~same
+    removed = np.flatnonzero(new_keys.get_indexer(old_keys) < 0)
+
+    return RowDiff(
+        kept_old=location[same],
+        kept_new=np.flatnonzero(same),
+        fresh=np.flatnonzero(~same),
+        stale=np.sort(np.concatenate([removed, location[changed]])),
+        added=int((~existing).sum()),
+        changed=int(changed.sum()),
+        removed=len(removed)
+    )
+
+class DataStore:
+    """
+    Estado compartilhado dos dados: as abas, o modelo normalizado e sua versão.
+
+    load() faz a carga completa; refresh() baixa apenas o que mudou (requisições
+    condicionais), compara a aba principal linha a linha por ID e gera o novo
+    modelo renormalizando só as linhas adicionadas ou alteradas. O modelo é
+    trocado por atribuição única, então leitores sempre veem uma versão completa.
+
+    Cada aba baixada é salva como snapshot local. Na partida, se houver
+    snapshot, ele é usado imediatamente e a planilha é revalidada em segundo
+    plano (stale-while-revalidate); sem rede, o snapshot segura o dashboard.
+    Com offline=True a rede nunca é usada.
+
+    Antes de tudo, load() procura um pacote de artefatos (python -m prisma_core
+    build): o modelo chega pronto, com índices, cubo e figuras pré-calculadas.
+    Um pacote gerado da planilha também é revalidado em segundo plano; um
+    gerado de um CSV local é exibido como está, sem consultar a planilha.
+
+    start_refresher() chama refresh() periodicamente numa thread própria; a busca
+    e o novo modelo (com suas visões mais caras) são montados fora do lock, que só
+    protege a primeira carga e a troca. Depois da primeira carga, load() não
+    espera por lock nenhum, então nenhuma requisição de usuário espera pela planilha.
+    """
+
+    def __init__(self, urls=None, key=ROW_KEY, snapshots=None, offline=False, bundles=None):
+        urls = SHEET_URLS if urls is None else urls
+        self.sources = {name: SheetSource(name, url) for name, url in urls.items()}
+        self.key = key
+        self.snapshots = SnapshotStore() if snapshots is None else snapshots
+        self.bundles = BundleStore() if bundles is None else bundles
+        self.offline = offline
+        self.session = build_session(len(self.sources))
+        self._executor = ThreadPoolExecutor(max_workers=len(self.sources), thread_name_prefix='sheets')
+        self.model = None
+        self.frames = None
+        self.origin = None
+        self.snapshot_saved_at = None
+        self.bundle = None
+        self.figures = {}
+        self.last_refresh = None
+        self.last_refresh_duration = None
+        self.last_change = None
+        self.last_error = None
+        self.refresh_interval = None
+        # _lock: primeira carga e troca do modelo; _refresh_lock: uma atualização por vez
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresher = None
+        self._stop = threading.Event()
+
+    @property
+    def version(self):
+        return self.model.version if self.model is not None else None
+
+    @property
+    def data_age(self):
+        """
+        Segundos desde a última leitura bem-sucedida da planilha (ou desde o snapshot)
+        """
+        reference = self.last_refresh or self.snapshot_saved_at
+        return time.time() - reference if reference is not None else None
+
+    @property
+    def timings(self):
+        """
+        Duração (s) e número de tentativas da última busca de cada aba
+        """
+        return {name: (source.last_duration, source.last_attempts) for name, source in self.sources.items()}
+
+    @timed('fetch_all')
+    def _fetch_all(self):
+        """
+        Busca todas as abas em paralelo (o tempo total é o da aba mais lenta).
+        Se uma aba auxiliar falhar, usa a aba principal, que já contém as
+        informações de tecnologia e resíduos, sem baixá-la novamente.
+        """
+        futures = {name: self._executor.submit(source.fetch, self.session) for name, source in self.sources.items()}
+        changed, errors = {}, {}
+        for name, future in futures.items():
+            try:
+                version = future.result()
+            except Exception as e:
+                errors[name] = e
+                continue
+            # As abas só mudam aqui, na thread que pediu as buscas
+            changed[name] = self.sources[name].accept(version)
+
+        for name, frame in changed.items():
+            if frame is not None:
+                self.snapshots.save(self.sources[name])
+
+        if 'dados' in errors:
+            raise errors['dados']
+        if errors:
+            return self._frames(), {'dados': changed['dados']}
+        return self._frames(), changed
+
+    def _frames(self):
+        """
+        (resíduos, tecnologias, dados); abas auxiliares ausentes usam a aba principal
+        """
+        dados = self.sources['dados'].frame
+        return tuple(
+            dados if self.sources.get(name) is None or self.sources[name].frame is None else self.sources[name].frame
+            for name in ('residuos', 'tecnologias', 'dados')
+        )
+
+    @timed('snapshot.load')
+    def _load_snapshots(self):
+        """
+        Restaura as abas dos snapshots locais; exige ao menos a aba principal
+        """
+        saved = {name: self.snapshots.load(source) for name, source in self.sources.items()}
+        if saved.get('dados') is None:
+            return False
+        self.snapshot_saved_at = saved['dados']
+        return True
+
+    def _revalidate(self):
+        """
+        refresh() em segundo plano (revalidação na partida e atualização periódica); erros ficam em last_error
+        """
+        try:
+            self.refresh()
+        except Exception as e:
+            self.last_error = e
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            self._revalidate()
+
+    def start_refresher(self, interval=REFRESH_INTERVAL):
+        """
+        Atualiza os dados a cada 'interval' segundos em segundo plano (idempotente)
+        """
+        if self.offline or not interval or self._refresher is not None:
+            return
+        self.refresh_interval = interval
+        self._refresher = threading.Thread(target=self._refresh_loop, name='sheets-refresher', daemon=True)
+        self._refresher.start()
+
+    def stop_refresher(self):
+        self._stop.set()
+
+    def _load_bundle(self):
+        """
+        Adota o pacote de artefatos mais recente, se houver; retorna False se não há pacote válido
+        """
+        bundle = self.bundles.load()
+        if bundle is None:
+            return False
+        self.sources['dados'].frame = bundle.raw
+        self.snapshot_saved_at = bundle.created_at
+        self.frames = self._frames()
+        self.model = bundle.model
+        self.figures = bundle.figures
+        self.bundle = bundle.manifest
+        self.origin = 'pacote'
+        if bundle.manifest.get('source') != 'planilha':
+            # Pacote de um CSV local: a planilha publicada não é a fonte desses dados
+            self.offline = True
+        return True
+
+    def load(self):
+        """
+        Carga completa (primeira execução): pacote de artefatos se houver, senão
+        snapshot local, senão a planilha
+        """
+        if self.model is not None:
+            # Depois da primeira carga, nunca espera: o modelo atual é trocado só quando o próximo está pronto
+            return self.frames
+        with self._lock:
+            if self.model is not None:
+                return self.frames
+            if self._load_bundle():
+                if not self.offline:
+                    threading.Thread(target=self._revalidate, name='sheets-revalidate', daemon=True).start()
+            else:
+                if self._load_snapshots():
+                    self.origin = 'snapshot'
+                elif self.offline:
+                    raise RuntimeError("Modo offline ativo, mas não há snapshot local dos dados")
+                else:
+                    self._fetch_all()
+                    self.origin = 'rede'
+                    self.last_refresh = time.time()
+                self.frames = self._frames()
+                self.model = ArticleModel(self.frames[2])
+                if self.origin == 'snapshot' and not self.offline:
+                    # Responde já com o snapshot; a revalidação busca e monta o novo modelo
+                    # sem lock e só o pega para a troca, então as próximas execuções não esperam a planilha
+                    threading.Thread(target=self._revalidate, name='sheets-revalidate', daemon=True).start()
+            return self.frames
+
+    def refresh(self):
+        """
+        Atualização incremental. Retorna (status, diff), com status 'inalterado',
+        'incremental' (diff: RowDiff aplicado) ou 'completo' (modelo reconstruído)
+        """
+        if self.model is None:
+            self.load()
+            return 'completo', None
+        if self.offline:
+            return 'offline', None
+
+        with self._refresh_lock:
+            started = time.perf_counter()
+            try:
+                return self._refresh()
+            finally:
+                self.last_refresh_duration = time.perf_counter() - started
+
+    @timed('refresh')
+    def _refresh(self):
+        # Busca, comparação e novo modelo sobre variáveis locais, sem o lock de leitura
+        previous, model = self.frames[2], self.model
+        frames, changed = self._fetch_all()
+        status, diff = 'inalterado', None
+        dados_changed = changed.get('dados') is not None
+        if dados_changed:
+            current = frames[2]
+            diff = diff_rows(previous, current, self.key)
+            if diff is None:
+                model, status = ArticleModel(current).warm(), 'completo'
+            elif diff:
+                # Inclui reordenações sem alteração: o modelo segue as posições da nova tabela
+                model, status = model.patched(current, diff, data_version(current)).warm(), 'incremental'
+            else:
+                # Mesmo conteúdo e mesma ordem: mantém a tabela a partir da qual o modelo foi construído
+                frames = frames[:2] + (previous,)
+
+        with self._lock:
+            # Troca única: abas, modelo e última alteração passam juntos para a nova versão
+            self.frames = frames
+            self.model = model
+            if dados_changed:
+                self.last_change = diff
+            self.origin = 'rede'
+            self.last_refresh = time.time()
+            self.last_error = None
+        return status, diff
@@ -0,0 +1,228 @@
+"""
+Gerador determinístico de planilhas PRISMA sintéticas (mesmo esquema da aba de dados)
+"""
+import numpy as np
+import pandas as pd
+
+from prisma_core.taxonomy import (
+    COUNTRY_MAPPING,
+    METHOD_STANDARDIZATION,
+    TECH_FLAG_COLUMNS,
+    TECH_MATCHER,
+    TECH_STANDARDIZATION,
+    WASTE_STANDARDIZATION
+)
+
+# Tamanhos nomeados usados pelos benchmarks
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1M': 1_000_000}
+
+# Quantidade de termos por célula multivalorada e suas probabilidades
+TERMS_PER_CELL = (1, 2, 3, 4)
+TERMS_PER_CELL_P = (0.45, 0.30, 0.17, 0.08)
+
+# Separadores como aparecem na planilha (com espaços e variações)
+CELL_SEPARATORS = (', ', ', ', ', ', '; ', ' / ', ' e ', ' and ', ' | ', ' & ')
+
+# Frações de células vazias (NaN e texto vazio) e de termos fora das taxonomias
+MISSING_FRACTION = 0.04
+EMPTY_FRACTION = 0.02
+TAIL_FRACTION = 0.15
+
+# Rótulo padronizado de tecnologia que marca cada coluna de indicação como 'Sim'
+FLAG_LABELS = {
+    'Biodigestao_Anaerobia': 'Biodigestão Anaeróbia',
+    'Bioetanol_Fermentacao': 'Fermentação Alcoólica',
+    'Briquetagem_Solar': 'Briquetagem',
+    'Codigestao': 'Co-digestão',
+    'Combustao_Direta': 'Combustão Direta',
+    'Compostagem': 'Compostagem',
+    'Gaseificacao': 'Gaseificação',
+    'Pelletizacao': 'Pelletização',
+    'Pirolise': 'Pirólise',
+    'Transesterificacao': 'Transesterificação'
+}
+
+# Centro aproximado (lat, lon) de cada país padronizado
+COUNTRY_CENTERS = {
+    'Brasil': (-14.2, -51.9), 'Estados Unidos': (39.8, -98.6), 'Alemanha': (51.2, 10.4),
+    'China': (35.9, 104.2), 'Itália': (41.9, 12.6), 'França': (46.2, 2.2),
+    'Espanha': (40.5, -3.7), 'Reino Unido': (55.4, -3.4), 'Canadá': (56.1, -106.3),
+    'Austrália': (-25.3, 133.8), 'Índia': (20.6, 79.0), 'Japão': (36.2, 138.3)
+}
+
+# Países fora do mapeamento (padronizados como 'Outros')
+OTHER_COUNTRIES = ('Quênia', 'Nigéria', 'Tailândia', 'Indonesia', 'Mexico', 'Global', 'Europa')
+
+CLIMATES = ('Tropical', 'Subtropical', 'Temperado', 'Árido', 'Continental', 'Equatorial')
+
+TAIL_NOUNS = {
+    'TECNOLOGIA': ('Processo', 'Reator', 'Rota', 'Sistema', 'Planta', 'Conversão'),
+    'TIPO_RESIDUO': ('Resíduo', 'Efluente', 'Subproduto', 'Biomassa', 'Lodo', 'Rejeito'),
+    'METODOLOGIA': ('Modelo', 'Análise', 'Índice', 'Método', 'Algoritmo', 'Inventário')
+}
+TAIL_ADJECTIVES = ('térmico', 'híbrido', 'integrado', 'regional', 'experimental', 'avançado', 'descentralizado')
+
+TITLE_OPENINGS = (
+    'Avaliação espacial de', 'Spatial assessment of', 'Planejamento de', 'Site selection for',
+    'Potencial de', 'Mapping the potential of', 'Análise multicritério de', 'Otimização logística de'
+)
+SURNAMES = (
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Costa', 'Rodrigues', 'Almeida',
+    'Nascimento', 'Smith', 'Müller', 'Wang', 'Zhang', 'Rossi', 'García', 'Kumar', 'Tanaka'
+)
+
+def _variants(mapping):
+    """
+    Grafias de cada termo da taxonomia como aparecem na planilha (minúsculas, título, siglas)
+    """
+    variants = []
+    for key in mapping:
+        variants.append(key)
+        variants.append(key.upper() if len(key) <= 4 else key.capitalize())
+    return variants
+
+def _zipf_weights(n, exponent=1.1):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+def _vocabulary(rng, column, mapping, n_rows):
+    """
+    Termos brutos de uma coluna: grafias da taxonomia (em ordem sorteada, para que os
+    termos mais frequentes não sejam sempre sinônimos do primeiro rótulo) mais uma cauda
+    longa de termos livres, que cresce com o corpus como o vocabulário real.
+    Retorna (termos, pesos).
+    """
+    known = list(rng.permutation(_variants(mapping)))
+    n_tail = max(20, int(np.sqrt(n_rows) * 2))
+    nouns, adjectives = TAIL_NOUNS[column], TAIL_ADJECTIVES
+    tail = [
+        f"{nouns[i % len(nouns)]} {adjectives[(i // len(nouns)) % len(adjectives)]} {i // (len(nouns) * len(adjectives)) + 1}"
+        for i in range(n_tail)
+    ]
+    weights = np.concatenate([
+        _zipf_weights(len(known)) * (1 - TAIL_FRACTION),
+        _zipf_weights(n_tail) * TAIL_FRACTION
+    ])
+    return np.array(known + tail, dtype=object), weights
+
+def _cells(rng, terms, weights, n_rows):
+    """
+    Células multivaloradas: índices dos termos sorteados (n_rows × 4, -1 = sem termo) e o texto
+    """
+    lengths = rng.choice(TERMS_PER_CELL, size=n_rows, p=TERMS_PER_CELL_P)
+    picks = rng.choice(len(terms), size=(n_rows, max(TERMS_PER_CELL)), p=weights)
+    # Sorteia de novo (uma vez) termos repetidos na célula; algumas repetições continuam, como na planilha
+    for position in range(1, picks.shape[1]):
+        repeated = (picks[:, :position] == picks[:, [position]]).any(axis=1)
+        picks[repeated, position] = rng.choice(len(terms), size=int(repeated.sum()), p=weights)
+    picks[np.arange(max(TERMS_PER_CELL)) >= lengths[:, None]] = -1
+    separators = rng.choice(CELL_SEPARATORS, size=n_rows)
+
+    # Concatena termo a termo (coluna por coluna), sem laço por linha
+    words = terms[np.where(picks >= 0, picks, 0)]
+    text = words[:, 0].copy()
+    for position in range(1, max(TERMS_PER_CELL)):
+        longer = lengths > position
+        text[longer] = text[longer] + separators[longer].astype(object) + words[longer, position]
+
+    blank = rng.random(n_rows)
+    text[blank < MISSING_FRACTION + EMPTY_FRACTION] = ''
+    text[blank < MISSING_FRACTION] = None
+    picks[blank < MISSING_FRACTION + EMPTY_FRACTION] = -1
+    return picks, text
+
+def _strings(choices, codes):
+    """
+    Coluna de texto a partir de códigos em 'choices' (-1 = vazio), sem converter cada linha
+    """
+    return pd.array(list(choices), dtype='str').take(codes, allow_fill=True)
+
+def _flags(rng, tech_terms, tech_picks):
+    """
+    Colunas 'Sim'/'Não' coerentes com a célula TECNOLOGIA (mais um pouco de ruído)
+    """
+    term_labels = [TECH_MATCHER.resolve(term)[0] for term in tech_terms]
+    flags = {}
+    for column in TECH_FLAG_COLUMNS:
+        label = FLAG_LABELS.get(column)
+        term_flag = np.array([label in labels for labels in term_labels] + [False])
+        marked = term_flag[tech_picks].any(axis=1) | (rng.random(len(tech_picks)) < 0.03)
+        flags[column] = _strings(('Não', 'Sim'), marked.astype(np.intp))
+    return flags
+
+def generate_articles(n_rows, seed=0):
+    """
+    Aba de dados sintética com n_rows artigos e o esquema real da planilha
+    (ID, TITULO, AUTORES, ANO, TECNOLOGIA, TIPO_RESIDUO, METODOLOGIA, PAIS,
+    LOCALIZACAO, CLIMA, LATITUDE_DECIMAL, LONGITUDE_DECIMAL e as colunas de
+    indicação por tecnologia). A mesma semente gera sempre a mesma tabela.
+
+    Os termos seguem uma distribuição de Zipf sobre as grafias das taxonomias
+    e uma cauda de termos livres; há células vazias, separadores variados e
+    países fora do mapeamento, como na planilha real.
+    """
+    rng = np.random.default_rng(seed)
+
+    columns = {}
+    picks = {}
+    vocabularies = {}
+    for column, mapping in (
+        ('TECNOLOGIA', TECH_STANDARDIZATION),
+        ('TIPO_RESIDUO', WASTE_STANDARDIZATION),
+        ('METODOLOGIA', METHOD_STANDARDIZATION)
+    ):
+        terms, weights = _vocabulary(rng, column, mapping, n_rows)
+        picks[column], columns[column] = _cells(rng, terms, weights, n_rows)
+        vocabularies[column] = terms
+
+    # Publicações crescem ao longo do tempo; ~1% sem ano
+    years = np.arange(2000, 2026)
+    year_weights = np.exp((years - years[0]) / 6.0)
+    ano = rng.choice(years, size=n_rows, p=year_weights / year_weights.sum()).astype(float)
+    ano[rng.random(n_rows) < 0.01] = np.nan
+
+    # Países: grafias do mapeamento (pesos de Zipf), alguns fora dele e ~3% vazios
+    country_terms = np.array(_variants(COUNTRY_MAPPING) + list(OTHER_COUNTRIES), dtype=object)
+    country_picks = rng.choice(len(country_terms), size=n_rows, p=_zipf_weights(len(country_terms), 0.8))
+    country_picks[rng.random(n_rows) < 0.03] = -1
+
+    # Coordenadas em torno do centro do país (uniformes para países desconhecidos);
+    # ~5% sem coordenadas, assim como os artigos sem país
+    centers = np.array([
+        COUNTRY_CENTERS.get(COUNTRY_MAPPING.get(term.lower()), (np.nan, np.nan))
+        for term in country_terms
+    ])
+    latitude, longitude = centers[country_picks, 0], centers[country_picks, 1]
+    unknown = np.isnan(latitude)
+    latitude = np.where(unknown, rng.uniform(-50, 60, n_rows), latitude + rng.normal(0, 3, n_rows))
+    longitude = np.where(unknown, rng.uniform(-120, 150, n_rows), longitude + rng.normal(0, 4, n_rows))
+    no_coordinates = (rng.random(n_rows) < 0.05) | (country_picks < 0)
+    latitude[no_coordinates] = np.nan
+    longitude[no_coordinates] = np.nan
+
+    tech_words = vocabularies['TECNOLOGIA'][np.maximum(picks['TECNOLOGIA'][:, 0], 0)]
+    waste_words = vocabularies['TIPO_RESIDUO'][np.maximum(picks['TIPO_RESIDUO'][:, 0], 0)]
+    titles = (
+        pd.Series(rng.choice(TITLE_OPENINGS, size=n_rows)) + ' ' + pd.Series(tech_words).str.lower()
+        + ' (' + pd.Series(waste_words).str.lower() + ')'
+    )
+    authors = (
+        pd.Series(rng.choice(SURNAMES, size=n_rows)) + ', '
+        + pd.Series(rng.choice(list('ABCDEFGJLMPRT'), size=n_rows)) + '. et al.'
+    )
+
+    df = pd.DataFrame({
+        'ID': np.arange(1, n_rows + 1),
+        'TITULO': titles.to_numpy(),
+        'AUTORES': authors.to_numpy(),
+        'ANO': ano,
+        'TECNOLOGIA': columns['TECNOLOGIA'],
+        'TIPO_RESIDUO': columns['TIPO_RESIDUO'],
+        'METODOLOGIA': columns['METODOLOGIA'],
+        'PAIS': _strings(country_terms, country_picks),
+        'LOCALIZACAO': _strings([f'Município {i}' for i in range(1, 400)], rng.integers(0, 399, n_rows)),
+        'CLIMA': _strings(CLIMATES, np.where(rng.random(n_rows) < 0.1, -1, rng.integers(0, len(CLIMATES), n_rows))),
+        'LATITUDE_DECIMAL': latitude.round(6),
+        'LONGITUDE_DECIMAL': longitude.round(6)
+    })
+    return df.assign(**_flags(rng, vocabularies['TECNOLOGIA'], picks['TECNOLOGIA']))
@@ -0,0 +1,314 @@
+"""
+Taxonomias de padronização e matcher compilado para tecnologias, resíduos e metodologias
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+import pandas as pd
+
+NAO_ESPECIFICADO = 'Não especificado'
+
+# Separadores aceitos em células com valores múltiplos (tupla: imutável e "hasheável")
+DEFAULT_SEPARATORS = (',', ';', '/', '|', ' e ', ' and ', ' & ')
+
+# Termos com até este número de caracteres são siglas ('ad', 'ml', 'gis'...) e só
+# casam como palavra inteira; termos maiores casam como substring (radicais e compostos,
+# ex.: 'etanol' em 'bioetanol', 'crop' em 'crops')
+ACRONYM_MAX_LENGTH = 3
+
+TECH_STANDARDIZATION = {
+    'biodigestão': 'Biodigestão Anaeróbia',
+    'biogas': 'Biodigestão Anaeróbia',
+    'biogás': 'Biodigestão Anaeróbia',
+    'anaerobic': 'Biodigestão Anaeróbia',
+    'digestão anaeróbia': 'Biodigestão Anaeróbia',
+    'ad': 'Biodigestão Anaeróbia',
+    'pirólise': 'Pirólise',
+    'pyrolysis': 'Pirólise',
+    'gaseificação': 'Gaseificação',
+    'gasification': 'Gaseificação',
+    'fermentação': 'Fermentação',
+    'fermentation': 'Fermentação',
+    'etanol': 'Fermentação Alcoólica',
+    'ethanol': 'Fermentação Alcoólica',
+    'combustão': 'Combustão Direta',
+    'combustion': 'Combustão Direta',
+    'incineração': 'Combustão Direta',
+    'transesterificação': 'Transesterificação',
+    'biodiesel': 'Transesterificação',
+    'compostagem': 'Compostagem',
+    'composting': 'Compostagem',
+    'htl': 'Liquefação Hidrotérmica',
+    'hydrothermal': 'Liquefação Hidrotérmica',
+    'torrefação': 'Torrefação',
+    'torrefaction': 'Torrefação',
+    'briquetagem': 'Briquetagem',
+    'pelletização': 'Pelletização',
+    'codigestão': 'Co-digestão',
+    'co-digestion': 'Co-digestão'
+}
+
+WASTE_STANDARDIZATION = {
+    'agrícola': 'Resíduo Agrícola',
+    'agricultural': 'Resíduo Agrícola',
+    'crop': 'Resíduo Agrícola',
+    'palha': 'Resíduo Agrícola',
+    'bagaço': 'Resíduo Agrícola',
+    'casca': 'Resíduo Agrícola',
+    'pecuária': 'Resíduo Pecuário',
+    'animal': 'Resíduo Pecuário',
+    'livestock': 'Resíduo Pecuário',
+    'esterco': 'Resíduo Pecuário',
+    'dejeto': 'Resíduo Pecuário',
+    'suíno': 'Resíduo Pecuário',
+    'bovino': 'Resíduo Pecuário',
+    'urbano': 'Resíduo Urbano',
+    'urban': 'Resíduo Urbano',
+    'municipal': 'Resíduo Urbano',
+    'rsu': 'Resíduo Urbano',
+    'lixo': 'Resíduo Urbano',
+    'industrial': 'Resíduo Industrial',
+    'indústria': 'Resíduo Industrial',
+    'factory': 'Resíduo Industrial',
+    'florestal': 'Resíduo Florestal',
+    'forest': 'Resíduo Florestal',
+    'madeira': 'Resíduo Florestal',
+    'wood': 'Resíduo Florestal',
+    'alimentar': 'Resíduo Alimentar',
+    'food': 'Resíduo Alimentar',
+    'alimento': 'Resíduo Alimentar',
+    'orgânico': 'Resíduo Orgânico',
+    'organic': 'Resíduo Orgânico'
+}
+
+METHOD_STANDARDIZATION = {
+    'gis': 'GIS/SIG',
+    'sig': 'GIS/SIG',
+    'geographic information': 'GIS/SIG',
+    'arcgis': 'GIS/SIG',
+    'qgis': 'GIS/SIG',
+    'sensoriamento': 'Sensoriamento Remoto',
+    'remote sensing': 'Sensoriamento Remoto',
+    'satellite': 'Sensoriamento Remoto',
+    'satélite': 'Sensoriamento Remoto',
+    'landsat': 'Sensoriamento Remoto',
+    'sentinel': 'Sensoriamento Remoto',
+    'mcda': 'MCDA/MCDM',
+    'mcdm': 'MCDA/MCDM',
+    'multicritério': 'MCDA/MCDM',
+    'multicriteria': 'MCDA/MCDM',
+    'ahp': 'AHP',
+    'analytic hierarchy': 'AHP',
+    'fuzzy': 'Lógica Fuzzy',
+    'difuso': 'Lógica Fuzzy',
+    'otimização': 'Otimização',
+    'optimization': 'Otimização',
+    'p-mediana': 'P-Mediana',
+    'p-median': 'P-Mediana',
+    'localização': 'Localização-Alocação',
+    'location': 'Localização-Alocação',
+    'allocation': 'Localização-Alocação',
+    'machine learning': 'Machine Learning',
+    'aprendizado de máquina': 'Machine Learning',
+    'ml': 'Machine Learning',
+    'neural': 'Redes Neurais',
+    'deep learning': 'Deep Learning',
+    'lca': 'LCA/ACV',
+    'life cycle': 'LCA/ACV',
+    'ciclo de vida': 'LCA/ACV',
+    'modelagem': 'Modelagem',
+    'modeling': 'Modelagem',
+    'simulação': 'Simulação',
+    'simulation': 'Simulação'
+}
+
+COUNTRY_MAPPING = {
+    'brasil': 'Brasil',
+    'brazil': 'Brasil',
+    'estados unidos': 'Estados Unidos',
+    'usa': 'Estados Unidos',
+    'united states': 'Estados Unidos',
+    'alemanha': 'Alemanha',
+    'germany': 'Alemanha',
+    'china': 'China',
+    'itália': 'Itália',
+    'italia': 'Itália',
+    'italy': 'Itália',
+    'frança': 'França',
+    'france': 'França',
+    'espanha': 'Espanha',
+    'spain': 'Espanha',
+    'reino unido': 'Reino Unido',
+    'uk': 'Reino Unido',
+    'canadá': 'Canadá',
+    'canada': 'Canadá',
+    'austrália': 'Austrália',
+    'australia': 'Austrália',
+    'índia': 'Índia',
+    'india': 'Índia',
+    'japão': 'Japão',
+    'japan': 'Japão'
+}
+
+def fold_text(text):
+    """
+    Converte o texto para minúsculas e remove acentos ('Biodigestão' -> 'biodigestao')
+    """
+    text = unicodedata.normalize('NFKD', str(text).casefold())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+@lru_cache(maxsize=None)
+def compile_separators(separators=DEFAULT_SEPARATORS):
+    """
+    Compila (uma única vez por conjunto de separadores) o regex de separação
+    """
+    return re.compile('|'.join(map(re.escape, separators)))
+
+def split_multiple_values(text, separators=DEFAULT_SEPARATORS):
+    """
+    Separa múltiplos valores em uma célula baseado em diferentes separadores
+    """
+    if pd.isna(text) or text == '':
+        return []
+
+    text = str(text).strip()
+    values = compile_separators(tuple(separators)).split(text)
+    return [v.strip() for v in values if v.strip()]
+
+class TaxonomyMatcher:
+    """
+    Matcher compilado para uma taxonomia {termo: rótulo padronizado}.
+
+    Todos os termos são reunidos em uma única alternância regex (em ordem de
+    prioridade, dentro de um lookahead para encontrar também ocorrências
+    sobrepostas), compilada uma vez por taxonomia. O texto e os termos são
+    comparados sem acentos e sem diferenciar maiúsculas. O resultado por token
+    é memorizado, já que os mesmos tokens se repetem em todo o corpus.
+
+    - match_all=False: o termo de maior prioridade encontrado define o rótulo
+    - match_all=True: todos os rótulos encontrados são retornados
+    - dedupe: não repete rótulos padronizados dentro da mesma célula
+    - fallback: função aplicada a tokens sem correspondência (None descarta o token)
+    """
+
+    def __init__(self, mapping, match_all=False, dedupe=False, fallback=None):
+        self.mapping = dict(mapping)
+        self.match_all = match_all
+        self.dedupe = dedupe
+        self.fallback = fallback
+
+        self._labels = list(self.mapping.values())
+        self._priority = {}
+        alternatives = []
+        for priority, key in enumerate(self.mapping):
+            folded = fold_text(key)
+            if folded in self._priority:
+                continue
+            self._priority[folded] = priority
+            if len(folded) <= ACRONYM_MAX_LENGTH:
+                alternatives.append(r'(?<!\w)' + re.escape(folded) + r'(?!\w)')
+            else:
+                alternatives.append(re.escape(folded))
+        self._pattern = re.compile('(?=(' + '|'.join(alternatives) + '))')
+        self._resolve_cached = lru_cache(maxsize=65536)(self._resolve_token)
+
+    def find(self, token):
+        """
+        Retorna os rótulos padronizados encontrados no token, em ordem de prioridade
+        """
+        priorities = sorted({self._priority[m.group(1)] for m in self._pattern.finditer(fold_text(token))})
+        if not priorities:
+            return []
+        if not self.match_all:
+            return [self._labels[priorities[0]]]
+
+        labels = []
+        for priority in priorities:
+            if self._labels[priority] not in labels:
+                labels.append(self._labels[priority])
+        return labels
+
+    def resolve(self, token):
+        """
+        Resolve um token já separado: (rótulos, True se veio da taxonomia)
+        """
+        return self._resolve_cached(token)
+
+    def _resolve_token(self, token):
+        labels = self.find(token)
+        if labels:
+            return tuple(labels), True
+        if self.fallback is not None:
+            fallback = self.fallback(token)
+            if fallback:
+                return (fallback,), False
+        return (), False
+
+    def normalize(self, text):
+        """
+        Separa e padroniza uma célula, retornando a lista de rótulos
+        """
+        if pd.isna(text) or text == '':
+            return [NAO_ESPECIFICADO]
+
+        standardized = []
+        for token in split_multiple_values(text):
+            labels, matched = self.resolve(token)
+            for label in labels:
+                if matched and self.dedupe and label in standardized:
+                    continue
+                standardized.append(label)
+
+        return standardized if standardized else [NAO_ESPECIFICADO]
+
+    def normalize_column(self, series):
+        """
+        Padroniza uma coluna inteira, processando cada valor distinto uma única vez
+        """
+        codes, uniques = pd.factorize(series)
+        normalized = [self.normalize(value) for value in uniques]
+        missing = self.normalize(None)
+        return pd.Series(
+            [normalized[code] if code >= 0 else missing for code in codes],
+            index=series.index,
+            name=series.name
+        )
+
+def _title_fallback(token):
+    return token.strip().title()
+
+def _method_fallback(token):
+    token = token.strip()
+    return token if len(token) > 2 else None
+
+TECH_MATCHER = TaxonomyMatcher(TECH_STANDARDIZATION, fallback=_title_fallback)
+WASTE_MATCHER = TaxonomyMatcher(WASTE_STANDARDIZATION, dedupe=True, fallback=_title_fallback)
+METHOD_MATCHER = TaxonomyMatcher(METHOD_STANDARDIZATION, match_all=True, dedupe=True, fallback=_method_fallback)
+COUNTRY_MATCHER = TaxonomyMatcher(COUNTRY_MAPPING)
+
+def normalize_country(pais_regiao):
+    """
+    Processa e padroniza países (primeiro país reconhecido no texto ou 'Outros')
+    """
+    if pd.isna(pais_regiao) or pais_regiao == '':
+        return NAO_ESPECIFICADO
+
+    labels = COUNTRY_MATCHER.find(pais_regiao)
+    return labels[0] if labels else 'Outros'
+
+# Matcher de cada coluna multivalorada da planilha
+MATCHERS = {
+    'TECNOLOGIA': TECH_MATCHER,
+    'TIPO_RESIDUO': WASTE_MATCHER,
+    'METODOLOGIA': METHOD_MATCHER
+}
+
+# Colunas de indicação por tecnologia ('Sim'/'Não') da aba de dados
+TECH_FLAG_COLUMNS = (
+    'Aterro_Sanitario', 'BECCS', 'Biocombustiveis', 'Biocombustivel_Aviacao',
+    'Biodigestao_Anaerobia', 'Bioetanol_Fermentacao', 'Biorrefinaria_Integrada',
+    'Briquetagem_Solar', 'CHP', 'Co_Firing', 'Codigestao', 'Combustao_Direta',
+    'Compostagem', 'Gaseificacao', 'Pelletizacao', 'Pirolise',
+    'Transesterificacao', 'W2VA'
+)
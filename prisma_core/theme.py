@@ -0,0 +1,14 @@
+"""
+Cores do dashboard, compartilhadas pelas figuras e pelos elementos HTML das seções
+"""
+# Configuração de cores temáticas
+COLOR_PALETTE = {
+    'primary': '#2d5016',
+    'secondary': '#3d602d',
+    'success': '#10B981',
+    'warning': '#F59E0B',
+    'danger': '#EF4444',
+    'info': '#3B82F6',
+    'light': '#F3F4F6',
+    'dark': '#1F2937'
+}
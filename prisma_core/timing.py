@@ -0,0 +1,187 @@
+"""
+Medição leve de tempo por etapa (spans), com estatísticas móveis e registro em JSON lines
+"""
+import functools
+import itertools
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Medições guardadas por etapa para os percentis móveis e execuções guardadas no histórico
+ROLLING_WINDOW = 200
+HISTORY_RUNS = 50
+
+class Span:
+    """
+    Uma etapa em andamento; use como context manager ou chame stop()
+    """
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+        self.parent = None
+        self.depth = 0
+        self.started = None
+        self.duration = None
+
+    def start(self):
+        stack = self.tracer._stack()
+        self.parent = stack[-1].name if stack else None
+        self.depth = len(stack)
+        stack.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.started
+            self.tracer._finish(self)
+        return self.duration
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+class Tracer:
+    """
+    Registro de tempos por etapa, compartilhado pelo processo.
+
+    Cada span medido entra nas janelas móveis da sua etapa (p50/p95) e, se
+    houver uma execução aberta na thread atual (begin_run), na lista de etapas
+    dessa execução. Spans aninhados guardam a etapa pai e a profundidade.
+    Spans de threads sem execução aberta (atualização em segundo plano) só
+    entram nas janelas e no log. Com log_path, cada span e cada execução viram
+    uma linha JSON no arquivo.
+    """
+
+    def __init__(self, log_path=None, window=ROLLING_WINDOW):
+        self.log_path = log_path
+        self.window = window
+        self.history = deque(maxlen=HISTORY_RUNS)
+        self._samples = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._log = None
+        self._ids = itertools.count(1)
+
+    def configure(self, log_path=None):
+        """
+        Troca (ou desativa, com None) o arquivo de log JSON lines
+        """
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            self.log_path = log_path
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def span(self, name):
+        return Span(self, name)
+
+    def timed(self, name):
+        """
+        Decorador: mede cada chamada da função como um span
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def begin_run(self, label=None):
+        """
+        Abre uma execução (um rerun do script) na thread atual, descartando a anterior se ficou aberta
+        """
+        self._local.stack = []
+        self._local.run = {'run': next(self._ids), 'label': label, 'started': time.time(),
+                           'clock': time.perf_counter(), 'spans': []}
+        return self._local.run
+
+    def end_run(self, label=None):
+        """
+        Fecha a execução da thread atual e devolve seu registro (etapas na ordem em que terminaram)
+        """
+        run = getattr(self._local, 'run', None)
+        if run is None:
+            return None
+        # Etapas que ficaram abertas (execução interrompida) terminam aqui
+        for span in reversed(self._stack()):
+            span.stop()
+        self._local.run = None
+        if label is not None:
+            run['label'] = label
+        run['total'] = time.perf_counter() - run.pop('clock')
+        with self._lock:
+            self.history.append(run)
+            self._write({'kind': 'run', 'run': run['run'], 'label': run['label'],
+                         'ts': run['started'], 'ms': round(run['total'] * 1000, 3)})
+        return run
+
+    def _finish(self, span):
+        stack = self._stack()
+        if span in stack:
+            del stack[stack.index(span):]
+        run = getattr(self._local, 'run', None)
+        record = {'name': span.name, 'parent': span.parent, 'depth': span.depth, 'duration': span.duration}
+        if run is not None:
+            record['offset'] = span.started - run['clock']
+            run['spans'].append(record)
+        with self._lock:
+            samples = self._samples.get(span.name)
+            if samples is None:
+                samples = self._samples[span.name] = deque(maxlen=self.window)
+            samples.append(span.duration)
+            self._write({
+                'kind': 'span', 'run': run['run'] if run is not None else None,
+                'ts': time.time(), 'span': span.name, 'parent': span.parent, 'depth': span.depth,
+                'ms': round(span.duration * 1000, 3), 'thread': threading.current_thread().name
+            })
+
+    def _write(self, record):
+        # Chamado com o lock adquirido
+        if self.log_path is None:
+            return
+        if self._log is None:
+            self._log = open(self.log_path, 'a', encoding='utf-8', buffering=1)
+        self._log.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def breakdown(self, run):
+        """
+        Etapas de uma execução em ordem de início, com a indentação da hierarquia
+        """
+        spans = sorted(run['spans'], key=lambda span: span.get('offset', 0))
+        return pd.DataFrame({
+            'Etapa': [' ' * span['depth'] + span['name'] for span in spans],
+            'ms': [round(span['duration'] * 1000, 1) for span in spans],
+            '% da execução': [round(100 * span['duration'] / run['total'], 1) if run['total'] else 0.0 for span in spans]
+        })
+
+    def stats(self):
+        """
+        Percentis móveis (p50/p95, em ms) das últimas medições de cada etapa
+        """
+        with self._lock:
+            samples = {name: np.array(values) for name, values in self._samples.items()}
+        rows = [
+            (name, len(values), *np.percentile(values * 1000, [50, 95]).round(1), round(values[-1] * 1000, 1))
+            for name, values in sorted(samples.items())
+        ]
+        return pd.DataFrame(rows, columns=['Etapa', 'n', 'p50 ms', 'p95 ms', 'última ms'])
+
+# Registro do processo, usado pelo núcleo e pelo dashboard
+TRACER = Tracer()
+span = TRACER.span
+timed = TRACER.timed
@@ -0,0 +1,28 @@
+"""
+Seções do dashboard, uma por módulo. Cada módulo expõe render(model, process_option)
+e só é importado (com as bibliotecas de que precisa) quando a seção é aberta.
+"""
+import importlib
+
+from prisma_core.timing import span
+
+# Seção (chave da navegação) -> módulo que a exibe
+SECTION_MODULES = {
+    "📊 Visão Geral": 'secoes.visao_geral',
+    "🔬 Tecnologias": 'secoes.tecnologias',
+    "♻️ Resíduos": 'secoes.residuos',
+    "🔄 Combinações": 'secoes.combinacoes',
+    "📐 Metodologias": 'secoes.metodologias',
+    "🎯 Variáveis Especiais": 'secoes.variaveis',
+    "📑 Dados": 'secoes.dados',
+    "🗺️ Análise Geoespacial": 'secoes.geoespacial'
+}
+
+def render(section, model, process_option):
+    """
+    Importa o módulo da seção (na primeira vez em que é aberta) e a exibe
+    """
+    name = SECTION_MODULES[section]
+    with span(f"import.{name.rsplit('.', 1)[-1]}"):
+        module = importlib.import_module(name)
+    module.render(model, process_option)
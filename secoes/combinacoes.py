@@ -0,0 +1,95 @@
+"""
+Seção Combinações: pares tecnologia + resíduo, mapa de calor e Sankey
+"""
+import streamlit as st
+
+from prisma_core.flows import FLOW_LEVELS, FLOW_TOP_K
+from secoes.comum import show_figure
+
+# Níveis do Sankey oferecidos, nome de cada nível nos controles e maior top-k oferecido
+SANKEY_LEVEL_OPTIONS = {
+    "Tecnologia → Resíduo → Metodologia": FLOW_LEVELS,
+    "Tecnologia → Resíduo": FLOW_LEVELS[:2]
+}
+SANKEY_LEVEL_NAMES = {'TECNOLOGIA': "tecnologias", 'TIPO_RESIDUO': "resíduos", 'METODOLOGIA': "metodologias"}
+SANKEY_MAX_K = 40
+
+# Parâmetros de build_sankey equivalentes aos padrões (figura pré-calculada)
+SANKEY_DEFAULTS = (FLOW_LEVELS, (FLOW_TOP_K,) * len(FLOW_LEVELS), True)
+
+def render(model, process_option):
+    """
+    Estatísticas e gráficos das combinações tecnologia + resíduo
+    """
+    df_original = model.articles
+
+    st.markdown("## 🔄 Análise de Combinações Tecnologia-Resíduo")
+
+    combinations = model.combinations
+
+    if combinations:
+        # Estatísticas de combinações
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.markdown(f"""
+            <div class='metric-card'>
+                <p style='color: #666; margin: 0;'>Total de Combinações</p>
+                <h3 style='color: #2d5016; margin: 0.5rem 0;'>{len(combinations)}</h3>
+                <p style='color: #999; margin: 0;'>únicas identificadas</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            most_common_comb = combinations.most_common(1)[0] if combinations else (('N/A',), 0)
+            st.markdown(f"""
+            <div class='metric-card'>
+                <p style='color: #666; margin: 0;'>Combinação mais comum</p>
+                <h3 style='color: #2d5016; margin: 0.5rem 0; font-size: 1rem;'>{' + '.join(most_common_comb[0])}</h3>
+                <p style='color: #999; margin: 0;'>{most_common_comb[1]} artigos</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col3:
+            avg_comb = sum(combinations.values()) / len(df_original)
+            st.markdown(f"""
+            <div class='metric-card'>
+                <p style='color: #666; margin: 0;'>Média por artigo</p>
+                <h3 style='color: #2d5016; margin: 0.5rem 0;'>{avg_comb:.2f}</h3>
+                <p style='color: #999; margin: 0;'>combinações</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        # Top combinações
+        st.markdown("### 🏆 Top 20 Combinações Tecnologia + Resíduo")
+
+        show_figure(model, 'combinacoes', 'top20')
+
+        # Heatmap de combinações
+        st.markdown("### 🗺️ Mapa de Calor: Tecnologia vs Tipo de Resíduo")
+
+        # Top 10 tecnologias × top 8 resíduos da matriz do cubo de contagens
+        show_figure(model, 'combinacoes', 'heatmap')
+
+        # Diagrama Sankey
+        st.markdown("### 🕸️ Fluxo de Conexões: Tecnologias → Resíduos → Metodologias")
+
+        sankey_col1, sankey_col2, sankey_col3, sankey_col4 = st.columns(4)
+        with sankey_col1:
+            sankey_levels = st.selectbox("Níveis do fluxo:", list(SANKEY_LEVEL_OPTIONS), key="sankey_levels")
+            sankey_others = st.checkbox(
+                "Agrupar demais em 'Outros'", value=True, key="sankey_others",
+                help="Rótulos fora do top de cada nível são somados em um nó 'Outros'; desmarcado, são omitidos"
+            )
+        levels = SANKEY_LEVEL_OPTIONS[sankey_levels]
+        top_k = []
+        for sankey_col, level in zip([sankey_col2, sankey_col3, sankey_col4], FLOW_LEVELS):
+            with sankey_col:
+                top_k.append(st.slider(
+                    f"Top {SANKEY_LEVEL_NAMES[level]}:", 2, SANKEY_MAX_K, FLOW_TOP_K,
+                    key=f"sankey_top_{level}", disabled=level not in levels
+                ))
+
+        params = (levels, tuple(top_k[:len(levels)]), sankey_others)
+        # Com os valores padrão, a figura é a mesma pré-calculada (chave sem parâmetros)
+        show_figure(model, 'combinacoes', 'sankey', params=() if params == SANKEY_DEFAULTS else params)
@@ -0,0 +1,45 @@
+"""
+Estado compartilhado entre sessões (dados e figuras) e exibição de gráficos com cache
+"""
+import os
+
+import streamlit as st
+
+from prisma_core.figures import FigureCache
+from prisma_core.sources import DataStore, REFRESH_INTERVAL
+from prisma_core.timing import span
+
+@st.cache_resource(show_spinner=False)
+def get_data_store():
+    """
+    Estado compartilhado entre sessões: abas, modelo normalizado e versão dos dados.
+    Com PRISMA_OFFLINE=1 o dashboard roda só com o snapshot local, sem acessar a rede.
+    A planilha é reconsultada em segundo plano a cada PRISMA_REFRESH_INTERVAL segundos (0 desativa).
+    """
+    store = DataStore(offline=os.environ.get('PRISMA_OFFLINE', '') not in ('', '0'))
+    store.start_refresher(float(os.environ.get('PRISMA_REFRESH_INTERVAL', REFRESH_INTERVAL)))
+    return store
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """
+    Figuras Plotly já construídas, compartilhadas entre sessões
+    """
+    return FigureCache()
+
+def show_figure(model, section, chart, build=None, params=()):
+    """
+    Exibe um gráfico guardado por (versão dos dados, seção, gráfico, parâmetros dos widgets);
+    build() só constrói a figura quando ela não está no cache. Sem build, usa o construtor
+    de prisma_core.charts, chamado com o modelo e os parâmetros.
+    """
+    if build is None:
+        def build():
+            # charts (e o plotly.express) só é importado quando uma figura precisa ser construída;
+            # figuras pré-calculadas do pacote de artefatos são exibidas sem ele
+            from prisma_core.charts import CHARTS
+            return CHARTS[(section, chart)](model, *params)
+    with span(f"figura.{chart}"):
+        figure = get_figure_cache().get((model.version, section, chart, params), build)
+        if figure is not None:
+            st.plotly_chart(figure, use_container_width=True)
@@ -0,0 +1,303 @@
+"""
+Seção Dados: tabela paginada com facetas, busca e downloads
+"""
+import importlib.util
+from datetime import datetime
+
+import numpy as np
+import streamlit as st
+
+from prisma_core.export import EXPORT_FORMATS, ExportCache
+from prisma_core.query import QueryView
+from prisma_core.search import FUZZY_TOP_K, is_text_dtype
+
+# Facetas do filtro da seção Dados: coluna -> rótulo do widget
+FACET_FILTERS = {
+    'País_Processado': "Filtrar por País:",
+    'TECNOLOGIA': "Filtrar por Tecnologia:",
+    'TIPO_RESIDUO': "Filtrar por Resíduo:",
+    'METODOLOGIA': "Filtrar por Metodologia:"
+}
+
+def facet_multiselect(facets, name, selections, base_bits):
+    """
+    Multiselect de uma faceta exibindo a contagem ao vivo de cada opção
+    """
+    if name not in facets.labels:
+        return []
+    
+    counts = facets.counts(name, selections, base=base_bits)
+    options = facets.options(name)
+    # Mantém opções selecionadas mesmo que tenham saído da lista
+    options += [label for label in selections.get(name, []) if label not in options]
+    
+    return st.multiselect(
+        FACET_FILTERS[name],
+        options,
+        key=f"facet_{name}",
+        format_func=lambda label: f"{label} ({counts.get(label, 0):,})",
+        help="Opções combinadas com OU dentro do filtro e com E entre filtros"
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_export_cache():
+    """
+    Arquivos de download já gerados, compartilhados entre sessões
+    """
+    return ExportCache()
+
+def render(model, process_option):
+    """
+    Tabela da visão escolhida com facetas, busca, paginação e downloads;
+    process_option define a origem da visão 'Dados Expandidos'
+    """
+    df_original = model.articles
+
+    st.markdown("## 📑 Visualização e Download dos Dados")
+
+    # Opções de visualização
+    col1, col2 = st.columns(2)
+
+    with col1:
+        data_view = st.selectbox(
+            "Escolha os dados para visualizar:",
+            ["Dados Originais", "Dados Expandidos", "Dados Processados"],
+            help="Diferentes visões dos dados para análise"
+        )
+
+        with col2:
+            # Colunas padrão que existem nos dados atuais
+            default_columns = [col for col in ['ID', 'TITULO', 'ANO', 'TECNOLOGIA', 'TIPO_RESIDUO', 'METODOLOGIA'] 
+                             if col in df_original.columns]
+            show_columns = st.multiselect(
+                "Selecionar colunas para exibir:",
+                df_original.columns.tolist(),
+                default=default_columns,
+                help="Escolha as colunas que deseja visualizar"
+            )
+
+        # Preparar dados conforme seleção: a visão é uma consulta preguiçosa (seleção de
+        # linhas e colunas); nada é copiado, e só a página exibida é materializada
+        if data_view == "Dados Originais":
+            display_view = QueryView(df_original)
+            description = "Dados originais sem processamento"
+        elif data_view == "Dados Expandidos":
+            if process_option == "Expandir dados (análise detalhada)":
+                display_view = QueryView(df_original)  # Usar df_original em vez de df
+                description = "Dados expandidos com múltiplas linhas por artigo"
+            else:
+                # row_articles: artigo de origem de cada linha expandida
+                display_view = QueryView(model.expansion, row_articles=model.expansion.article_positions())
+                description = "Dados expandidos (gerados dinamicamente)"
+        else:  # Dados Processados
+            display_view = QueryView(model.processed_frame)
+            description = "Dados originais com colunas processadas adicionais"
+
+        # Filtrar colunas selecionadas
+        if show_columns:
+            # Verificar se as colunas existem nos dados escolhidos
+            available_columns = [col for col in show_columns if col in display_view.columns]
+            if available_columns:
+                display_view = display_view.select(available_columns)
+            else:
+                st.warning("⚠️ Nenhuma das colunas selecionadas está disponível nos dados escolhidos.")
+
+        # Informações dos dados
+        st.info(f"📊 **{description}** - Total de linhas: **{len(display_view):,}**")
+
+        # Filtros adicionais: bitmaps por artigo (um por rótulo, calculados uma vez por versão
+        # dos dados); a tabela só é recortada uma vez, depois de combinar todos os filtros
+        st.markdown("### 🔍 Filtros")
+
+        facets = model.facets
+        base_bits = facets.all_rows()
+
+        # Seleções atuais lidas antes dos widgets para que as contagens de cada faceta
+        # reflitam os filtros das demais
+        selections = {name: st.session_state.get(f"facet_{name}", []) for name in FACET_FILTERS}
+
+        filter_col1, filter_col2, filter_col3 = st.columns(3)
+
+        with filter_col1:
+            # Status_Final não existe mais nos dados atuais
+            st.info("📊 Filtro por Status não disponível (dados atuais não possuem Status_Final)")
+
+        with filter_col2:
+            if 'Ano' in df_original.columns:
+                years = df_original['Ano'].dropna()
+                if len(years) > 0:
+                    year_range = st.slider(
+                        "Filtrar por período:",
+                        int(years.min()),
+                        int(years.max()),
+                        (int(years.min()), int(years.max()))
+                    )
+                    in_range = df_original['Ano'].between(year_range[0], year_range[1])
+                    base_bits = facets.pack(in_range.to_numpy(dtype=bool, na_value=False))
+
+        with filter_col3:
+            facet_multiselect(facets, 'País_Processado', selections, base_bits)
+
+        facet_col1, facet_col2, facet_col3 = st.columns(3)
+        for facet_col, name in zip([facet_col1, facet_col2, facet_col3], ['TECNOLOGIA', 'TIPO_RESIDUO', 'METODOLOGIA']):
+            with facet_col:
+                facet_multiselect(facets, name, selections, base_bits)
+
+        article_mask = facets.unpack(facets.mask(selections, base=base_bits))
+        st.caption(f"🎯 {int(article_mask.sum()):,} de {len(df_original):,} artigos atendem aos filtros")
+
+        # Busca por texto
+        st.markdown("### 🔎 Busca por Texto")
+        search_col1, search_col2, search_col3 = st.columns([2, 2, 1])
+
+        text_columns = [col for col in display_view.columns if is_text_dtype(display_view.dtype(col))]
+
+        with search_col1:
+            search_column = st.selectbox(
+                "Buscar na coluna:",
+                ['Todas'] + text_columns,
+                help="Selecione a coluna para busca ou 'Todas' para buscar em todo o dataset"
+            )
+
+        with search_col2:
+            search_term = st.text_input(
+                "Termo de busca:",
+                placeholder="Digite o termo que deseja buscar...",
+                help="Não diferencia maiúsculas/minúsculas nem acentos. Cada palavra acha as palavras "
+                     "que a contêm ('gas' acha 'biogás') e todas precisam aparecer no artigo; um trecho "
+                     "entre \"aspas\" acha essas palavras inteiras, em sequência"
+            )
+
+        with search_col3:
+            search_mode = st.radio(
+                "Modo de busca:",
+                ["Exata", "Aproximada"],
+                help=f"Aproximada: tolera erros de digitação, busca em título, tecnologia, resíduo e "
+                     f"metodologia e mostra os {FUZZY_TOP_K} artigos mais relevantes"
+            )
+
+        # Aplicar busca: colunas por artigo usam o índice invertido (interseção de listas de
+        # postagem); colunas que só existem na visão expandida são comparadas literalmente
+        if search_term and search_mode == "Aproximada":
+            # Busca por trigramas: só as linhas das palavras parecidas são pontuadas
+            ranked, scores = model.search_index.rank(search_term, mask=article_mask)
+            relevance = np.zeros(len(df_original))
+            relevance[ranked] = scores
+            article_mask = relevance > 0
+            row_relevance = relevance if display_view.row_articles is None else relevance[display_view.row_articles]
+            display_view = display_view.filter_articles(article_mask).sort_by(row_relevance)
+            display_view = display_view.with_column('Relevância', row_relevance.round(2))
+        elif search_term:
+            search_index = model.search_index
+            searched = text_columns if search_column == 'Todas' else [search_column]
+            indexed = [col for col in searched if col in search_index.indexes]
+            unindexed = [col for col in searched if col not in search_index.indexes]
+            if unindexed:
+                display_view = display_view.filter_articles(article_mask)
+                found = np.zeros(len(display_view), dtype=bool)
+                if indexed:
+                    found |= search_index.mask(search_term, indexed)[display_view.articles()]
+                for col in unindexed:
+                    found |= display_view.column(col).astype(str).str.contains(search_term, case=False, regex=False).to_numpy()
+                display_view = display_view.where(found)
+            else:
+                display_view = display_view.filter_articles(article_mask & search_index.mask(search_term, indexed))
+        else:
+            display_view = display_view.filter_articles(article_mask)
+
+        # Estatísticas atualizadas
+        st.success(f"✅ Exibindo **{len(display_view):,}** registros após filtros")
+
+        # Visualizar dados
+        if len(display_view) > 0:
+            st.markdown("### 📋 Tabela de Dados")
+
+            # Configurações de exibição
+            display_col1, display_col2 = st.columns(2)
+
+            with display_col1:
+                page_size = st.selectbox(
+                    "Linhas por página:",
+                    [25, 50, 100, 200, 500],
+                    index=1,
+                    help="Número de linhas a exibir na tabela"
+                )
+
+            with display_col2:
+                if len(display_view) > page_size:
+                    total_pages = (len(display_view) - 1) // page_size + 1
+                    page_number = st.number_input(
+                        f"Página (1-{total_pages}):",
+                        min_value=1,
+                        max_value=total_pages,
+                        value=1
+                    )
+                    start_idx = (page_number - 1) * page_size
+                    end_idx = min(start_idx + page_size, len(display_view))
+                    st.caption(f"Exibindo linhas {start_idx + 1} a {end_idx} de {len(display_view)}")
+                else:
+                    start_idx, end_idx = 0, len(display_view)
+                # Só a página (linhas e colunas) é materializada
+                display_subset = display_view.page(start_idx, end_idx)
+
+            # Exibir tabela
+            st.dataframe(
+                display_subset,
+                use_container_width=True,
+                height=600,
+                hide_index=True
+            )
+
+            # Downloads
+            st.markdown("### 📥 Downloads")
+
+            # Arquivos gerados só no clique (em outra thread), serializados em blocos e guardados inteiros
+            # por (versão dos dados, recorte exibido, formato): baixar de novo o mesmo recorte é imediato.
+            # O download não é enviado em partes: o Streamlit guarda os bytes inteiros (ver prisma_core/export.py)
+            export_cache = get_export_cache()
+            key = (model.version, data_view, display_view.fingerprint())
+            file_stem = f"dados_prisma_{data_view.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+            download_columns = st.columns(3)
+            download_labels = {
+                'csv': ("📄 Download CSV", "Download dos dados filtrados em formato CSV"),
+                'xlsx': ("📊 Download Excel", "Download dos dados filtrados em formato Excel"),
+                'json': ("📋 Download JSON", "Download dos dados filtrados em formato JSON")
+            }
+            for download_col, (fmt, (label, help_text)) in zip(download_columns, download_labels.items()):
+                mime, extension = EXPORT_FORMATS[fmt]
+                with download_col:
+                    if fmt == 'xlsx' and importlib.util.find_spec('openpyxl') is None:
+                        st.caption("📊 Excel indisponível (requer openpyxl)")
+                        continue
+                    st.download_button(
+                        label=f"{label} ({len(display_view):,} linhas)",
+                        data=lambda fmt=fmt, view=display_view: export_cache.get(key, fmt, view),
+                        file_name=f"{file_stem}.{extension}",
+                        mime=mime,
+                        help=help_text,
+                        on_click='ignore'
+                    )
+
+            # Estatísticas rápidas
+            st.markdown("### 📊 Estatísticas Rápidas dos Dados Filtrados")
+
+            stats_col1, stats_col2 = st.columns(2)
+
+            with stats_col1:
+                # Status_Final não existe mais nos dados atuais
+                st.markdown("**Status dos Artigos:**")
+                st.write(f"- Todos incluídos: {len(display_view)} (100.0%)")
+                st.info("Status_Final não disponível nos dados atuais")
+
+            with stats_col2:
+                if 'País_Processado' in display_view.columns:
+                    country_counts = display_view.column('País_Processado').value_counts()
+                    country_counts = country_counts[country_counts > 0].head(5)
+                    st.markdown("**Top 5 Países:**")
+                    for country, count in country_counts.items():
+                        percentage = (count / len(display_view)) * 100
+                        st.write(f"- {country}: {count} ({percentage:.1f}%)")
+
+        else:
+            st.warning("⚠️ Nenhum dado disponível com os filtros aplicados.")
@@ -0,0 +1,349 @@
+"""
+Seção Análise Geoespacial: mapas por país, pontos exatos, mapa de calor e comparação entre tecnologias
+"""
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from prisma_core.geo import CLUSTER_RESOLUTIONS, DENSITY_RESOLUTIONS, POINT_CLUSTER_MAX
+from prisma_core.taxonomy import TECH_FLAG_COLUMNS
+from prisma_core.theme import COLOR_PALETTE
+from secoes.comum import show_figure
+
+# Mapas por linha na comparação entre tecnologias
+SMALL_MULTIPLES_COLUMNS = 3
+
+def render(model, process_option):
+    """
+    Mapa mundial por tecnologia, pontos exatos com coordenadas, mapa de calor da densidade
+    de estudos e mapas pequenos comparando as tecnologias
+    """
+    df_original = model.articles
+
+    st.header("🗺️ Análise Geoespacial dos Estudos")
+
+    # TABS para organizar os diferentes mapas
+    tab1, tab2, tab3, tab4 = st.tabs(["🌍 Mapa Mundial", "📍 Pontos Exatos", "🔥 Mapa de Calor", "📊 Dashboard Completo"])
+
+    # ========== TAB 1: MAPA MUNDIAL COLORIDO ==========
+    with tab1:
+        st.subheader("🌍 Mapa Mundial - Distribuição por País")
+
+        # Seletor de tecnologia
+        tech_cols = [col for col in df_original.columns if col in TECH_FLAG_COLUMNS]
+
+        tecnologia_selecionada = st.selectbox(
+            "🔬 Selecione a tecnologia:",
+            tech_cols,
+            format_func=lambda x: x.replace('_', ' ').title(),
+            key="tech_world_map"
+        )
+
+        if tecnologia_selecionada:
+            # Coluna da matriz país × tecnologia, calculada uma vez por versão dos dados
+            contagem_paises = model.country_matrix.country_counts(tecnologia_selecionada)
+
+            if not contagem_paises.empty:
+                # MAPA CHOROPLETH
+
+                def build_mapa_mundial():
+                    fig = px.choropleth(
+                        data_frame=contagem_paises,
+                        locations='País_Padronizado',
+                        color='Quantidade_Estudos',
+                        locationmode='country names',
+                        hover_name='País',  # Mostra nome original no hover
+                        color_continuous_scale='Viridis',
+                        title=f"Distribuição Mundial - {tecnologia_selecionada.replace('_', ' ').title()}",
+                        labels={'Quantidade_Estudos': 'Nº de Estudos', 'País_Padronizado': 'País'},
+                        height=600
+                    )
+
+                    fig.update_layout(
+                        geo=dict(
+                            showframe=False,
+                            showcoastlines=True,
+                            projection_type='equirectangular'
+                        )
+                    )
+                    return fig
+
+                show_figure(model, 'geo', 'mapa_mundial', build_mapa_mundial, (tecnologia_selecionada,))
+
+                # Métricas rápidas
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("🌍 Total de Países", len(contagem_paises))
+                with col2:
+                    st.metric("📚 Total de Estudos", contagem_paises['Quantidade_Estudos'].sum())
+                with col3:
+                    st.metric("🏆 País Líder", contagem_paises.iloc[0]['País'])
+
+            else:
+                st.warning(f"❌ Nenhum estudo encontrado para {tecnologia_selecionada}")
+
+    # ========== TAB 2: PONTOS EXATOS ==========
+    with tab2:
+        st.subheader("📍 Localização Exata dos Estudos")
+
+        # Seletor de tecnologia para pontos
+        tecnologia_pontos = st.selectbox(
+            "🔬 Selecione a tecnologia para visualizar pontos:",
+            tech_cols,
+            format_func=lambda x: x.replace('_', ' ').title(),
+            key="tech_points_map"
+        )
+
+        resolucao = st.select_slider(
+            "🔍 Agrupamento dos pontos:",
+            options=list(CLUSTER_RESOLUTIONS),
+            value='Local',
+            key="points_resolution",
+            help=f"Estudos próximos são agrupados em células da grade (de {max(CLUSTER_RESOLUTIONS.values()):g}° a "
+                 f"{min(CLUSTER_RESOLUTIONS.values()):g}°); grupos com até {POINT_CLUSTER_MAX} estudos aparecem como pontos"
+        )
+
+        if tecnologia_pontos:
+            # Estudos com a tecnologia e coordenadas válidas (agrupamentos calculados uma vez por versão dos dados)
+            clusters = model.point_clusters
+            dados_filtrados = df_original.iloc[clusters.positions(tecnologia_pontos)]
+
+            if not dados_filtrados.empty:
+                st.success(f"✅ Encontrados {len(dados_filtrados)} estudos com coordenadas exatas")
+
+                # MAPA DE PONTOS EXATOS: marcadores com a contagem de cada grupo e pontos só dos grupos pequenos
+                grupos, pontos = clusters.grid(tecnologia_pontos, resolucao).split()
+                st.caption(f"🗺️ {len(grupos)} agrupamentos e {len(pontos)} pontos individuais no mapa")
+
+                def build_pontos():
+                    if len(pontos):
+                        fig_points = px.scatter_geo(
+                            df_original.iloc[pontos],
+                            lat='LATITUDE_DECIMAL',
+                            lon='LONGITUDE_DECIMAL',
+                            color='PAIS',
+                            size_max=15,
+                            hover_name='TITULO',
+                            hover_data={
+                                'PAIS': True,
+                                'LOCALIZACAO': True,
+                                'CLIMA': True,
+                                'ANO': True,
+                                'LATITUDE_DECIMAL': ':,.3f',
+                                'LONGITUDE_DECIMAL': ':,.3f'
+                            },
+                            color_discrete_sequence=px.colors.qualitative.Set3
+                        )
+
+                        fig_points.update_traces(
+                            marker=dict(size=8, opacity=0.8, line=dict(width=1, color='white')),
+                            selector=dict(mode='markers')
+                        )
+                    else:
+                        fig_points = go.Figure()
+
+                    if len(grupos):
+                        # Área do marcador proporcional ao número de estudos do grupo
+                        tamanhos = 14 + 36 * np.sqrt(grupos['count'] / grupos['count'].max())
+                        fig_points.add_trace(go.Scattergeo(
+                            lat=grupos['latitude'],
+                            lon=grupos['longitude'],
+                            mode='markers+text',
+                            text=grupos['count'],
+                            textfont=dict(color='white', size=10),
+                            marker=dict(size=tamanhos, color=COLOR_PALETTE['primary'], opacity=0.75, line=dict(width=1, color='white')),
+                            customdata=np.stack([grupos['count'], grupos['country'].fillna('N/A')], axis=-1),
+                            hovertemplate="<b>%{customdata[0]} estudos</b><br>🌍 Principal país: %{customdata[1]}"
+                                          "<br>📐 %{lat:.2f}, %{lon:.2f}<extra></extra>",
+                            name="Agrupamentos"
+                        ))
+
+                    fig_points.update_layout(
+                        title=f"Localização Exata - {tecnologia_pontos.replace('_', ' ').title()}",
+                        height=600,
+                        geo=dict(
+                            showframe=False,
+                            showcoastlines=True,
+                            projection_type='natural earth',
+                            showland=True,
+                            landcolor='rgb(243, 243, 243)',
+                            coastlinecolor='rgb(204, 204, 204)',
+                        )
+                    )
+                    return fig_points
+
+                show_figure(model, 'geo', 'pontos', build_pontos, (tecnologia_pontos, resolucao))
+
+                # Estatísticas por continente/região
+                col1, col2, col3, col4 = st.columns(4)
+
+                with col1:
+                    st.metric("📍 Total de Pontos", len(dados_filtrados))
+
+                with col2:
+                    paises_unicos = dados_filtrados['PAIS'].nunique()
+                    st.metric("🌍 Países Diferentes", paises_unicos)
+
+                with col3:
+                    lat_range = dados_filtrados['LATITUDE_DECIMAL'].max() - dados_filtrados['LATITUDE_DECIMAL'].min()
+                    st.metric("🗺️ Dispersão Lat", f"{lat_range:.1f}°")
+
+                with col4:
+                    lon_range = dados_filtrados['LONGITUDE_DECIMAL'].max() - dados_filtrados['LONGITUDE_DECIMAL'].min()
+                    st.metric("🗺️ Dispersão Lon", f"{lon_range:.1f}°")
+
+                # Tabela detalhada com filtros
+                st.subheader("📋 Detalhes dos Estudos")
+
+                # Filtro por país
+                paises_disponiveis = ['Todos'] + sorted(dados_filtrados['PAIS'].unique().tolist())
+                pais_filtro = st.selectbox("🌍 Filtrar por país:", paises_disponiveis, key="country_filter_points")
+
+                if pais_filtro != 'Todos':
+                    dados_mostrar = dados_filtrados[dados_filtrados['PAIS'] == pais_filtro]
+                else:
+                    dados_mostrar = dados_filtrados
+
+                # Colunas para mostrar na tabela
+                colunas_mostrar = ['TITULO', 'PAIS', 'LOCALIZACAO', 'CLIMA', 'ANO', 'LATITUDE_DECIMAL', 'LONGITUDE_DECIMAL']
+
+                st.dataframe(
+                    dados_mostrar[colunas_mostrar].rename(columns={
+                        'TITULO': '📚 Título',
+                        'PAIS': '🌍 País',
+                        'LOCALIZACAO': '📍 Localização',
+                        'CLIMA': '🌡️ Clima',
+                        'ANO': '📅 Ano',
+                        'LATITUDE_DECIMAL': '📐 Latitude',
+                        'LONGITUDE_DECIMAL': '📐 Longitude'
+                    }),
+                    use_container_width=True,
+                    height=300
+                )
+
+            else:
+                st.warning(f"❌ Nenhum estudo com coordenadas válidas encontrado para {tecnologia_pontos}")
+                st.info("💡 **Dica:** Alguns estudos podem ter coordenadas em branco ou inválidas (0,0)")
+    # ========== TAB 3: MAPA DE CALOR ==========
+    with tab3:
+        st.subheader("🔥 Mapa de Calor - Densidade de Estudos")
+
+        heat_col1, heat_col2, heat_col3 = st.columns([2, 1, 1])
+        with heat_col1:
+            tecnologia_calor = st.selectbox(
+                "🔬 Selecione a tecnologia:",
+                tech_cols,
+                format_func=lambda x: x.replace('_', ' ').title(),
+                key="tech_heat_map"
+            )
+        with heat_col2:
+            resolucao_calor = st.selectbox("🔍 Tamanho da célula:", list(DENSITY_RESOLUTIONS), index=1, key="heat_resolution")
+        with heat_col3:
+            suavizar = st.checkbox("Suavizar", value=False, key="heat_smooth",
+                                   help="Espalha cada contagem pelas células vizinhas (núcleo binomial 3×3)")
+
+        if tecnologia_calor:
+            # Grades de todas as tecnologias calculadas uma vez por versão dos dados; aqui só a consulta
+            celulas = model.density_grids.cells(tecnologia_calor, resolucao_calor, suavizar)
+
+            if not celulas.empty:
+                def build_calor():
+                    tamanho = DENSITY_RESOLUTIONS[resolucao_calor]
+                    fig_heat = go.Figure(go.Scattergeo(
+                        lat=celulas['latitude'],
+                        lon=celulas['longitude'],
+                        mode='markers',
+                        marker=dict(
+                            symbol='square',
+                            size=max(3, 2.8 * tamanho),
+                            color=celulas['count'],
+                            colorscale='YlOrRd',
+                            opacity=0.85,
+                            colorbar=dict(title="Estudos")
+                        ),
+                        hovertemplate="📐 %{lat:.1f}, %{lon:.1f}<br><b>%{marker.color:.1f} estudos</b><extra></extra>"
+                    ))
+
+                    fig_heat.update_layout(
+                        title=f"Densidade de Estudos - {tecnologia_calor.replace('_', ' ').title()}",
+                        height=600,
+                        geo=dict(
+                            showframe=False,
+                            showcoastlines=True,
+                            projection_type='natural earth',
+                            showland=True,
+                            landcolor='rgb(243, 243, 243)',
+                            coastlinecolor='rgb(204, 204, 204)',
+                        )
+                    )
+                    return fig_heat
+
+                show_figure(model, 'geo', 'calor', build_calor, (tecnologia_calor, resolucao_calor, suavizar))
+
+                densa = celulas.loc[celulas['count'].idxmax()]
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("🟥 Células com Estudos", len(celulas))
+                with col2:
+                    st.metric("🔥 Célula Mais Densa", f"{densa['count']:.0f} estudos")
+                with col3:
+                    st.metric("📐 Centro da Célula", f"{densa['latitude']:.1f}°, {densa['longitude']:.1f}°")
+            else:
+                st.warning(f"❌ Nenhum estudo com coordenadas válidas encontrado para {tecnologia_calor}")
+
+    # ========== TAB 4: COMPARAÇÃO ENTRE TECNOLOGIAS ==========
+    with tab4:
+        st.subheader("📊 Comparação entre Tecnologias - Distribuição por País")
+
+        # Todas as tecnologias de uma vez: um mapa pequeno por coluna da matriz país × tecnologia
+        matriz = model.country_matrix.long()
+
+        if not matriz.empty:
+            escala = st.radio(
+                "🎨 Cor dos países:",
+                ['Nº de Estudos', 'Participação na tecnologia (%)'],
+                horizontal=True,
+                key="small_multiples_scale",
+                help="A participação compara onde cada tecnologia se concentra, independente do total de estudos dela"
+            )
+            coluna_cor = 'Quantidade_Estudos' if escala == 'Nº de Estudos' else 'Participação'
+
+            def build_comparacao():
+                tabela = matriz.assign(Tecnologia=matriz['Tecnologia'].str.replace('_', ' ').str.title())
+                n_linhas = -(-tabela['Tecnologia'].nunique() // SMALL_MULTIPLES_COLUMNS)
+                fig = px.choropleth(
+                    data_frame=tabela,
+                    locations='País_Padronizado',
+                    color=coluna_cor,
+                    locationmode='country names',
+                    hover_name='País',
+                    hover_data={'Quantidade_Estudos': True, 'Participação': ':.1f', 'País_Padronizado': False},
+                    facet_col='Tecnologia',
+                    facet_col_wrap=SMALL_MULTIPLES_COLUMNS,
+                    color_continuous_scale='Viridis',
+                    labels={'Quantidade_Estudos': 'Nº de Estudos', 'Participação': 'Participação (%)'},
+                    height=220 * n_linhas
+                )
+                fig.for_each_annotation(lambda a: a.update(text=a.text.split('=')[-1]))
+                fig.update_geos(showframe=False, showcoastlines=True, projection_type='equirectangular')
+                fig.update_layout(margin=dict(l=0, r=0, t=30, b=0))
+                return fig
+
+            show_figure(model, 'geo', 'comparacao', build_comparacao, (coluna_cor,))
+
+            # Resumo da matriz: país líder de cada tecnologia
+            lideres = matriz.sort_values('Quantidade_Estudos', ascending=False, kind='stable').drop_duplicates('Tecnologia')
+            resumo = lideres.assign(Tecnologia=lideres['Tecnologia'].str.replace('_', ' ').str.title())
+            st.dataframe(
+                resumo[['Tecnologia', 'País', 'Quantidade_Estudos', 'Participação']].sort_values('Tecnologia'),
+                column_config={
+                    'País': "País Líder",
+                    'Quantidade_Estudos': "Nº de Estudos",
+                    'Participação': st.column_config.NumberColumn("Participação (%)", format="%.1f")
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+        else:
+            st.warning("❌ Nenhum estudo com país e indicação de tecnologia encontrado")
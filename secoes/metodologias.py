@@ -0,0 +1,25 @@
+"""
+Seção Metodologias: treemap, metodologias por artigo e por status
+"""
+import streamlit as st
+
+from secoes.comum import show_figure
+
+def render(model, process_option):
+    """
+    Gráficos das metodologias lidos do cubo de contagens
+    """
+    st.markdown("## 📐 Análise de Metodologias")
+
+    # Visualização em treemap
+    show_figure(model, 'metodologias', 'treemap')
+
+    # Distribuição de quantidade de metodologias
+    st.markdown("### 📊 Distribuição: Quantidade de Metodologias por Artigo")
+
+    show_figure(model, 'metodologias', 'histograma')
+
+    # Metodologias por status
+    st.markdown("### 📊 Metodologias por Status do Artigo")
+
+    show_figure(model, 'metodologias', 'status')
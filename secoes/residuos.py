@@ -0,0 +1,46 @@
+"""
+Seção Resíduos: distribuição e evolução temporal dos tipos de resíduos
+"""
+import streamlit as st
+
+from prisma_core.theme import COLOR_PALETTE
+from secoes.comum import show_figure
+
+def render(model, process_option):
+    """
+    Distribuição dos resíduos, os cinco mais frequentes e a evolução por ano
+    """
+    df_year = model.df_year
+
+    st.markdown("## ♻️ Análise Detalhada de Tipos de Resíduos")
+
+    # Artigos por tipo de resíduo (cubo de contagens, sem 'Não especificado')
+    waste_counts = model.cube.counts('TIPO_RESIDUO')
+
+    # Layout em duas colunas
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        # Gráfico de pizza aprimorado
+        show_figure(model, 'residuos', 'pizza')
+
+    with col2:
+        # Estatísticas de resíduos
+        st.markdown("### 📊 Estatísticas")
+
+        for waste, count in waste_counts.head(5).items():
+            percentage = (count / waste_counts.sum()) * 100
+            st.markdown(f"""
+            <div style='background: linear-gradient(90deg, {COLOR_PALETTE['success']} {percentage}%, 
+                       {COLOR_PALETTE['light']} {percentage}%);
+                       padding: 0.5rem; border-radius: 5px; margin-bottom: 0.5rem;'>
+                <strong>{waste}</strong>
+                <span style='float: right;'>{count} ({percentage:.1f}%)</span>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # Evolução temporal
+    st.markdown("### 📈 Evolução Temporal dos Tipos de Resíduos")
+
+    if len(df_year) > 0:
+        show_figure(model, 'residuos', 'evolucao')
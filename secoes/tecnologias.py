@@ -0,0 +1,59 @@
+"""
+Seção Tecnologias: mais estudadas, cobertura e co-ocorrência
+"""
+import streamlit as st
+
+from secoes.comum import show_figure
+
+def render(model, process_option):
+    """
+    Tecnologia mais comum, média por artigo, cobertura, top 15 e co-ocorrências
+    """
+    st.markdown("## 🔬 Análise Detalhada de Tecnologias")
+
+    # Artigos por tecnologia (cubo de contagens, sem 'Não especificado'), em ordem decrescente
+    tech_counts = model.cube.counts('TECNOLOGIA')
+
+    # Cards de estatísticas
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        most_common_tech = next(iter(tech_counts.items()), ('N/A', 0))
+        st.markdown(f"""
+        <div class='metric-card'>
+            <p style='color: #666; margin: 0;'>Tecnologia mais comum</p>
+            <h3 style='color: #2d5016; margin: 0.5rem 0;'>{most_common_tech[0]}</h3>
+            <p style='color: #999; margin: 0;'>{most_common_tech[1]} artigos</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        avg_tech_per_article = model.techs.row_lengths().mean()
+        st.markdown(f"""
+        <div class='metric-card'>
+            <p style='color: #666; margin: 0;'>Média por artigo</p>
+            <h3 style='color: #2d5016; margin: 0.5rem 0;'>{avg_tech_per_article:.2f}</h3>
+            <p style='color: #999; margin: 0;'>tecnologias</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        tech_coverage = model.coverage('TECNOLOGIA') * 100
+        st.markdown(f"""
+        <div class='metric-card'>
+            <p style='color: #666; margin: 0;'>Cobertura</p>
+            <h3 style='color: #2d5016; margin: 0.5rem 0;'>{tech_coverage:.1f}%</h3>
+            <p style='color: #999; margin: 0;'>dos artigos</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Gráfico principal de tecnologias
+    st.markdown("### 📊 Top 15 Tecnologias de Bioenergia")
+
+    show_figure(model, 'tecnologias', 'top15')
+
+    # Análise de co-ocorrência
+    st.markdown("### 🔗 Análise de Co-ocorrência de Tecnologias")
+
+    # Pares de tecnologias mais frequentes (T.T @ T, do cubo de contagens)
+    show_figure(model, 'tecnologias', 'coocorrencia')
@@ -0,0 +1,54 @@
+"""
+Seção Variáveis Especiais: preenchimento de localização e clima
+"""
+import pandas as pd
+import streamlit as st
+
+def render(model, process_option):
+    """
+    Preenchimento de localização e clima, no total e por país
+    """
+    df_original = model.articles
+
+    st.header("🎯 Análise de Variáveis - Prof. Rubens")
+    st.markdown("*Análise das variáveis disponíveis no dataset*")
+
+    # Variáveis disponíveis no dataset
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if 'LOCALIZACAO' in df_original.columns:
+            loc_count = df_original['LOCALIZACAO'].notna().sum()
+            loc_pct = (loc_count / len(df_original)) * 100
+            st.metric("🌍 Localização", loc_count, f"{loc_pct:.1f}% preenchido")
+        else:
+            st.metric("🌍 Localização", "0", "Não disponível")
+
+    with col2:
+        if 'CLIMA' in df_original.columns:
+            clima_count = df_original['CLIMA'].notna().sum()
+            clima_pct = (clima_count / len(df_original)) * 100
+            st.metric("🌡️ Clima", clima_count, f"{clima_pct:.1f}% preenchido")
+        else:
+            st.metric("🌡️ Clima", "0", "Não disponível")
+
+    # Análise simples por país
+    if 'LOCALIZACAO' in df_original.columns and 'PAIS' in df_original.columns:
+        st.subheader("🌍 Análise por País")
+
+        paises_dados = []
+        for pais in df_original['PAIS'].unique()[:10]:  # Top 10 países
+            dados_pais = df_original[df_original['PAIS'] == pais]
+            loc_count = dados_pais['LOCALIZACAO'].notna().sum()
+            total_pais = len(dados_pais)
+            pct = (loc_count / total_pais * 100) if total_pais > 0 else 0
+
+            paises_dados.append({
+                'País': pais,
+                'Total': total_pais,
+                'Com_Localização': loc_count,
+                'Percentual': pct
+            })
+
+        df_paises = pd.DataFrame(paises_dados).sort_values('Total', ascending=False)
+        st.dataframe(df_paises, use_container_width=True)
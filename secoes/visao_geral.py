@@ -0,0 +1,117 @@
+"""
+Seção Visão Geral: métricas gerais, campos multivalorados e evolução temporal
+"""
+import streamlit as st
+
+from secoes.comum import show_figure
+
+def render(model, process_option):
+    """
+    Métricas gerais, rótulos distintos por campo e publicações por ano
+    """
+    df_original = model.articles
+    all_techs = model.counter('TECNOLOGIA')
+    all_wastes = model.counter('TIPO_RESIDUO')
+    all_methods = model.counter('METODOLOGIA')
+    df_year = model.df_year
+
+    st.markdown("## 📊 Visão Geral do Projeto")
+
+    # Métricas principais em cards
+    col1, col2, col3, col4 = st.columns(4)
+
+    total_artigos = len(df_original)
+    # Status_Final não existe mais nos dados atuais
+    incluidos = total_artigos  # Assumindo que todos os dados são incluídos
+    excluidos = 0
+    pendentes = 0
+
+    with col1:
+        st.metric(
+            "📚 Total de Artigos", 
+            f"{total_artigos:,}",
+            help="Total de artigos analisados"
+        )
+
+    with col2:
+        st.metric(
+            "✅ Incluídos", 
+            f"{incluidos:,}",
+            f"{(incluidos/total_artigos*100):.1f}%",
+            help="Artigos que atendem aos critérios"
+        )
+
+    with col3:
+        st.metric(
+            "❌ Excluídos", 
+            f"{excluidos:,}",
+            f"{(excluidos/total_artigos*100):.1f}%",
+            help="Artigos que não atendem aos critérios"
+        )
+
+    with col4:
+        st.metric(
+            "⏳ Pendentes", 
+            f"{pendentes:,}",
+            f"{(pendentes/total_artigos*100):.1f}%",
+            help="Artigos aguardando análise"
+        )
+
+    st.markdown("---")
+
+    # Análise de valores múltiplos
+    st.markdown("### 📊 Análise de Campos com Valores Múltiplos")
+
+    # Coletar estatísticas
+    unique_techs = len(set(all_techs)) - (1 if 'Não especificado' in all_techs else 0)
+    unique_wastes = len(set(all_wastes)) - (1 if 'Não especificado' in all_wastes else 0)
+    unique_methods = len(set(all_methods)) - (1 if 'Não especificado' in all_methods else 0)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("""
+        <div class='metric-card'>
+            <h3 style='color: #2d5016; margin-bottom: 0.5rem;'>🔬 Tecnologias Únicas</h3>
+                <h2 style='margin: 0; color: #1a3a52;'>{}</h2>
+                <p style='color: #666; margin-top: 0.5rem;'>Média por artigo: {:.1f}</p>
+            </div>
+            """.format(
+                unique_techs,
+                model.techs.row_lengths().mean()
+            ), unsafe_allow_html=True)
+
+        with col2:
+            st.markdown("""
+            <div class='metric-card'>
+                <h3 style='color: #2d5016; margin-bottom: 0.5rem;'>♻️ Tipos de Resíduos</h3>
+                <h2 style='margin: 0; color: #1a3a52;'>{}</h2>
+                <p style='color: #666; margin-top: 0.5rem;'>Média por artigo: {:.1f}</p>
+            </div>
+            """.format(
+                unique_wastes,
+                model.wastes.row_lengths().mean()
+            ), unsafe_allow_html=True)
+
+        with col3:
+            st.markdown("""
+            <div class='metric-card'>
+                <h3 style='color: #2d5016; margin-bottom: 0.5rem;'>📐 Metodologias</h3>
+                <h2 style='margin: 0; color: #1a3a52;'>{}</h2>
+                <p style='color: #666; margin-top: 0.5rem;'>Média por artigo: {:.1f}</p>
+            </div>
+            """.format(
+                unique_methods,
+                model.methods.row_lengths().mean()
+            ), unsafe_allow_html=True)
+
+        # Gráfico de distribuição com design aprimorado
+        st.markdown("### 📈 Distribuição de Valores por Campo")
+
+        show_figure(model, 'visao_geral', 'violin')
+
+        # Timeline de publicações
+        st.markdown("### 📅 Evolução Temporal das Publicações")
+
+        if len(df_year) > 0:
+            show_figure(model, 'visao_geral', 'timeline')
@@ -0,0 +1,113 @@
+"""
+Servidor HTTP local no lugar das abas publicadas da planilha (ETag, atrasos e falhas por aba)
+"""
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from prisma_core.bundle import BundleStore
+from prisma_core.snapshot import SnapshotStore
+from prisma_core.sources import SHEET_URLS, DataStore
+
+class SheetServer:
+    """
+    Abas servidas em /<nome>: bodies guarda o CSV de cada aba; delays (s) atrasa a
+    resposta; failures conta quantas das próximas respostas são 500. requests
+    registra (aba, status, condicional) de cada requisição recebida.
+    """
+
+    def __init__(self):
+        self.bodies = {}
+        self.delays = {}
+        self.failures = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/{name}"
+
+    @property
+    def urls(self):
+        return {name: self.url(name) for name in SHEET_URLS}
+
+    def publish(self, df, names=tuple(SHEET_URLS)):
+        body = df.to_csv(index=False).encode('utf-8')
+        for name in names:
+            self.bodies[name] = body
+
+    def hits(self, name):
+        return [request for request in self.requests if request[0] == name]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _respond(self, handler):
+        name = handler.path.split('?')[0].strip('/')
+        time.sleep(self.delays.get(name, 0))
+        conditional = 'If-None-Match' in handler.headers
+        with self._lock:
+            failing = self.failures.get(name, 0) > 0
+            if failing:
+                self.failures[name] -= 1
+        body = self.bodies.get(name)
+        if failing or body is None:
+            status, body, headers = 500, b'', {}
+        else:
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            headers = {'ETag': etag}
+            if handler.headers.get('If-None-Match') == etag:
+                status, body = 304, b''
+            else:
+                status, headers['Content-Type'] = 200, 'text/csv'
+        with self._lock:
+            self.requests.append((name, status, conditional))
+        handler.send_response(status)
+        for header, value in headers.items():
+            handler.send_header(header, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server._respond(self)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+@pytest.fixture
+def sheet_server():
+    server = SheetServer()
+    yield server
+    server.close()
+
+@pytest.fixture
+def data_store(sheet_server, tmp_path):
+    """
+    Cria DataStores apontados para o servidor local, com snapshots e pacotes em tmp_path
+    """
+    stores = []
+
+    def make(**kwargs):
+        kwargs.setdefault('snapshots', SnapshotStore(tmp_path / 'snapshots'))
+        kwargs.setdefault('bundles', BundleStore(tmp_path / 'bundles'))
+        store = DataStore(sheet_server.urls, **kwargs)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.stop_refresher()
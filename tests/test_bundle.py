@@ -0,0 +1,20 @@
+"""
+Pacote de artefatos: só é carregado pelo mesmo formato e pelo mesmo código de normalização e modelo
+"""
+from prisma_core import bundle
+from prisma_core.bundle import BundleStore
+from prisma_core.model import ArticleModel
+from prisma_core.synthetic import generate_articles
+
+def test_bundle_from_other_model_code_is_ignored(tmp_path, monkeypatch):
+    df = generate_articles(100, seed=6)
+    model = ArticleModel(df)
+    BundleStore(tmp_path).save(model, df, 'teste', figures=False)
+
+    loaded = BundleStore(tmp_path).load()
+    assert loaded is not None and loaded.model.version == model.version
+    assert loaded.manifest['model_digest'] == bundle.model_digest()
+
+    monkeypatch.setattr(bundle, 'model_digest', lambda: 'outro-codigo')
+    assert BundleStore(tmp_path).manifest() is None
+    assert BundleStore(tmp_path).load() is None
@@ -0,0 +1,17 @@
+"""
+Cache de figuras: figuras do pacote carregadas uma vez por versão dos dados
+"""
+from prisma_core.figures import FigureCache
+
+def test_preload_runs_once_per_version():
+    cache = FigureCache()
+    cache.preload('v1', {('geral', 'anos'): None, ('geral', 'paises'): '{"data": []}'})
+    assert len(cache) == 2
+
+    # Uma figura descartada não volta com outra chamada para a mesma versão
+    cache._figures.pop(('v1', 'geral', 'anos', ()))
+    cache.preload('v1', {('geral', 'anos'): None})
+    assert len(cache) == 1
+
+    cache.preload('v2', {('geral', 'anos'): None})
+    assert ('v2', 'geral', 'anos', ()) in cache._figures
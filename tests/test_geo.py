@@ -0,0 +1,38 @@
+"""
+Agrupamentos do mapa de pontos: grades montadas na construção, com e sem a coluna de país
+"""
+import numpy as np
+import pandas as pd
+
+from prisma_core.geo import CLUSTER_RESOLUTIONS, GridClusters, PointClusters
+from prisma_core.model import ArticleModel
+from prisma_core.synthetic import generate_articles
+
+def test_main_country_is_the_most_frequent_then_the_first_seen():
+    positions = np.arange(6)
+    latitude = np.array([1.0, 1.5, 1.2, 1.1, 40.0, 40.0])
+    longitude = np.array([1.0, 1.5, 1.2, 1.1, 40.0, 40.0])
+    names = pd.Index(['Brasil', 'Chile', 'Peru'])
+    codes = np.array([1, 0, 0, 1, -1, 2])
+    clusters = GridClusters(positions, latitude, longitude, codes, names, 5.0).clusters
+    assert clusters['count'].tolist() == [4, 2]
+    assert clusters['country'].tolist() == ['Chile', 'Peru']
+
+    only_missing = GridClusters(positions[:2], latitude[:2], longitude[:2], np.array([-1, -1]), names, 5.0)
+    assert only_missing.clusters['country'].tolist() == [None]
+
+def test_all_grids_are_built_up_front():
+    model = ArticleModel(generate_articles(300, seed=5)).warm()
+    clusters = model.__dict__['point_clusters']
+    flag = next(iter(clusters.grids))
+    assert all(set(grids) == set(CLUSTER_RESOLUTIONS) for grids in clusters.grids.values())
+    for resolution in CLUSTER_RESOLUTIONS:
+        grid = clusters.grid(flag, resolution)
+        assert grid.clusters['count'].sum() == len(clusters.positions(flag)) == len(grid.members)
+
+def test_missing_country_column_leaves_the_country_empty():
+    articles = ArticleModel(generate_articles(300, seed=5).drop(columns=['PAIS'])).articles
+    clusters = PointClusters(articles)
+    flag = next(iter(clusters.grids))
+    grid = clusters.grid(flag, 'Continental')
+    assert len(grid.clusters) and grid.clusters['country'].isna().all()
@@ -0,0 +1,59 @@
+"""
+Atualização incremental do DataStore: o modelo corrigido deve ser igual ao reconstruído do zero
+"""
+import numpy as np
+
+from prisma_core.model import LIST_COLUMNS, ArticleModel
+from prisma_core.synthetic import generate_articles
+
+def assert_matches_rebuild(store):
+    model, current = store.model, store.frames[2]
+    rebuilt = ArticleModel(current).warm()
+
+    assert model.version == rebuilt.version
+    assert model.articles['ID'].tolist() == current['ID'].tolist()
+    for column in LIST_COLUMNS:
+        batch, expected = model.batches[column], rebuilt.batches[column]
+        assert batch.vocabulary.equals(expected.vocabulary)
+        assert np.array_equal(batch.offsets, expected.offsets)
+        assert np.array_equal(batch.codes, expected.codes)
+    for column, index in rebuilt.search_index.indexes.items():
+        patched = model.search_index.indexes[column]
+        assert list(patched.vocabulary) == list(index.vocabulary)
+        assert all(np.array_equal(a, b) for a, b in zip(patched.postings, index.postings))
+    assert model.cube.pair('TECNOLOGIA', 'TIPO_RESIDUO').equals(rebuilt.cube.pair('TECNOLOGIA', 'TIPO_RESIDUO'))
+
+def test_reordered_sheet_then_edit_matches_rebuild(sheet_server, data_store):
+    df = generate_articles(300, seed=1)
+    sheet_server.publish(df)
+    store = data_store()
+    store.load()
+
+    # Só a ordem muda: o modelo precisa acompanhar as novas posições
+    shuffled = df.sample(frac=1, random_state=0).reset_index(drop=True)
+    sheet_server.publish(shuffled)
+    status, diff = store.refresh()
+    assert status == 'incremental'
+    assert diff.moved and not (diff.added or diff.changed or diff.removed)
+    assert_matches_rebuild(store)
+
+    # Uma alteração real depois da reordenação
+    edited = shuffled.copy()
+    edited.loc[5, 'TITULO'] = 'Gaseificação de bagaço revisada'
+    edited.loc[5, 'TECNOLOGIA'] = 'Pirólise'
+    sheet_server.publish(edited)
+    status, diff = store.refresh()
+    assert status == 'incremental'
+    assert (diff.added, diff.changed, diff.removed) == (0, 1, 0)
+    assert_matches_rebuild(store)
+
+def test_unchanged_sheet_keeps_model(sheet_server, data_store):
+    df = generate_articles(100, seed=2)
+    sheet_server.publish(df)
+    store = data_store()
+    store.load()
+    model = store.model
+
+    status, _ = store.refresh()
+    assert status == 'inalterado'
+    assert store.model is model
@@ -0,0 +1,62 @@
+"""
+Busca por texto do SearchIndex: parte de palavra fora de aspas, frase entre aspas
+"""
+import numpy as np
+import pandas as pd
+
+from prisma_core.bundle import BundleStore
+from prisma_core.model import ArticleModel
+from prisma_core.search import SearchIndex, parse_query
+from prisma_core.synthetic import generate_articles
+
+TITLES = pd.DataFrame({'TITULO': [
+    'Produção de biogás em aterros',
+    'Gás natural e biometano',
+    'Aterros e produção de energia',
+    'Mapeamento de biomassa com SIG',
+    None,
+]})
+
+def found(query, frame=TITLES):
+    positions = SearchIndex(frame).search(query)
+    return None if positions is None else sorted(positions.tolist())
+
+def test_parse_query_separates_phrases_from_words():
+    assert parse_query('Gás "produção de Biogás" x') == [
+        (('producao', 'de', 'biogas'), True), (('gas',), False), (('x',), False)
+    ]
+    assert parse_query('  ""  ') == []
+
+def test_words_match_inside_longer_words():
+    assert found('gas') == [0, 1]
+    assert found('meta') == [1]
+    assert found('ss') == [3]
+    assert found('gas aterro') == [0]
+    assert found('xyz') == []
+
+def test_quoted_words_match_whole_words_only():
+    assert found('"gas"') == [1]
+    assert found('"aterros"') == [0, 2]
+    assert found('"aterro"') == []
+
+def test_quoted_phrases_need_the_words_in_sequence():
+    assert found('"producao de biogas"') == [0]
+    assert found('"biogas producao"') == []
+    assert found('"producao de"') == [0, 2]
+    assert found('"de energia" aterros') == [2]
+
+def test_empty_query_is_no_restriction():
+    assert found('') is None
+    assert SearchIndex(TITLES).mask('').all()
+
+def test_bundled_index_checks_phrases_against_the_processed_frame(tmp_path):
+    df = generate_articles(200, seed=2)
+    model = ArticleModel(df)
+    BundleStore(tmp_path).save(model, df, 'teste', figures=False)
+    loaded = BundleStore(tmp_path).load().model
+
+    assert 'processed_frame' not in loaded.__dict__
+    title = model.articles['TITULO'].iloc[7]
+    assert 7 in loaded.search_index.search(f'"{title}"')
+    for query in (f'"{title}"', 'biogas', '"biodigestao anaerobia"'):
+        assert np.array_equal(loaded.search_index.search(query), model.search_index.search(query))
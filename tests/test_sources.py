@@ -0,0 +1,91 @@
+"""
+Busca das abas contra o servidor local: requisições condicionais, timeout,
+novas tentativas com espera exponencial e abas auxiliares com falha
+"""
+import time
+
+import pytest
+import requests
+
+from prisma_core import sources
+from prisma_core.sources import SheetSource, build_session
+from prisma_core.synthetic import generate_articles
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(sources, 'BACKOFF_SECONDS', 0.05)
+
+def test_fetch_leaves_source_state_to_accept(sheet_server):
+    sheet_server.publish(generate_articles(50, seed=0))
+    source = SheetSource('dados', sheet_server.url('dados'))
+
+    version = source.fetch(build_session(1))
+    assert len(version.frame) == 50
+    assert source.frame is None and source.etag is None
+
+    assert source.accept(version) is version.frame
+    assert source.frame is version.frame and source.etag == version.etag
+
+def test_unchanged_sheets_use_conditional_requests(sheet_server, data_store):
+    sheet_server.publish(generate_articles(50, seed=0))
+    store = data_store()
+    store.load()
+    assert [status for _, status, _ in sheet_server.requests] == [200, 200, 200]
+
+    status, _ = store.refresh()
+    assert status == 'inalterado'
+    assert sorted(sheet_server.requests[3:]) == [(name, 304, True) for name in ('dados', 'residuos', 'tecnologias')]
+
+def test_transient_errors_are_retried_with_backoff(sheet_server, data_store):
+    sheet_server.publish(generate_articles(50, seed=0))
+    sheet_server.failures['dados'] = 2
+    store = data_store()
+
+    started = time.perf_counter()
+    store.load()
+    # Duas esperas: 0.05 s e 0.1 s
+    assert time.perf_counter() - started >= 0.15
+    assert [status for _, status, _ in sheet_server.hits('dados')] == [500, 500, 200]
+    assert store.timings['dados'][1] == 3
+    assert len(store.frames[2]) == 50
+
+def test_persistent_errors_raise_after_the_last_attempt(sheet_server, data_store):
+    sheet_server.publish(generate_articles(50, seed=0))
+    sheet_server.failures['dados'] = sources.MAX_RETRIES + 1
+    store = data_store()
+
+    with pytest.raises(requests.HTTPError):
+        store.load()
+    assert len(sheet_server.hits('dados')) == sources.MAX_RETRIES + 1
+    assert store.model is None
+
+def test_slow_sheet_times_out(sheet_server, monkeypatch):
+    monkeypatch.setattr(sources, 'REQUEST_TIMEOUT', (1, 0.2))
+    monkeypatch.setattr(sources, 'MAX_RETRIES', 1)
+    sheet_server.publish(generate_articles(10, seed=0))
+    sheet_server.delays['dados'] = 0.5
+    source = SheetSource('dados', sheet_server.url('dados'))
+
+    with pytest.raises(requests.Timeout):
+        source.fetch(build_session(1))
+    assert source.last_attempts == 2
+    assert source.frame is None
+
+def test_failed_auxiliary_sheet_falls_back_to_dados(sheet_server, data_store):
+    df = generate_articles(80, seed=0)
+    sheet_server.publish(df)
+    sheet_server.failures['residuos'] = 100
+    store = data_store()
+
+    residuos, tecnologias, dados = store.load()
+    assert residuos is dados
+    assert len(tecnologias) == 80
+
+    # Com a aba auxiliar ainda fora do ar, uma alteração na aba principal é aplicada
+    edited = df.copy()
+    edited.loc[0, 'TITULO'] = 'Título revisado'
+    sheet_server.publish(edited, names=('dados',))
+    status, diff = store.refresh()
+    assert status == 'incremental' and diff.changed == 1
+    assert store.frames[0] is store.frames[2]
+    assert store.model.articles.loc[0, 'TITULO'] == 'Título revisado'